@@ -0,0 +1,52 @@
+from typing import Any, Callable, Dict, List, Type
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+
+from ..utils.workflow_codec import COMPACT_MEDIA_TYPE, JSON_MEDIA_TYPE, accepts_compact, decode_compact, encode_compact, is_compact_media_type, max_decoded_size
+
+def _body_errors(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {**error, "loc": ("body", *error["loc"]), **({"input": {}} if error["type"] == "json_invalid" else {})}
+        for error in errors
+    ]
+
+def workflow_body(model: Type[BaseModel]) -> Callable:
+    async def read_workflow_body(request: Request) -> BaseModel:
+        body = await request.body()
+        try:
+            if not is_compact_media_type(request.headers.get("content-type")):
+                return model.model_validate_json(body)
+            try:
+                document = decode_compact(body, max_output_size=max_decoded_size())
+            except Exception as e:
+                raise RequestValidationError([
+                    {"type": "value_error", "loc": ("body",), "msg": f"Could not decode compact workflow body: {e}", "input": {}}
+                ])
+            return model.model_validate(document)
+        except ValidationError as e:
+            raise RequestValidationError(_body_errors(e.errors(include_url=False)))
+
+    return read_workflow_body
+
+def workflow_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                JSON_MEDIA_TYPE: {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}},
+                COMPACT_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    }
+
+def negotiated_response(request: Request, payload: Any) -> Any:
+    if not accepts_compact(request.headers.get("accept")):
+        return payload
+    return Response(
+        content=encode_compact(jsonable_encoder(payload)),
+        media_type=COMPACT_MEDIA_TYPE,
+        headers={"Vary": "Accept"}
+    )
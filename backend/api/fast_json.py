@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import gzip
+import hashlib
+from typing import Any, Optional
+import orjson
+from fastapi import Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute, request_response
+
+from .http_cache import strong_etag, etag_matches, REVALIDATE_CACHE_CONTROL
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 6
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return jsonable_encoder(value)
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Any, **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        if self.response_field is None and isinstance(self.response_class, DefaultPlaceholder):
+            self.response_class = ORJSONResponse
+            if asyncio.iscoroutinefunction(self.endpoint) and self.dependant.response_param_name is None:
+                self.endpoint = self._render_directly(self.endpoint, self.status_code or 200)
+                self.dependant.call = self.endpoint
+            self.app = request_response(self.get_route_handler())
+
+    @staticmethod
+    def _render_directly(call: Any, status_code: int) -> Any:
+        @functools.wraps(call)
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            content = await call(*args, **kwargs)
+            return content if isinstance(content, Response) else ORJSONResponse(content, status_code=status_code)
+        return endpoint
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+class PreserializedJSON:
+    def __init__(self, content: Any, cache_control: str = REVALIDATE_CACHE_CONTROL):
+        self.body = dumps(content)
+        self.etag = strong_etag(hashlib.sha256(self.body).hexdigest())
+        self.cache_control = cache_control
+        self.gzipped: Optional[bytes] = None
+        if len(self.body) >= GZIP_MINIMUM_SIZE:
+            self.gzipped = gzip.compress(self.body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        if self.gzipped is not None and accepts_gzip(request):
+            return Response(content=self.gzipped, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+        return Response(content=self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,59 @@
+import os
+from typing import Optional, Dict
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import Scope
+
+from ..utils.content_hash import file_content_hash, URL_VERSION_LENGTH
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+def strong_etag(content_hash: str) -> str:
+    return f'"{content_hash}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+def is_versioned_request(query_params: QueryParams, content_hash: str) -> bool:
+    version = query_params.get("v")
+    return bool(version) and len(version) >= URL_VERSION_LENGTH and content_hash.startswith(version)
+
+def cache_headers(content_hash: str, immutable: bool) -> Dict[str, str]:
+    return {
+        "ETag": strong_etag(content_hash),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+    }
+
+def cached_file_response(
+    request: Request,
+    path: str,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    immutable: Optional[bool] = None
+) -> Response:
+    stat_result = os.stat(path)
+    content_hash = file_content_hash(path, stat_result)
+    if immutable is None:
+        immutable = is_versioned_request(request.query_params, content_hash)
+    headers = cache_headers(content_hash, immutable)
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers, stat_result=stat_result)
+
+class ContentHashedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        content_hash = file_content_hash(str(full_path), stat_result)
+        headers = cache_headers(content_hash, is_versioned_request(QueryParams(scope.get("query_string", b"")), content_hash))
+
+        if etag_matches(request_headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
@@ -1,22 +1,39 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 from typing import List, Dict, Any, Optional
-import uuid
 import json
 from datetime import datetime
 
-from .routers import image_generation, workflows, assets
+from .routers import image_generation, workflows, assets, admin
+from .http_cache import ContentHashedStaticFiles
+from .content_negotiation import workflow_body, workflow_body_openapi, negotiated_response
+from .fast_json import FastJSONRoute, PreserializedJSON, GZIP_MINIMUM_SIZE, GZIP_COMPRESS_LEVEL
+from .request_metrics import MetricsMiddleware, register_cache_hit_ratio
+from ..utils.metrics import get_metrics_registry, CONTENT_TYPE_LATEST
+from ..utils.tracing import get_tracer, new_trace_id
+from ..utils.workflow_codec import COMPACT_MEDIA_TYPE
 from ..services.workflow_engine import WorkflowEngine
-from ..models.workflows import WorkflowRequest, WorkflowResponse
-from ..models.nodes import NodeType, NodeData
+from ..services.artifact_gc import get_artifact_gc, DEFAULT_GC_INTERVAL_SECONDS
+from ..services.workflow_repository import get_workflow_repository
+from ..services.asset_index import get_asset_index, DEFAULT_RECONCILE_INTERVAL_SECONDS
+from ..services.derivatives import get_derivative_generator
+from ..utils.upload_stream import max_upload_size
+from .models.workflows import WorkflowRequest, WorkflowResponse, NodePreviewRequest, PromoteDraftRequest
+from .models.responses import GenericResponse
+from .models.nodes import NodeTypeEnum, NodeData
 
 app = FastAPI(
     title="MarketCanvas AI API",
     description="Backend API for MarketCanvas AI visual workflow editor",
     version="1.0.0"
 )
+app.router.route_class = FastJSONRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,15 +42,65 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=GZIP_MINIMUM_SIZE,
+    compresslevel=GZIP_COMPRESS_LEVEL,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/x-ndjson", COMPACT_MEDIA_TYPE)
+)
+
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    path = request.url.path
+    if request.method in ("POST", "PATCH") and (path == "/api/v1/assets/upload" or path.startswith("/api/v1/assets/uploads/")):
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_upload_size() + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": f"Upload exceeds the maximum size of {max_upload_size()} bytes."})
+    return await call_next(request)
+
+app.add_middleware(MetricsMiddleware)
 
 os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", ContentHashedStaticFiles(directory="uploads"), name="uploads")
 
 app.include_router(image_generation.router, prefix="/api/v1/generate", tags=["generation"])
 app.include_router(workflows.router, prefix="/api/v1/workflows", tags=["workflows"])
 app.include_router(assets.router, prefix="/api/v1/assets", tags=["assets"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 workflow_engine = WorkflowEngine()
+_node_types_payload: Optional[PreserializedJSON] = None
+_node_types_revision = None
+artifact_gc = get_artifact_gc()
+artifact_gc.add_path_provider(workflow_engine.referenced_artifact_paths)
+artifact_gc.add_execution_provider(workflow_engine.recent_execution_ids)
+artifact_gc.add_workflow_provider(lambda: get_workflow_repository().iter_definitions())
+metrics_registry = get_metrics_registry()
+register_cache_hit_ratio(metrics_registry)
+
+@app.on_event("startup")
+async def build_asset_index():
+    await asyncio.to_thread(get_asset_index().ensure_built)
+    await asyncio.to_thread(get_derivative_generator().backfill)
+    interval_seconds = int(os.getenv("ASSET_INDEX_RECONCILE_SECONDS", str(DEFAULT_RECONCILE_INTERVAL_SECONDS)))
+    if interval_seconds > 0:
+        asyncio.create_task(get_asset_index().reconcile_periodically(interval_seconds))
+
+@app.on_event("startup")
+async def open_workflow_repository():
+    await asyncio.to_thread(get_workflow_repository)
+
+@app.on_event("startup")
+async def start_artifact_gc():
+    interval_seconds = int(os.getenv("ARTIFACT_GC_INTERVAL_SECONDS", str(DEFAULT_GC_INTERVAL_SECONDS)))
+    if interval_seconds > 0:
+        asyncio.create_task(artifact_gc.run_periodically(interval_seconds))
+
+@app.on_event("shutdown")
+async def flush_traces():
+    await asyncio.to_thread(get_tracer().shutdown)
 
 @app.get("/")
 async def root():
@@ -47,109 +114,100 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
-@app.post("/api/v1/execute-workflow")
-async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+@app.post("/api/v1/execute-workflow", openapi_extra=workflow_body_openapi(WorkflowRequest))
+async def execute_workflow(
+    http_request: Request,
+    request: WorkflowRequest = Depends(workflow_body(WorkflowRequest))
+) -> WorkflowResponse:
+    execution_id = new_trace_id()
     try:
         result = await workflow_engine.execute_workflow(
-            nodes=request.nodes,
-            edges=request.edges,
-            api_keys=request.api_keys
+            nodes=[node.model_dump(exclude_none=True) for node in request.nodes],
+            edges=[edge.model_dump(exclude_none=True) for edge in request.edges],
+            api_keys=request.api_keys,
+            target_node_ids=request.output_node_ids,
+            execution_id=execution_id,
+            mode=request.mode
+        )
+
+        return negotiated_response(http_request, WorkflowResponse(
+            success=True,
+            result=result,
+            execution_id=execution_id,
+            mode=request.mode,
+            timestamp=datetime.now().isoformat()
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/estimate-workflow", response_model=GenericResponse)
+async def estimate_workflow(request: WorkflowRequest):
+    try:
+        estimate = workflow_engine.estimate_workflow(
+            nodes=[node.model_dump(exclude_none=True) for node in request.nodes],
+            edges=[edge.model_dump(exclude_none=True) for edge in request.edges],
+            target_node_ids=request.output_node_ids
+        )
+        return GenericResponse(data=estimate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/execute-workflow/{draft_execution_id}/promote")
+async def promote_draft_workflow(draft_execution_id: str, request: PromoteDraftRequest) -> WorkflowResponse:
+    execution_id = new_trace_id()
+    try:
+        result = await workflow_engine.promote_draft(
+            draft_execution_id=draft_execution_id,
+            api_keys=request.api_keys,
+            execution_id=execution_id
         )
 
         return WorkflowResponse(
             success=True,
             result=result,
-            execution_id=str(uuid.uuid4()),
+            execution_id=execution_id,
+            mode="final",
             timestamp=datetime.now().isoformat()
         )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/preview-node", response_model=GenericResponse)
+async def preview_node(request: NodePreviewRequest):
+    execution_id = new_trace_id()
+    try:
+        preview = await workflow_engine.preview_node(
+            nodes=[node.model_dump(exclude_none=True) for node in request.nodes],
+            edges=[edge.model_dump(exclude_none=True) for edge in request.edges],
+            api_keys=request.api_keys,
+            node_id=request.node_id,
+            max_size=request.max_size,
+            execution_id=execution_id,
+            mode=request.mode
+        )
+        return GenericResponse(message=f"Preview generated for node '{request.node_id}'.", data=preview)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/node-types")
-async def get_node_types():
-    return {
-        "image_input": {
-            "name": "Image Input",
-            "category": "input",
-            "inputs": [],
-            "outputs": ["image"],
-            "properties": {
-                "source_type": {"type": "select", "options": ["upload", "url"]},
-                "url": {"type": "text", "condition": "source_type=url"},
-                "file": {"type": "file", "condition": "source_type=upload"}
-            }
-        },
-        "text_to_image": {
-            "name": "Text to Image",
-            "category": "generation",
-            "inputs": ["prompt"],
-            "outputs": ["image"],
-            "properties": {
-                "provider": {"type": "select", "options": ["openai", "fal", "stability"]},
-                "model": {"type": "select", "dynamic": True},
-                "prompt": {"type": "textarea"},
-                "width": {"type": "number", "default": 1024},
-                "height": {"type": "number", "default": 1024},
-                "steps": {"type": "number", "default": 30},
-                "guidance_scale": {"type": "number", "default": 7.5}
-            }
-        },
-        "image_to_image": {
-            "name": "Image to Image",
-            "category": "generation",
-            "inputs": ["image", "prompt"],
-            "outputs": ["image"],
-            "properties": {
-                "provider": {"type": "select", "options": ["openai", "fal", "stability"]},
-                "prompt": {"type": "textarea"},
-                "strength": {"type": "slider", "min": 0, "max": 1, "default": 0.8}
-            }
-        },
-        "style_transfer": {
-            "name": "Style Transfer",
-            "category": "transformation",
-            "inputs": ["image"],
-            "outputs": ["image"],
-            "properties": {
-                "style": {"type": "select", "options": ["vintage", "neon", "watercolor", "oil_painting"]},
-                "intensity": {"type": "slider", "min": 0, "max": 1, "default": 0.7}
-            }
-        },
-        "text_overlay": {
-            "name": "Text Overlay",
-            "category": "manipulation",
-            "inputs": ["image"],
-            "outputs": ["image"],
-            "properties": {
-                "text": {"type": "text"},
-                "position": {"type": "select", "options": ["top", "center", "bottom"]},
-                "font_size": {"type": "number", "default": 32},
-                "font_color": {"type": "color", "default": "#ffffff"},
-                "background_color": {"type": "color", "default": "transparent"}
-            }
-        },
-        "crop_resize": {
-            "name": "Crop & Resize",
-            "category": "manipulation",
-            "inputs": ["image"],
-            "outputs": ["image"],
-            "properties": {
-                "width": {"type": "number"},
-                "height": {"type": "number"},
-                "crop_type": {"type": "select", "options": ["center", "smart", "manual"]}
-            }
-        },
-        "output": {
-            "name": "Output",
-            "category": "output",
-            "inputs": ["image"],
-            "outputs": [],
-            "properties": {
-                "format": {"type": "select", "options": ["png", "jpg", "webp"]},
-                "quality": {"type": "slider", "min": 1, "max": 100, "default": 90}
-            }
-        }
-    }
+async def get_node_types(request: Request):
+    global _node_types_payload, _node_types_revision
+    node_registry = workflow_engine.node_registry
+    schema_revision = node_registry.schema_revision
+    if _node_types_payload is None or _node_types_revision != schema_revision:
+        _node_types_payload = PreserializedJSON(node_registry.schema())
+        _node_types_revision = schema_revision
+    return _node_types_payload.response(request)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+BULK_MAX_ITEMS = 500
+
+class UploadSessionRequest(BaseModel):
+    filename: str
+    size: int = Field(..., ge=0)
+    category: Optional[str] = "general"
+    content_type: Optional[str] = None
+
+class BulkDeleteRequest(BaseModel):
+    asset_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
@@ -17,8 +17,17 @@ class UploadResponse(GenericResponse):
     content_type: Optional[str] = None
     size: Optional[int] = None
 
+class BulkOperationResponse(GenericResponse):
+    results: List[Dict[str, Any]]
+    succeeded: int
+    failed: int
+
 class AssetListResponse(GenericResponse):
     assets: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    limit: Optional[int] = None
+    total_estimate: Optional[int] = None
+    total_is_lower_bound: bool = False
 
 class NodeTypeListResponse(BaseModel):
     node_types: Dict[str, Any]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
 from .nodes import Node, Edge
 
 class WorkflowRequest(BaseModel):
@@ -8,6 +8,29 @@ class WorkflowRequest(BaseModel):
     api_keys: Dict[str, str] = Field(default_factory=dict, description="API keys for various providers, e.g., {'openai': 'sk-...', 'fal': 'fal-key-...'}")
     name: Optional[str] = None
     description: Optional[str] = None
+    output_node_ids: Optional[List[str]] = Field(None, description="Subset of nodes to compute; only their ancestors are executed. Defaults to every 'output' node.")
+    mode: Literal["final", "draft"] = Field("final", description="'draft' renders at reduced resolution with cheaper provider settings for fast previews")
+
+class NodePreviewRequest(WorkflowRequest):
+    node_id: str = Field(..., description="Node to preview; only its ancestors are executed")
+    max_size: int = Field(512, ge=32, le=2048, description="Longest edge of the preview image in pixels")
+
+class BatchExecutionRequest(BaseModel):
+    rows: List[Dict[str, Any]] = Field(..., description="Per-row parameter overrides keyed 'node_id.property' (or {node_id: {property: value}}), with an optional 'row_id'")
+    api_keys: Dict[str, str] = Field(default_factory=dict)
+    output_node_ids: Optional[List[str]] = None
+    mode: Literal["final", "draft"] = "final"
+    max_concurrency: int = Field(8, ge=1, le=64, description="Maximum number of rows executed at once")
+
+class SavedWorkflowExecutionRequest(BaseModel):
+    api_keys: Dict[str, str] = Field(default_factory=dict)
+    version: Optional[int] = Field(None, ge=1, description="Version to execute; defaults to the latest")
+    since_version: Optional[int] = Field(None, ge=1, description="Only nodes changed since this version (and their dependents) are recomputed; the rest reuse cached results")
+    output_node_ids: Optional[List[str]] = None
+    mode: Literal["final", "draft"] = "final"
+
+class PromoteDraftRequest(BaseModel):
+    api_keys: Dict[str, str] = Field(default_factory=dict)
 
 class WorkflowExecutionResult(BaseModel):
     node_id: str
@@ -20,5 +43,6 @@ class WorkflowResponse(BaseModel):
     result: Optional[Dict[str, WorkflowExecutionResult]] = Field(None, description="Dictionary of results from 'output' nodes, keyed by output node ID")
     message: Optional[str] = None
     execution_id: Optional[str] = None
+    mode: Optional[str] = None
     timestamp: Optional[str] = None
     error_details: Optional[Any] = None
@@ -0,0 +1,61 @@
+import time
+from typing import Dict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.metrics import MetricsRegistry, get_metrics_registry, cache_lookups_counter
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = None):
+        self.app = app
+        registry = registry or get_metrics_registry()
+        self.request_seconds = registry.histogram(
+            "marketcanvas_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+        )
+        self.in_progress = registry.gauge("marketcanvas_http_requests_in_progress", "HTTP requests currently being served.")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_progress.dec()
+            self.request_seconds.labels(scope["method"], route_label(scope), str(status_code)).observe(time.perf_counter() - started)
+
+def route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    if "app_root_path" in scope and scope.get("root_path"):
+        return scope["root_path"] + "/{path}"
+    return UNMATCHED_ROUTE
+
+def register_cache_hit_ratio(registry: MetricsRegistry = None):
+    registry = registry or get_metrics_registry()
+    lookups = cache_lookups_counter()
+    hit_ratio = registry.gauge("marketcanvas_cache_hit_ratio", "Lifetime hit ratio per cache.", ("cache",))
+
+    def collect_cache_hit_ratio():
+        totals: Dict[str, Dict[str, float]] = {}
+        for labels, child in lookups.series():
+            totals.setdefault(labels["cache"], {})[labels["result"]] = child.value
+        for cache_name, counts in totals.items():
+            lookups_total = sum(counts.values())
+            hit_ratio.labels(cache_name).set(counts.get("hit", 0.0) / lookups_total if lookups_total else 0.0)
+
+    registry.add_collector(collect_cache_hit_ratio)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from ..models.responses import GenericResponse
+from ..fast_json import FastJSONRoute
+from ...services.provider_telemetry import get_provider_telemetry, DEFAULT_ROLLUP_WINDOW_SECONDS
+from ...utils.tracing import get_tracer
+
+router = APIRouter(route_class=FastJSONRoute)
+provider_telemetry = get_provider_telemetry()
+tracer = get_tracer()
+
+@router.get("/provider-telemetry", response_model=GenericResponse)
+async def provider_telemetry_rollups(
+    window_seconds: int = Query(DEFAULT_ROLLUP_WINDOW_SECONDS, ge=60),
+    provider: Optional[str] = None,
+    bucket_seconds: Optional[int] = Query(None, ge=60, description="Split the window into time buckets of this size")
+):
+    rollups = provider_telemetry.rollups(window_seconds=window_seconds, provider=provider, bucket_seconds=bucket_seconds)
+    return GenericResponse(data={"window_seconds": window_seconds, "bucket_seconds": bucket_seconds, "rollups": rollups})
+
+@router.get("/provider-telemetry/calls", response_model=GenericResponse)
+async def recent_provider_calls(limit: int = Query(100, ge=1, le=1000), provider: Optional[str] = None):
+    return GenericResponse(data={"calls": provider_telemetry.recent(limit=limit, provider=provider)})
+
+@router.get("/traces/{trace_id}", response_model=GenericResponse)
+async def get_trace(trace_id: str):
+    spans = tracer.get_trace(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found among recent traces.")
+    return GenericResponse(data={"trace_id": spans[0]["trace_id"], "spans": spans})
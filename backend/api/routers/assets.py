@@ -1,101 +1,407 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse
+import asyncio
 import os
-from typing import List, Optional
+import uuid
+from typing import List, Optional, Dict, Any
+from datetime import datetime
 
-from ..models.responses import UploadResponse, AssetListResponse, ErrorResponse, GenericResponse
+from ..models.responses import UploadResponse, AssetListResponse, ErrorResponse, GenericResponse, BulkOperationResponse
+from ..fast_json import FastJSONRoute
+from ..models.assets import UploadSessionRequest, BulkDeleteRequest, BULK_MAX_ITEMS
 from ...utils.file_handler import FileHandler
+from ...utils.image_processor import ImageProcessor
+from ...services.asset_index import get_asset_index
+from ...services.derivatives import get_derivative_generator
+from ...services.render_cache import get_render_cache
+from ...services.artifact_store import get_artifact_store
+from ...services.artifact_gc import get_artifact_gc
+from ...services.storage.factory import get_storage_backend
+from ...services.storage.local_storage import iter_local_file
+from ...services.upload_sessions import get_upload_session_manager, UploadOffsetMismatchError
+from ...utils.upload_stream import (
+    UploadTooLargeError, UnsupportedUploadError, MalformedUploadError, iter_upload_file, receive_multipart_upload,
+    stream_upload_to_path, unique_upload_filename
+)
+from ...utils.content_hash import versioned_url, URL_VERSION_LENGTH
+from ..http_cache import cached_file_response, is_versioned_request
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 file_handler = FileHandler(base_upload_dir="uploads", workflow_subdir="assets_library")
+asset_index = get_asset_index()
+derivative_generator = get_derivative_generator()
+render_cache = get_render_cache()
+artifact_store = get_artifact_store()
+storage = get_storage_backend()
+upload_sessions = get_upload_session_manager()
+image_processor = ImageProcessor(file_handler)
 
-@router.post("/upload", response_model=UploadResponse, responses={400: {"model": ErrorResponse}})
-async def upload_asset(file: UploadFile = File(...), category: Optional[str] = Form("general")):
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No filename provided.")
+BULK_CONCURRENCY = 8
+RENDER_MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "jpg": "image/jpeg", "png": "image/png", "avif": "image/avif"}
 
-    safe_category = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in category)
-    if not safe_category:
-        safe_category = "general"
+def _versioned_file_url(path: str) -> str:
+    return versioned_url(file_handler.get_url_for_file(path), path)
 
-    try:
-        saved_filepath = await file_handler.save_uploaded_file(file, sub_dir=safe_category)
+def _storage_key(path: str) -> str:
+    return os.path.relpath(path, file_handler.base_upload_dir).replace(os.sep, "/")
+
+def _asset_to_response(asset: Dict[str, Any]) -> Dict[str, Any]:
+    asset_url = file_handler.get_url_for_file(asset["path"])
+    if storage.is_remote and asset.get("storage_key"):
+        asset_url = storage.presigned_url(asset["storage_key"])
+    elif asset.get("content_hash"):
+        asset_url = f"{asset_url}?v={asset['content_hash'][:URL_VERSION_LENGTH]}"
+
+    return {
+        **derivative_generator.describe(asset, _versioned_file_url),
+        "id": asset["id"],
+        "filename": asset["filename"],
+        "url": asset_url,
+        "path": asset["path"],
+        "category": asset["category"],
+        "type": asset["ext"],
+        "kind": asset["kind"],
+        "size": asset["size"],
+        "created_at": asset["created_at"],
+        "execution_id": asset["execution_id"],
+        "content_hash": asset.get("content_hash")
+    }
+
+def _safe_category(category: Optional[str]) -> str:
+    return "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in (category or "")) or "general"
+
+def _upload_destination(category: str, filename: str) -> str:
+    return os.path.join(file_handler.base_upload_dir, category, unique_upload_filename(filename))
+
+async def register_upload(saved_filepath: str, category: str, content_hash: Optional[str], content_type: Optional[str]) -> Dict[str, Any]:
+    content_hash = artifact_store.ingest(saved_filepath, content_hash=content_hash)
+    storage_key = None
+    if storage.is_remote:
+        storage_key = _storage_key(saved_filepath)
+        await storage.write(storage_key, iter_local_file(saved_filepath), content_type=content_type)
+    return asset_index.add(saved_filepath, category=category, kind="upload", content_hash=content_hash, storage_key=storage_key)
 
-        asset_url = file_handler.get_url_for_file(saved_filepath)
+UPLOAD_REQUEST_BODY = {
+    "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["file"],
+        "properties": {"file": {"type": "string", "format": "binary"}, "category": {"type": "string", "default": "general"}}
+    }}},
+    "required": True
+}
+
+@router.post(
+    "/upload",
+    response_model=UploadResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 415: {"model": ErrorResponse}},
+    openapi_extra={"requestBody": UPLOAD_REQUEST_BODY}
+)
+async def upload_asset(request: Request):
+    def destination(filename: str, fields: Dict[str, str]) -> str:
+        return _upload_destination(_safe_category(fields.get("category", "general")), filename)
+
+    try:
+        upload = await receive_multipart_upload(request.stream(), request.headers.get("content-type", ""), destination)
+        safe_category = _safe_category(upload.fields.get("category", "general"))
+        asset = await register_upload(upload.path, safe_category, upload.content_hash, upload.content_type)
 
         return UploadResponse(
-            filename=file.filename,
-            file_url=asset_url,
-            content_type=file.content_type,
-            size=file.size,
+            filename=upload.filename,
+            file_url=_asset_to_response(asset)["url"],
+            content_type=upload.content_type,
+            size=upload.size,
             message="Asset uploaded successfully."
         )
+    except MalformedUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
     except Exception as e:
         print(f"Asset upload failed: {e}")
         raise HTTPException(status_code=500, detail=f"Asset upload failed: {str(e)}")
 
+@router.post("/upload/batch", response_model=BulkOperationResponse, responses={400: {"model": ErrorResponse}})
+async def upload_assets_batch(files: List[UploadFile] = File(...), category: Optional[str] = Form("general")):
+    if len(files) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} files can be uploaded per batch.")
+
+    safe_category = _safe_category(category)
+    os.makedirs(os.path.join(file_handler.base_upload_dir, safe_category), exist_ok=True)
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def store_one(file: UploadFile) -> Dict[str, Any]:
+        if not file.filename:
+            return {"filename": None, "success": False, "status_code": 400, "error": "No filename provided."}
+        async with semaphore:
+            try:
+                saved_filepath, size, content_hash = await stream_upload_to_path(
+                    iter_upload_file(file), _upload_destination(safe_category, file.filename), file.filename
+                )
+                content_hash = await asyncio.to_thread(artifact_store.ingest, saved_filepath, content_hash)
+                storage_key = None
+                if storage.is_remote:
+                    storage_key = _storage_key(saved_filepath)
+                    await storage.write(storage_key, iter_local_file(saved_filepath), content_type=file.content_type)
+                return {
+                    "filename": file.filename, "success": True, "path": saved_filepath, "size": size,
+                    "content_hash": content_hash, "storage_key": storage_key
+                }
+            except UploadTooLargeError as e:
+                return {"filename": file.filename, "success": False, "status_code": 413, "error": str(e)}
+            except UnsupportedUploadError as e:
+                return {"filename": file.filename, "success": False, "status_code": 415, "error": str(e)}
+            except Exception as e:
+                print(f"Batch upload failed for {file.filename}: {e}")
+                return {"filename": file.filename, "success": False, "status_code": 500, "error": str(e)}
+
+    results = await asyncio.gather(*(store_one(file) for file in files))
+    stored = [result for result in results if result["success"]]
+    assets = asset_index.add_many([
+        {
+            "path": result["path"], "category": safe_category, "kind": "upload",
+            "content_hash": result["content_hash"], "storage_key": result["storage_key"]
+        }
+        for result in stored
+    ])
+    for result, asset in zip(stored, assets):
+        result.pop("path")
+        result.pop("storage_key")
+        result["asset"] = _asset_to_response(asset)
+
+    return BulkOperationResponse(
+        message=f"Uploaded {len(stored)} of {len(files)} file(s).",
+        results=results,
+        succeeded=len(stored),
+        failed=len(files) - len(stored)
+    )
+
+@router.post("/delete/batch", response_model=BulkOperationResponse)
+async def delete_assets_batch(request: BulkDeleteRequest):
+    assets_by_id = {asset["id"]: asset for asset in asset_index.get_many(request.asset_ids)}
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def delete_one(asset_id: str) -> Dict[str, Any]:
+        asset = assets_by_id.get(asset_id)
+        if asset is None:
+            return {"id": asset_id, "success": False, "status_code": 404, "error": "Asset not found."}
+        async with semaphore:
+            try:
+                await asyncio.to_thread(artifact_store.release, asset["path"])
+                await asyncio.to_thread(derivative_generator.remove_derivatives, asset["path"])
+                if storage.is_remote and asset.get("storage_key"):
+                    await storage.delete(asset["storage_key"])
+                return {"id": asset_id, "success": True, "filename": asset["filename"], "path": asset["path"]}
+            except Exception as e:
+                print(f"Batch delete failed for {asset['path']}: {e}")
+                return {"id": asset_id, "success": False, "status_code": 500, "error": str(e)}
+
+    results = await asyncio.gather(*(delete_one(asset_id) for asset_id in dict.fromkeys(request.asset_ids)))
+    deleted = [result for result in results if result["success"]]
+    asset_index.remove_many([result.pop("path") for result in deleted])
+
+    return BulkOperationResponse(
+        message=f"Deleted {len(deleted)} of {len(results)} asset(s).",
+        results=results,
+        succeeded=len(deleted),
+        failed=len(results) - len(deleted)
+    )
+
+@router.post("/uploads", response_model=GenericResponse, responses={413: {"model": ErrorResponse}, 415: {"model": ErrorResponse}})
+async def create_upload_session(request: UploadSessionRequest):
+    await upload_sessions.expire_stale()
+    try:
+        session = upload_sessions.create(request.filename, _safe_category(request.category), request.size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    return GenericResponse(message="Upload session created.", data=session)
+
+@router.get("/uploads/{session_id}", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def get_upload_session(session_id: str):
+    try:
+        return GenericResponse(data=upload_sessions.get(session_id))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.patch("/uploads/{session_id}", response_model=GenericResponse, responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}})
+async def append_upload_chunk(session_id: str, request: Request):
+    try:
+        offset = int(request.headers.get("upload-offset", "0"))
+        session = await upload_sessions.append(session_id, offset, request.stream())
+        return GenericResponse(message="Chunk stored.", data=session)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.expected_offset)})
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/uploads/{session_id}/complete", response_model=UploadResponse, responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}})
+async def complete_upload_session(session_id: str):
+    try:
+        assembled_path, size, content_hash, session = await upload_sessions.complete(session_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.expected_offset)})
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    saved_filepath = _upload_destination(session["category"], session["filename"])
+    os.makedirs(os.path.dirname(saved_filepath), exist_ok=True)
+    os.replace(assembled_path, saved_filepath)
+    asset = await register_upload(saved_filepath, session["category"], content_hash, None)
+    return UploadResponse(
+        filename=session["filename"],
+        file_url=_asset_to_response(asset)["url"],
+        size=size,
+        message="Asset uploaded successfully."
+    )
+
+@router.delete("/uploads/{session_id}", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def abort_upload_session(session_id: str):
+    if not await upload_sessions.abort(session_id):
+        raise HTTPException(status_code=404, detail=f"Upload session '{session_id}' not found.")
+    return GenericResponse(message="Upload session aborted.")
+
 @router.get("/", response_model=AssetListResponse)
-async def list_assets(category: Optional[str] = None, file_type: Optional[str] = None):
-    assets = []
-    asset_storage_root = file_handler.base_upload_dir
-
-    search_dir = asset_storage_root
-    if category:
-        safe_category = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in category)
-        search_dir = os.path.join(asset_storage_root, safe_category)
-
-    if not os.path.isdir(search_dir):
-        return AssetListResponse(assets=[])
-
-    for dirname, _, filenames in os.walk(search_dir):
-        for filename in filenames:
-            if filename.startswith('.'):
-                continue
-
-            if file_type:
-                ext = os.path.splitext(filename)[1].lower()
-                if file_type == "image" and ext not in [".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"]:
-                    continue
-                elif file_type == "template" and ext not in [".json", ".yaml"]:
-                    continue
-
-            filepath = os.path.join(dirname, filename)
-            file_url = file_handler.get_url_for_file(filepath)
-
-            current_category = "general"
-            if dirname != asset_storage_root:
-                current_category = os.path.basename(dirname)
-
-            assets.append({
-                "filename": filename,
-                "url": file_url,
-                "path": filepath,
-                "category": current_category,
-                "type": os.path.splitext(filename)[1].lower().strip('.')
-            })
-
-    return AssetListResponse(assets=assets, message=f"Found {len(assets)} assets.")
+async def list_assets(
+    category: Optional[str] = None,
+    file_type: Optional[str] = None,
+    include_artifacts: bool = False,
+    sort: str = Query("created_at", pattern="^(created_at|filename|size)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    ext: Optional[str] = Query(None, description="Comma-separated extensions, e.g. 'png,webp'"),
+    min_size: Optional[int] = Query(None, ge=0),
+    max_size: Optional[int] = Query(None, ge=0),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    execution_id: Optional[str] = None
+):
+    safe_category = _safe_category(category) if category else None
+
+    filters = {
+        "category": safe_category,
+        "asset_type": file_type,
+        "include_artifacts": include_artifacts,
+        "extensions": [e for e in ext.split(",") if e.strip()] if ext else None,
+        "min_size": min_size,
+        "max_size": max_size,
+        "created_after": created_after.timestamp() if created_after else None,
+        "created_before": created_before.timestamp() if created_before else None,
+        "execution_id": execution_id
+    }
+
+    try:
+        assets, next_cursor = asset_index.query(
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total_estimate, total_is_lower_bound = asset_index.count_estimate(**filters)
+
+    return AssetListResponse(
+        assets=[_asset_to_response(asset) for asset in assets],
+        message=f"Found {len(assets)} assets.",
+        next_cursor=next_cursor,
+        limit=limit,
+        total_estimate=total_estimate,
+        total_is_lower_bound=total_is_lower_bound
+    )
+
+@router.get("/info/{asset_id}", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def get_asset_info(asset_id: str):
+    asset = asset_index.get(asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found.")
+    return GenericResponse(data=_asset_to_response(asset))
+
+@router.get("/render/{asset_id}", response_class=FileResponse, responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+async def render_asset(
+    request: Request,
+    asset_id: str,
+    w: Optional[int] = Query(None, ge=1, le=4096),
+    h: Optional[int] = Query(None, ge=1, le=4096),
+    fmt: str = Query("webp", pattern="^(webp|jpeg|jpg|png|avif)$"),
+    q: int = Query(80, ge=1, le=100),
+    crop: str = Query("center_crop", pattern="^(center_crop|smart_crop|resize_only)$")
+):
+    asset = asset_index.get(asset_id)
+    if not asset or asset["asset_type"] != "image" or not os.path.exists(asset["path"]):
+        raise HTTPException(status_code=404, detail="Asset not found.")
+
+    immutable = bool(asset.get("content_hash")) and is_versioned_request(request.query_params, asset["content_hash"])
+
+    cache_key = render_cache.make_key(asset["path"], w, h, fmt, q, crop)
+    cached_path = render_cache.get(cache_key)
+    if cached_path:
+        return cached_file_response(request, cached_path, media_type=RENDER_MEDIA_TYPES[fmt], immutable=immutable)
+
+    output_path = render_cache.path_for(cache_key, fmt)
+    temp_path = f"{output_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        await asyncio.to_thread(image_processor.render_variant, asset["path"], temp_path, w, h, fmt, q, crop)
+        os.replace(temp_path, output_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Asset render failed for {asset_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to render asset: {str(e)}")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    render_cache.put(cache_key, output_path)
+    return cached_file_response(request, output_path, media_type=RENDER_MEDIA_TYPES[fmt], immutable=immutable)
+
+@router.post("/gc", responses={500: {"model": ErrorResponse}})
+async def collect_garbage(dry_run: bool = Query(True)):
+    try:
+        return await get_artifact_gc().collect_async(dry_run=dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Artifact GC failed: {str(e)}")
 
 @router.get("/download/{category}/{filename:path}", response_class=FileResponse)
-async def download_asset(category: str, filename: str):
-    safe_category = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in category)
+async def download_asset(request: Request, category: str, filename: str):
+    safe_category = _safe_category(category)
     safe_filename = os.path.basename(filename)
     filepath = os.path.join(file_handler.base_upload_dir, safe_category, safe_filename)
 
     if not os.path.exists(filepath):
         raise HTTPException(status_code=404, detail="Asset not found.")
-    return FileResponse(filepath, filename=safe_filename)
+    asset = asset_index.get_by_path(filepath)
+    if storage.is_remote and asset and asset.get("storage_key"):
+        return RedirectResponse(storage.presigned_url(asset["storage_key"]), status_code=307)
+    return cached_file_response(request, filepath, filename=safe_filename)
 
 @router.delete("/{category}/{filename:path}", response_model=GenericResponse)
 async def delete_asset(category: str, filename: str):
-    safe_category = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in category)
+    safe_category = _safe_category(category)
     safe_filename = os.path.basename(filename)
     filepath = os.path.join(file_handler.base_upload_dir, safe_category, safe_filename)
 
     if not os.path.exists(filepath):
         raise HTTPException(status_code=404, detail="Asset not found.")
+    asset = asset_index.get_by_path(filepath)
     try:
-        os.remove(filepath)
+        artifact_store.release(filepath)
+        asset_index.remove(filepath)
+        if storage.is_remote and asset and asset.get("storage_key"):
+            await storage.delete(asset["storage_key"])
+        derivative_generator.remove_derivatives(filepath)
         return GenericResponse(message=f"Asset '{filename}' in category '{category}' deleted successfully.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete asset: {str(e)}")
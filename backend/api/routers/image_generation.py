@@ -1,21 +1,53 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
 from typing import Dict, Any, Optional
+from pydantic import BaseModel
+import mimetypes
 
 from ..models.responses import GenericResponse, ErrorResponse
+from ..fast_json import FastJSONRoute, PreserializedJSON
 from ...services.ai_providers.base import GenerationRequest, GenerationResponse, BaseAIProvider
+from ...services.ai_providers.registry import get_provider_registry
 from ...services.workflow_engine import WorkflowEngine
 from ...utils.file_handler import FileHandler
+from ...utils.content_hash import versioned_url
+from ...utils.tracing import get_tracer, new_trace_id
 from ..main import workflow_engine
+from .assets import register_upload
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 file_handler = FileHandler()
+provider_registry = get_provider_registry()
+_providers_payload: Optional[PreserializedJSON] = None
+_providers_revision = -1
+DIRECT_GENERATIONS_CATEGORY = "direct_generations"
 
-async def get_provider_from_request(provider_name: str, api_keys: Dict[str, str]) -> BaseAIProvider:
+async def call_provider_from_request(provider_name: str, operation: str, gen_req: GenerationRequest, api_keys: Dict[str, str], execution_id: Optional[str] = None) -> GenerationResponse:
     try:
-        return await workflow_engine._get_ai_provider(provider_name, api_keys)
+        return await workflow_engine._call_provider(provider_name, operation, gen_req, api_keys, execution_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+async def generate_and_save(provider_name: str, operation: str, gen_req: GenerationRequest, api_keys: Dict[str, str], adhoc_execution_id: str, failure_message: str) -> Dict[str, Any]:
+    trace_id = new_trace_id()
+    span_attributes = {"generation.operation": operation, "provider.name": provider_name}
+    with get_tracer().span(f"generation.{operation}", span_attributes, trace_id=trace_id):
+        gen_res = await call_provider_from_request(provider_name, operation, gen_req, api_keys, trace_id)
+
+        if not gen_res.success or not gen_res.image_url:
+            raise HTTPException(status_code=500, detail=gen_res.error or failure_message)
+
+        with get_tracer().span("file.save_image_from_url", {"provider.name": provider_name}):
+            local_image_path = await file_handler.save_image_from_url(gen_res.image_url, adhoc_execution_id, provider_name, sub_dir_override=DIRECT_GENERATIONS_CATEGORY)
+        await register_upload(local_image_path, DIRECT_GENERATIONS_CATEGORY, None, mimetypes.guess_type(local_image_path)[0])
+        local_image_url = versioned_url(file_handler.get_url_for_file(local_image_path), local_image_path)
+
+    return {
+        "image_url": local_image_url,
+        "provider_image_url": gen_res.image_url,
+        "metadata": gen_res.metadata,
+        "trace_id": trace_id
+    }
+
 class DirectGenerationPayload(BaseModel):
     provider: str
     api_keys: Dict[str, str]
@@ -30,32 +62,15 @@ class DirectGenerationPayload(BaseModel):
 @router.post("/text-to-image", response_model=GenericResponse, responses={500: {"model": ErrorResponse}})
 async def generate_text_to_image(payload: DirectGenerationPayload = Body(...)):
     try:
-        async with await get_provider_from_request(payload.provider, payload.api_keys) as ai_provider:
-            gen_req = GenerationRequest(
-                prompt=payload.prompt,
-                width=payload.width,
-                height=payload.height,
-                steps=payload.steps,
-                guidance_scale=payload.guidance_scale
-            )
-            gen_res: GenerationResponse = await ai_provider.text_to_image(gen_req)
-
-        if not gen_res.success or not gen_res.image_url:
-            raise HTTPException(status_code=500, detail=gen_res.error or "Image generation failed with provider.")
-
-        adhoc_execution_id = "direct_gen"
-        adhoc_node_id = payload.provider
-        local_image_path = await file_handler.save_image_from_url(gen_res.image_url, adhoc_execution_id, adhoc_node_id, sub_dir_override="direct_generations")
-        local_image_url = file_handler.get_url_for_file(local_image_path)
-
-        return GenericResponse(
-            message="Image generated successfully.",
-            data={
-                "image_url": local_image_url,
-                "provider_image_url": gen_res.image_url,
-                "metadata": gen_res.metadata
-            }
+        gen_req = GenerationRequest(
+            prompt=payload.prompt,
+            width=payload.width,
+            height=payload.height,
+            steps=payload.steps,
+            guidance_scale=payload.guidance_scale
         )
+        data = await generate_and_save(payload.provider, "text_to_image", gen_req, payload.api_keys, "direct_gen", "Image generation failed with provider.")
+        return GenericResponse(message="Image generated successfully.", data=data)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -68,34 +83,17 @@ async def generate_image_to_image(payload: DirectGenerationPayload = Body(...)):
         raise HTTPException(status_code=400, detail="Missing 'image_url' for image-to-image generation.")
 
     try:
-        async with await get_provider_from_request(payload.provider, payload.api_keys) as ai_provider:
-            gen_req = GenerationRequest(
-                prompt=payload.prompt,
-                image_url=payload.image_url,
-                strength=payload.strength,
-                width=payload.width,
-                height=payload.height,
-                steps=payload.steps,
-                guidance_scale=payload.guidance_scale
-            )
-            gen_res: GenerationResponse = await ai_provider.image_to_image(gen_req)
-
-        if not gen_res.success or not gen_res.image_url:
-            raise HTTPException(status_code=500, detail=gen_res.error or "Image-to-image transformation failed.")
-
-        adhoc_execution_id = "direct_i2i"
-        adhoc_node_id = payload.provider
-        local_image_path = await file_handler.save_image_from_url(gen_res.image_url, adhoc_execution_id, adhoc_node_id, sub_dir_override="direct_generations")
-        local_image_url = file_handler.get_url_for_file(local_image_path)
-
-        return GenericResponse(
-            message="Image transformed successfully.",
-            data={
-                "image_url": local_image_url,
-                "provider_image_url": gen_res.image_url,
-                "metadata": gen_res.metadata
-            }
+        gen_req = GenerationRequest(
+            prompt=payload.prompt,
+            image_url=payload.image_url,
+            strength=payload.strength,
+            width=payload.width,
+            height=payload.height,
+            steps=payload.steps,
+            guidance_scale=payload.guidance_scale
         )
+        data = await generate_and_save(payload.provider, "image_to_image", gen_req, payload.api_keys, "direct_i2i", "Image-to-image transformation failed.")
+        return GenericResponse(message="Image transformed successfully.", data=data)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -103,10 +101,9 @@ async def generate_image_to_image(payload: DirectGenerationPayload = Body(...)):
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 @router.get("/providers", response_model=GenericResponse)
-async def list_available_providers():
-    providers_info = {
-        "openai": {"models": OpenAIProvider("dummy").get_available_models(), "capabilities": ["text-to-image"]},
-        "fal": {"models": FalProvider("dummy").get_available_models(), "capabilities": ["text-to-image", "image-to-image"]},
-        "stability": {"models": StabilityProvider("dummy").get_available_models(), "capabilities": ["text-to-image", "image-to-image"]},
-    }
-    return GenericResponse(data=providers_info)
+async def list_available_providers(request: Request):
+    global _providers_payload, _providers_revision
+    if _providers_payload is None or _providers_revision != provider_registry.revision:
+        _providers_payload = PreserializedJSON(GenericResponse(data=provider_registry.catalog()).model_dump())
+        _providers_revision = provider_registry.revision
+    return _providers_payload.response(request)
@@ -1,9 +1,12 @@
 from .nodes import Node, Edge, NodeData, NodePosition, NodeTypeEnum
-from .workflows import WorkflowRequest, WorkflowResponse, WorkflowExecutionResult
-from .responses import GenericResponse, ErrorResponse, UploadResponse, AssetListResponse, NodeTypeListResponse
+from .workflows import WorkflowRequest, WorkflowResponse, WorkflowExecutionResult, NodePreviewRequest, PromoteDraftRequest, BatchExecutionRequest, SavedWorkflowExecutionRequest
+from .responses import GenericResponse, ErrorResponse, UploadResponse, AssetListResponse, NodeTypeListResponse, BulkOperationResponse
+from .assets import UploadSessionRequest, BulkDeleteRequest
 
 __all__ = [
     "Node", "Edge", "NodeData", "NodePosition", "NodeTypeEnum",
-    "WorkflowRequest", "WorkflowResponse", "WorkflowExecutionResult",
-    "GenericResponse", "ErrorResponse", "UploadResponse", "AssetListResponse", "NodeTypeListResponse"
+    "WorkflowRequest", "WorkflowResponse", "WorkflowExecutionResult", "NodePreviewRequest", "PromoteDraftRequest", "BatchExecutionRequest",
+    "SavedWorkflowExecutionRequest",
+    "GenericResponse", "ErrorResponse", "UploadResponse", "AssetListResponse", "NodeTypeListResponse",
+    "BulkOperationResponse", "UploadSessionRequest", "BulkDeleteRequest"
 ]
@@ -1,65 +1,227 @@
-from fastapi import APIRouter, HTTPException, Body, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Body, Depends, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+import json
+import os
 import uuid
 from datetime import datetime
 
-from ..models.workflows import WorkflowRequest, WorkflowResponse
+from ..models.workflows import WorkflowRequest, WorkflowResponse, BatchExecutionRequest, SavedWorkflowExecutionRequest
 from ..models.responses import GenericResponse, ErrorResponse
+from ..fast_json import FastJSONRoute
+from ..content_negotiation import workflow_body, workflow_body_openapi, negotiated_response
 from ..main import workflow_engine
+from ...utils.batch_table import normalize_row_overrides, parse_parameter_table
+from ...utils.tracing import new_trace_id
+from ...services.workflow_repository import get_workflow_repository
+from ...services.workflow_cache import get_workflow_cache
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
+workflow_cache = get_workflow_cache()
 
-@router.post("/save", response_model=GenericResponse, responses={500: {"model": ErrorResponse}})
-async def save_workflow(workflow_data: WorkflowRequest = Body(...)):
+def _read_saved_workflow(workflow_id: str, version: Optional[int] = None) -> WorkflowRequest:
+    resolved_version = version or get_workflow_repository().current_version(workflow_id)
+    if resolved_version is not None:
+        cached = workflow_cache.get(workflow_id, resolved_version)
+        if cached is not None:
+            return cached
+
+    data = get_workflow_repository().checkout(workflow_id, resolved_version) if resolved_version is not None else None
+    if data is None:
+        detail = f"Workflow '{workflow_id}' not found." if version is None else f"Workflow '{workflow_id}' has no version {version}."
+        raise HTTPException(status_code=404, detail=detail)
+    workflow = WorkflowRequest(**data)
+    workflow_cache.put(workflow_id, resolved_version, workflow)
+    return workflow
+
+def _stream_batch_results(
+    workflow: WorkflowRequest,
+    rows: List[Dict[str, Any]],
+    api_keys: Dict[str, str],
+    output_node_ids: Optional[List[str]],
+    mode: str,
+    max_concurrency: int
+) -> StreamingResponse:
+    row_ids = [row["row_id"] for row in rows]
+
+    async def result_lines():
+        succeeded = 0
+        try:
+            async for row_result in workflow_engine.execute_batch(
+                nodes=[node.model_dump(exclude_none=True) for node in workflow.nodes],
+                edges=[edge.model_dump(exclude_none=True) for edge in workflow.edges],
+                api_keys={**workflow.api_keys, **api_keys},
+                rows=[row["overrides"] for row in rows],
+                target_node_ids=output_node_ids or workflow.output_node_ids,
+                mode=mode,
+                max_concurrency=max_concurrency
+            ):
+                succeeded += 1 if row_result["success"] else 0
+                yield json.dumps({"row_id": row_ids[row_result["row"]], **row_result}) + "\n"
+        except Exception as e:
+            print(f"Error running workflow batch: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps({"done": True, "rows": len(rows), "succeeded": succeeded, "failed": len(rows) - succeeded}) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+@router.post(
+    "/save",
+    response_model=GenericResponse,
+    responses={500: {"model": ErrorResponse}},
+    openapi_extra=workflow_body_openapi(WorkflowRequest)
+)
+async def save_workflow(
+    workflow_data: WorkflowRequest = Depends(workflow_body(WorkflowRequest)),
+    owner: Optional[str] = Query(None)
+):
     workflow_id = workflow_data.name or str(uuid.uuid4())
 
     try:
-        import json
-        import os
-        save_dir = "saved_workflows"
-        os.makedirs(save_dir, exist_ok=True)
-        filepath = os.path.join(save_dir, f"{workflow_id}.json")
-        with open(filepath, "w") as f:
-            json.dump(workflow_data.model_dump(), f, indent=2)
-
-        return GenericResponse(message=f"Workflow '{workflow_id}' saved successfully.", data={"workflow_id": workflow_id})
+        summary = get_workflow_repository().save(workflow_id, workflow_data.model_dump(), owner=owner)
+        workflow_cache.invalidate(workflow_id)
+        workflow_cache.put(workflow_id, summary["version"], workflow_data)
+        return GenericResponse(message=f"Workflow '{workflow_id}' saved successfully.", data={"workflow_id": workflow_id, "workflow": summary})
     except Exception as e:
         print(f"Error saving workflow: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save workflow: {str(e)}")
 
+@router.get("/cache/stats", response_model=GenericResponse)
+async def workflow_cache_stats():
+    return GenericResponse(data=workflow_cache.stats())
+
 @router.get("/{workflow_id}", response_model=WorkflowRequest, responses={404: {"model": ErrorResponse}})
-async def load_workflow(workflow_id: str):
+async def load_workflow(workflow_id: str, request: Request):
     try:
-        import json
-        import os
-        save_dir = "saved_workflows"
-        filepath = os.path.join(save_dir, f"{workflow_id}.json")
-        if not os.path.exists(filepath):
-            raise HTTPException(status_code=404, detail=f"Workflow '{workflow_id}' not found.")
-
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        return WorkflowRequest(**data)
+        return negotiated_response(request, _read_saved_workflow(workflow_id))
     except HTTPException as e:
         raise e
     except Exception as e:
         print(f"Error loading workflow: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to load workflow: {str(e)}")
 
-@router.get("/", response_model=GenericResponse)
-async def list_saved_workflows():
-    try:
-        import os
-        save_dir = "saved_workflows"
-        if not os.path.isdir(save_dir):
-            return GenericResponse(data={"workflows": []})
-
-        workflows = []
-        for filename in os.listdir(save_dir):
-            if filename.endswith(".json"):
-                workflows.append({"id": filename[:-5], "name": filename[:-5]})
+@router.delete("/{workflow_id}", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def delete_workflow(workflow_id: str):
+    workflow_cache.invalidate(workflow_id)
+    if not get_workflow_repository().delete(workflow_id):
+        raise HTTPException(status_code=404, detail=f"Workflow '{workflow_id}' not found.")
+    return GenericResponse(message=f"Workflow '{workflow_id}' deleted successfully.")
 
-        return GenericResponse(data={"workflows": workflows})
+@router.get("/", response_model=GenericResponse, responses={400: {"model": ErrorResponse}})
+async def list_saved_workflows(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    owner: Optional[str] = None,
+    name: Optional[str] = Query(None, description="Only workflows whose name starts with this prefix")
+):
+    try:
+        workflows, next_cursor = get_workflow_repository().list(limit=limit, cursor=cursor, owner=owner, name_prefix=name)
+        return GenericResponse(data={"workflows": workflows, "next_cursor": next_cursor, "limit": limit})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error listing workflows: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list workflows: {str(e)}")
+
+@router.get("/{workflow_id}/versions", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def list_workflow_versions(workflow_id: str):
+    versions = get_workflow_repository().versions(workflow_id)
+    if versions is None:
+        raise HTTPException(status_code=404, detail=f"Workflow '{workflow_id}' not found.")
+    return GenericResponse(data={"workflow_id": workflow_id, "versions": versions})
+
+@router.get("/{workflow_id}/versions/{version}", response_model=WorkflowRequest, responses={404: {"model": ErrorResponse}})
+async def checkout_workflow_version(workflow_id: str, version: int, request: Request):
+    return negotiated_response(request, _read_saved_workflow(workflow_id, version))
+
+@router.get("/{workflow_id}/diff", response_model=GenericResponse, responses={404: {"model": ErrorResponse}})
+async def diff_workflow_versions(
+    workflow_id: str,
+    from_version: Optional[int] = Query(None, ge=1, description="Defaults to the version before to_version"),
+    to_version: Optional[int] = Query(None, ge=1, description="Defaults to the latest version")
+):
+    summary = get_workflow_repository().get_summary(workflow_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Workflow '{workflow_id}' not found.")
+    to_version = to_version or summary["version"]
+    from_version = from_version or max(1, to_version - 1)
+    try:
+        return GenericResponse(data=get_workflow_repository().diff(workflow_id, from_version, to_version))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+@router.post("/{workflow_id}/execute", response_model=WorkflowResponse, responses={404: {"model": ErrorResponse}})
+async def execute_saved_workflow(
+    workflow_id: str,
+    request: Request,
+    execution_request: SavedWorkflowExecutionRequest = Body(...)
+):
+    workflow = _read_saved_workflow(workflow_id, execution_request.version)
+    changed_node_ids = None
+    if execution_request.since_version is not None:
+        try:
+            changes = get_workflow_repository().diff(workflow_id, execution_request.since_version, execution_request.version)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=str(e.args[0]))
+        changed_node_ids = changes["changed_node_ids"]
+
+    execution_id = new_trace_id()
+    try:
+        result = await workflow_engine.execute_workflow(
+            nodes=[node.model_dump(exclude_none=True) for node in workflow.nodes],
+            edges=[edge.model_dump(exclude_none=True) for edge in workflow.edges],
+            api_keys={**workflow.api_keys, **execution_request.api_keys},
+            target_node_ids=execution_request.output_node_ids or workflow.output_node_ids,
+            execution_id=execution_id,
+            mode=execution_request.mode,
+            changed_node_ids=changed_node_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return negotiated_response(request, WorkflowResponse(
+        success=True,
+        result=result,
+        message=None if changed_node_ids is None else f"Changed since version {execution_request.since_version}: {changed_node_ids}",
+        execution_id=execution_id,
+        mode=execution_request.mode,
+        timestamp=datetime.now().isoformat()
+    ))
+
+@router.post("/{workflow_id}/batch", responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+async def execute_workflow_batch(workflow_id: str, batch_request: BatchExecutionRequest = Body(...)):
+    workflow = _read_saved_workflow(workflow_id)
+    try:
+        rows = []
+        for row_index, raw_row in enumerate(batch_request.rows):
+            row_id, overrides = normalize_row_overrides(raw_row)
+            rows.append({"row_id": row_id or str(row_index), "overrides": overrides})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _stream_batch_results(
+        workflow, rows, batch_request.api_keys, batch_request.output_node_ids,
+        batch_request.mode, batch_request.max_concurrency
+    )
+
+@router.post("/{workflow_id}/batch/upload", responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}})
+async def execute_workflow_batch_from_table(
+    workflow_id: str,
+    table: UploadFile = File(..., description="CSV or JSONL table with one row of parameter overrides per execution"),
+    api_keys: str = Form("{}", description="JSON object of provider API keys"),
+    mode: str = Form("final"),
+    max_concurrency: int = Form(8)
+):
+    workflow = _read_saved_workflow(workflow_id)
+    try:
+        rows = parse_parameter_table(await table.read(), table.filename, table.content_type)
+        parsed_api_keys = json.loads(api_keys)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if mode not in ("final", "draft"):
+        raise HTTPException(status_code=400, detail=f"Unknown execution mode '{mode}'.")
+
+    return _stream_batch_results(workflow, rows, parsed_api_keys, None, mode, max(1, min(max_concurrency, 64)))
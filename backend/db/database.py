@@ -0,0 +1,44 @@
+import os
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+DEFAULT_DATABASE_URL = "sqlite:///./marketcanvas.db"
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+class Base(DeclarativeBase):
+    pass
+
+def get_database_url() -> str:
+    return os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+
+def create_db_engine(database_url: Optional[str] = None) -> Engine:
+    database_url = database_url or get_database_url()
+    is_sqlite = database_url.startswith("sqlite")
+    engine = create_engine(database_url, connect_args={"check_same_thread": False} if is_sqlite else {})
+
+    if is_sqlite:
+        @event.listens_for(engine, "connect")
+        def _configure_sqlite(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return engine
+
+def run_migrations(engine: Engine):
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_config = Config()
+    alembic_config.set_main_option("script_location", MIGRATIONS_DIR)
+    alembic_config.set_main_option("sqlalchemy.url", engine.url.render_as_string(hide_password=False))
+    with engine.begin() as connection:
+        alembic_config.attributes["connection"] = connection
+        command.upgrade(alembic_config, "head")
+
+def create_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, expire_on_commit=False)
@@ -0,0 +1,7 @@
+from .database import Base, create_db_engine, create_session_factory, get_database_url, run_migrations
+from .models import WorkflowRecord, WorkflowVersionRecord
+
+__all__ = [
+    "Base", "create_db_engine", "create_session_factory", "get_database_url", "run_migrations",
+    "WorkflowRecord", "WorkflowVersionRecord"
+]
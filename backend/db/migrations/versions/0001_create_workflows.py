@@ -0,0 +1,38 @@
+"""create workflows table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "workflows",
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("owner", sa.String(255), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("node_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("edge_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("definition", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_workflows_name", "workflows", ["name"])
+    op.create_index("ix_workflows_updated_at", "workflows", ["updated_at"])
+    op.create_index("ix_workflows_owner_updated_at", "workflows", ["owner", "updated_at"])
+
+
+def downgrade():
+    op.drop_index("ix_workflows_owner_updated_at", table_name="workflows")
+    op.drop_index("ix_workflows_updated_at", table_name="workflows")
+    op.drop_index("ix_workflows_name", table_name="workflows")
+    op.drop_table("workflows")
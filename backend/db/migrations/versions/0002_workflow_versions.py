@@ -0,0 +1,38 @@
+"""add workflow versions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("workflows") as batch_op:
+        batch_op.add_column(sa.Column("current_version", sa.Integer(), nullable=False, server_default="1"))
+
+    op.create_table(
+        "workflow_versions",
+        sa.Column("workflow_id", sa.String(255), sa.ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.Integer(), primary_key=True),
+        sa.Column("is_snapshot", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("changed_nodes", sa.Text(), nullable=False, server_default="[]"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO workflow_versions (workflow_id, version, is_snapshot, payload, changed_nodes, created_at) "
+        "SELECT id, 1, TRUE, definition, '[]', updated_at FROM workflows"
+    )
+
+
+def downgrade():
+    op.drop_table("workflow_versions")
+    with op.batch_alter_table("workflows") as batch_op:
+        batch_op.drop_column("current_version")
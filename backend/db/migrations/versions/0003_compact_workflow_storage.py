@@ -0,0 +1,155 @@
+"""store workflow documents in the compact binary encoding
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+import json
+
+from alembic import op
+import msgpack
+import sqlalchemy as sa
+import zstandard
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+DOCUMENT_COLUMNS = (
+    ("workflows", "definition", ("id",)),
+    ("workflow_versions", "payload", ("workflow_id", "version")),
+)
+
+COMPACT_MAGIC = b"MCW\x01"
+SECTIONS = {
+    "nodes": (("id", "type", "position", "data"), {"id", "type"}),
+    "edges": (("id", "source", "target", "sourceHandle", "targetHandle", "type"), {"source", "target", "sourceHandle", "targetHandle", "type"}),
+}
+
+
+def _is_point(value):
+    return isinstance(value, dict) and set(value) == {"x", "y"}
+
+
+def _pack_rows(items, columns, interned, strings, string_index):
+    def intern(value):
+        if not isinstance(value, str):
+            return value
+        if value not in string_index:
+            string_index[value] = len(strings)
+            strings.append(value)
+        return string_index[value]
+
+    rows = []
+    for item in items:
+        row = []
+        present = []
+        extras = {}
+        for column in columns:
+            value = item.get(column)
+            if column in interned and value is not None and not isinstance(value, str):
+                extras[column] = value
+                value = None
+            elif column == "position" and value is not None and not _is_point(value):
+                extras[column] = value
+                value = None
+            elif column in item:
+                present.append(column)
+            if column in interned:
+                value = intern(value)
+            elif column == "position" and value is not None:
+                value = [value["x"], value["y"]]
+            row.append(value)
+        extras.update((key, value) for key, value in item.items() if key not in columns)
+        if extras or len(present) != len(columns):
+            row.append([extras, present])
+        rows.append(row)
+    return rows
+
+
+def _unpack_rows(rows, columns, interned, strings):
+    items = []
+    for row in rows:
+        item = {}
+        present = columns
+        if len(row) > len(columns):
+            extras, present = row[len(columns)]
+        for column, value in zip(columns, row):
+            if present is not columns and column not in present:
+                continue
+            if column in interned and value is not None:
+                value = strings[value]
+            elif column == "position" and isinstance(value, list):
+                value = {"x": value[0], "y": value[1]}
+            item[column] = value
+        if len(row) > len(columns):
+            item.update(extras)
+        items.append(item)
+    return items
+
+
+def encode_document(document, storage_format):
+    if storage_format == "json":
+        return json.dumps(document, separators=(",", ":")).encode("utf-8")
+    strings, string_index = [], {}
+    body = dict(document)
+    tabular = []
+    for section_name, (columns, interned) in SECTIONS.items():
+        if isinstance(body.get(section_name), list):
+            body[section_name] = _pack_rows(body[section_name], columns, interned, strings, string_index)
+            tabular.append(section_name)
+    packed = msgpack.packb({"s": strings, "t": tabular, "d": body}, use_bin_type=True)
+    return COMPACT_MAGIC + zstandard.ZstdCompressor(level=3).compress(packed)
+
+
+def decode_document(data):
+    if isinstance(data, str):
+        return json.loads(data)
+    if not data.startswith(COMPACT_MAGIC):
+        return json.loads(data)
+    envelope = msgpack.unpackb(zstandard.ZstdDecompressor().decompress(data[len(COMPACT_MAGIC):]), raw=False, strict_map_key=False)
+    document = envelope["d"]
+    for section_name in envelope["t"]:
+        columns, interned = SECTIONS[section_name]
+        document[section_name] = _unpack_rows(document[section_name], columns, interned, envelope["s"])
+    return document
+
+
+def _reencode(table_name, column_name, key_columns, storage_format):
+    bind = op.get_bind()
+    keys = ", ".join(key_columns)
+    rows = bind.execute(sa.text(f"SELECT {keys}, {column_name} FROM {table_name}")).all()
+    condition = " AND ".join(f"{key} = :{key}" for key in key_columns)
+    for row in rows:
+        value = encode_document(decode_document(row[-1]), storage_format)
+        if storage_format == "json":
+            value = value.decode("utf-8")
+        params = dict(zip(key_columns, row[:-1]), value=value)
+        bind.execute(sa.text(f"UPDATE {table_name} SET {column_name} = :value WHERE {condition}"), params)
+
+
+def upgrade():
+    for table_name, column_name, key_columns in DOCUMENT_COLUMNS:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                type_=sa.LargeBinary(),
+                existing_type=sa.Text(),
+                existing_nullable=False,
+                postgresql_using=f"convert_to({column_name}, 'UTF8')"
+            )
+        _reencode(table_name, column_name, key_columns, "compact")
+
+
+def downgrade():
+    for table_name, column_name, key_columns in DOCUMENT_COLUMNS:
+        _reencode(table_name, column_name, key_columns, "json")
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                type_=sa.Text(),
+                existing_type=sa.LargeBinary(),
+                existing_nullable=False,
+                postgresql_using=f"convert_from({column_name}, 'UTF8')"
+            )
@@ -3,6 +3,8 @@ from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 import httpx
 
+from ..provider_telemetry import telemetry_event_hooks
+
 class GenerationRequest(BaseModel):
     prompt: str
     width: Optional[int] = 1024
@@ -11,6 +13,9 @@ class GenerationRequest(BaseModel):
     guidance_scale: Optional[float] = 7.5
     image_url: Optional[str] = None
     strength: Optional[float] = 0.8
+    model: Optional[str] = None
+    quality: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
 
 class GenerationResponse(BaseModel):
     success: bool
@@ -18,10 +23,21 @@ class GenerationResponse(BaseModel):
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
+TEXT_TO_IMAGE = "text-to-image"
+IMAGE_TO_IMAGE = "image-to-image"
+TEXT_GENERATION = "text-generation"
+
 class BaseAIProvider(ABC):
+    provider_name: str = ""
+    display_name: str = ""
+    capabilities: List[str] = []
+    models: List[str] = []
+    default_model: Optional[str] = None
+    model_costs: Dict[str, float] = {}
+
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=300.0)
+        self.client = httpx.AsyncClient(timeout=300.0, event_hooks=telemetry_event_hooks())
 
     @abstractmethod
     async def text_to_image(self, request: GenerationRequest) -> GenerationResponse:
@@ -31,9 +47,23 @@ class BaseAIProvider(ABC):
     async def image_to_image(self, request: GenerationRequest) -> GenerationResponse:
         pass
 
-    @abstractmethod
+    @classmethod
+    def metadata(cls) -> Dict[str, Any]:
+        return {
+            "name": cls.display_name or cls.provider_name,
+            "models": list(cls.models),
+            "capabilities": list(cls.capabilities),
+            "default_model": cls.default_model,
+            "model_costs": dict(cls.model_costs),
+        }
+
+    @classmethod
+    def estimated_cost(cls, model: Optional[str] = None) -> float:
+        default_cost = cls.model_costs.get(cls.default_model or "", 0.0)
+        return cls.model_costs.get(model or cls.default_model or "", default_cost)
+
     def get_available_models(self) -> List[str]:
-        pass
+        return list(self.models)
 
     async def __aenter__(self):
         return self
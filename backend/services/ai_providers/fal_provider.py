@@ -1,7 +1,21 @@
-from .base import BaseAIProvider, GenerationRequest, GenerationResponse
+from .base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_TO_IMAGE, IMAGE_TO_IMAGE
 from typing import List
 
+FAL_MODEL_ENDPOINTS = {
+    "fast-sdxl": "fast-sdxl",
+    "flux-dev": "flux/dev",
+    "flux-schnell": "flux/schnell",
+    "stable-diffusion-v3-medium": "stable-diffusion-v3-medium",
+}
+
 class FalProvider(BaseAIProvider):
+    provider_name = "fal"
+    display_name = "fal.ai"
+    capabilities = [TEXT_TO_IMAGE, IMAGE_TO_IMAGE]
+    models = ["fast-sdxl", "sdxl-img2img", "flux-dev", "flux-schnell", "stable-diffusion-v3-medium"]
+    default_model = "fast-sdxl"
+    model_costs = {"fast-sdxl": 0.003, "sdxl-img2img": 0.003, "flux-dev": 0.025, "flux-schnell": 0.003, "stable-diffusion-v3-medium": 0.035}
+
     def __init__(self, api_key: str):
         super().__init__(api_key)
         self.base_url = "https://fal.run/fal-ai"
@@ -21,8 +35,9 @@ class FalProvider(BaseAIProvider):
                 "num_images": 1
             }
 
+            model = request.model if request.model in FAL_MODEL_ENDPOINTS else "fast-sdxl"
             response = await self.client.post(
-                f"{self.base_url}/fast-sdxl",
+                f"{self.base_url}/{FAL_MODEL_ENDPOINTS[model]}",
                 headers=headers,
                 json=payload
             )
@@ -32,7 +47,7 @@ class FalProvider(BaseAIProvider):
                 return GenerationResponse(
                     success=True,
                     image_url=data["images"][0]["url"],
-                    metadata={"provider": "fal", "model": "fast-sdxl"}
+                    metadata={"provider": "fal", "model": model}
                 )
             else:
                 return GenerationResponse(
@@ -85,12 +100,3 @@ class FalProvider(BaseAIProvider):
                 success=False,
                 error=f"Fal.ai provider error: {str(e)}"
             )
-
-    def get_available_models(self) -> List[str]:
-        return [
-            "fast-sdxl",
-            "sdxl-img2img",
-            "flux-dev",
-            "flux-schnell",
-            "stable-diffusion-v3-medium"
-        ]
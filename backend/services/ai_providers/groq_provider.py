@@ -1,8 +1,13 @@
-from .base import BaseAIProvider, GenerationRequest, GenerationResponse
+from .base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_GENERATION
 from typing import List, Dict, Any
 import httpx
 
 class GroqProvider(BaseAIProvider):
+    provider_name = "groq"
+    display_name = "Groq"
+    capabilities = [TEXT_GENERATION]
+    models = ["mixtral-8x7b-32768", "llama3-70b-8192", "llama3-8b-8192", "gemma-7b-it"]
+
     def __init__(self, api_key: str):
         super().__init__(api_key)
 
@@ -20,11 +25,3 @@ class GroqProvider(BaseAIProvider):
 
     async def generate_text(self, prompt: str, model: str = "mixtral-8x7b-32768") -> Dict[str, Any]:
         return {"text": f"Groq text generation for prompt '{prompt}' using model '{model}' would happen here."}
-
-    def get_available_models(self) -> List[str]:
-        return [
-            "mixtral-8x7b-32768",
-            "llama3-70b-8192",
-            "llama3-8b-8192",
-            "gemma-7b-it",
-        ]
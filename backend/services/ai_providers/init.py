@@ -1,10 +1,13 @@
-from .base import BaseAIProvider, GenerationRequest, GenerationResponse
+from .base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_TO_IMAGE, IMAGE_TO_IMAGE, TEXT_GENERATION
 from .openai_provider import OpenAIProvider
 from .fal_provider import FalProvider
 from .stability_provider import StabilityProvider
 from .groq_provider import GroqProvider
+from .registry import ProviderRegistry, create_provider_registry, get_provider_registry, register_provider
 
 __all__ = [
     "BaseAIProvider", "GenerationRequest", "GenerationResponse",
-    "OpenAIProvider", "FalProvider", "StabilityProvider", "GroqProvider"
+    "TEXT_TO_IMAGE", "IMAGE_TO_IMAGE", "TEXT_GENERATION",
+    "OpenAIProvider", "FalProvider", "StabilityProvider", "GroqProvider",
+    "ProviderRegistry", "create_provider_registry", "get_provider_registry", "register_provider"
 ]
@@ -1,9 +1,16 @@
-from .base import BaseAIProvider, GenerationRequest, GenerationResponse
+from .base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_TO_IMAGE
 from typing import List
 import base64
 import io
 
 class OpenAIProvider(BaseAIProvider):
+    provider_name = "openai"
+    display_name = "OpenAI"
+    capabilities = [TEXT_TO_IMAGE]
+    models = ["dall-e-3", "dall-e-2"]
+    default_model = "dall-e-3"
+    model_costs = {"dall-e-3": 0.04, "dall-e-2": 0.02}
+
     def __init__(self, api_key: str):
         super().__init__(api_key)
         self.base_url = "https://api.openai.com/v1"
@@ -15,14 +22,16 @@ class OpenAIProvider(BaseAIProvider):
                 "Content-Type": "application/json"
             }
 
+            model = request.model or "dall-e-3"
             payload = {
-                "model": "dall-e-3",
+                "model": model,
                 "prompt": request.prompt,
                 "n": 1,
                 "size": f"{request.width}x{request.height}",
-                "quality": "hd",
                 "response_format": "url"
             }
+            if model == "dall-e-3":
+                payload["quality"] = request.quality or "hd"
 
             response = await self.client.post(
                 f"{self.base_url}/images/generations",
@@ -35,7 +44,7 @@ class OpenAIProvider(BaseAIProvider):
                 return GenerationResponse(
                     success=True,
                     image_url=data["data"][0]["url"],
-                    metadata={"provider": "openai", "model": "dall-e-3"}
+                    metadata={"provider": "openai", "model": model}
                 )
             else:
                 return GenerationResponse(
@@ -61,6 +70,3 @@ class OpenAIProvider(BaseAIProvider):
                 success=False,
                 error=f"OpenAI provider error: {str(e)}"
             )
-
-    def get_available_models(self) -> List[str]:
-        return ["dall-e-3", "dall-e-2"]
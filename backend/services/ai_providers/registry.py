@@ -0,0 +1,59 @@
+from typing import Dict, Any, List, Optional, Type
+
+from .base import BaseAIProvider
+from .openai_provider import OpenAIProvider
+from .fal_provider import FalProvider
+from .stability_provider import StabilityProvider
+from .groq_provider import GroqProvider
+
+BUILTIN_PROVIDERS = [OpenAIProvider, FalProvider, StabilityProvider, GroqProvider]
+
+class ProviderRegistry:
+    def __init__(self):
+        self._providers: Dict[str, Type[BaseAIProvider]] = {}
+        self.revision = 0
+
+    def register(self, provider_class: Type[BaseAIProvider], replace: bool = False) -> Type[BaseAIProvider]:
+        provider_name = provider_class.provider_name.lower()
+        if not provider_name:
+            raise ValueError(f"Provider {provider_class.__name__} does not declare a provider_name.")
+        if provider_name in self._providers and not replace:
+            raise ValueError(f"Provider '{provider_name}' is already registered.")
+        self._providers[provider_name] = provider_class
+        self.revision += 1
+        return provider_class
+
+    def get(self, provider_name: str) -> Type[BaseAIProvider]:
+        provider_class = self._providers.get(provider_name.lower())
+        if provider_class is None:
+            raise ValueError(f"Unknown AI provider: {provider_name}")
+        return provider_class
+
+    def create(self, provider_name: str, api_key: str) -> BaseAIProvider:
+        return self.get(provider_name)(api_key)
+
+    def names(self, capability: Optional[str] = None) -> List[str]:
+        return [
+            provider_name for provider_name, provider_class in self._providers.items()
+            if capability is None or capability in provider_class.capabilities
+        ]
+
+    def catalog(self) -> Dict[str, Any]:
+        return {provider_name: provider_class.metadata() for provider_name, provider_class in self._providers.items()}
+
+def create_provider_registry() -> ProviderRegistry:
+    registry = ProviderRegistry()
+    for provider_class in BUILTIN_PROVIDERS:
+        registry.register(provider_class)
+    return registry
+
+_default_provider_registry: Optional[ProviderRegistry] = None
+
+def get_provider_registry() -> ProviderRegistry:
+    global _default_provider_registry
+    if _default_provider_registry is None:
+        _default_provider_registry = create_provider_registry()
+    return _default_provider_registry
+
+def register_provider(provider_class: Type[BaseAIProvider]) -> Type[BaseAIProvider]:
+    return get_provider_registry().register(provider_class)
@@ -1,10 +1,17 @@
-from .base import BaseAIProvider, GenerationRequest, GenerationResponse
+from .base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_TO_IMAGE, IMAGE_TO_IMAGE
 from typing import List, Dict, Any, Optional
 import httpx
 import io
 import base64
 
 class StabilityProvider(BaseAIProvider):
+    provider_name = "stability"
+    display_name = "Stability AI"
+    capabilities = [TEXT_TO_IMAGE, IMAGE_TO_IMAGE]
+    models = ["stable-diffusion-xl-1024-v1-0", "stable-diffusion-v1-6", "stable-diffusion-xl-beta-v2-2-2", "stable-diffusion-3-medium", "stable-diffusion-3-ultra"]
+    default_model = "stable-diffusion-xl-1024-v1-0"
+    model_costs = {"stable-diffusion-xl-1024-v1-0": 0.006, "stable-diffusion-v1-6": 0.002, "stable-diffusion-xl-beta-v2-2-2": 0.006, "stable-diffusion-3-medium": 0.035, "sd3-core": 0.03, "sd3-ultra": 0.08, "stable-diffusion-3-ultra": 0.08}
+
     def __init__(self, api_key: str):
         super().__init__(api_key)
         self.base_url = "https://api.stability.ai/v1/generation"
@@ -107,7 +114,7 @@ class StabilityProvider(BaseAIProvider):
 
     async def text_to_image(self, request: GenerationRequest) -> GenerationResponse:
         engine_id = "stable-diffusion-xl-1024-v1-0"
-        model_requested = request.metadata.get("model", engine_id) if request.metadata else engine_id
+        model_requested = request.model or (request.metadata.get("model", engine_id) if request.metadata else engine_id)
 
         if model_requested.lower() in ["sd3-ultra", "stable-diffusion-3-ultra"]:
             payload = {
@@ -139,7 +146,7 @@ class StabilityProvider(BaseAIProvider):
             return GenerationResponse(success=False, error="Image URL is required for image-to-image.")
 
         engine_id = "stable-diffusion-xl-1024-v1-0"
-        model_requested = request.metadata.get("model", engine_id) if request.metadata else engine_id
+        model_requested = request.model or (request.metadata.get("model", engine_id) if request.metadata else engine_id)
 
         if model_requested.lower() in ["sd3-ultra", "stable-diffusion-3-ultra"]:
             payload = {
@@ -216,12 +223,3 @@ class StabilityProvider(BaseAIProvider):
             return GenerationResponse(success=False, error=f"Stability provider HTTP request error (i2i): {str(e)}")
         except Exception as e:
             return GenerationResponse(success=False, error=f"Stability provider error (i2i): {str(e)}")
-
-    def get_available_models(self) -> List[str]:
-        return [
-            "stable-diffusion-xl-1024-v1-0",
-            "stable-diffusion-v1-6",
-            "stable-diffusion-xl-beta-v2-2-2",
-            "stable-diffusion-3-medium",
-            "stable-diffusion-3-ultra"
-        ]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Callable, Iterable
+from urllib.parse import urlparse
+
+from .asset_index import AssetIndex, get_asset_index
+from .artifact_store import ArtifactStore, get_artifact_store
+from .derivatives import get_derivative_generator
+
+DEFAULT_ARTIFACT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_GC_MIN_AGE_SECONDS = 15 * 60
+DEFAULT_GC_INTERVAL_SECONDS = 3600
+UPLOADS_URL_PREFIX = "/uploads/"
+
+class ArtifactGarbageCollector:
+    def __init__(
+        self,
+        asset_index: AssetIndex,
+        artifact_store: ArtifactStore,
+        saved_workflows_dir: str = "saved_workflows",
+        ttl_seconds: int = DEFAULT_ARTIFACT_TTL_SECONDS,
+        quota_bytes: int = 0,
+        min_age_seconds: int = DEFAULT_GC_MIN_AGE_SECONDS,
+        on_delete: Optional[Callable[[str], None]] = None
+    ):
+        self.asset_index = asset_index
+        self.artifact_store = artifact_store
+        self.saved_workflows_dir = saved_workflows_dir
+        self.ttl_seconds = ttl_seconds
+        self.quota_bytes = quota_bytes
+        self.min_age_seconds = min_age_seconds
+        self.on_delete = on_delete
+        self._path_providers: List[Callable[[], Iterable[str]]] = []
+        self._workflow_providers: List[Callable[[], Iterable[Dict[str, Any]]]] = []
+        self._execution_providers: List[Callable[[], Iterable[str]]] = []
+        self._lock = asyncio.Lock()
+
+    def add_path_provider(self, provider: Callable[[], Iterable[str]]):
+        self._path_providers.append(provider)
+
+    def add_workflow_provider(self, provider: Callable[[], Iterable[Dict[str, Any]]]):
+        self._workflow_providers.append(provider)
+
+    def add_execution_provider(self, provider: Callable[[], Iterable[str]]):
+        self._execution_providers.append(provider)
+
+    def _normalize_reference(self, value: str) -> str:
+        parsed_path = urlparse(value).path if "://" in value or "?" in value else value
+        if UPLOADS_URL_PREFIX in parsed_path:
+            parsed_path = os.path.join(self.asset_index.base_upload_dir, parsed_path.split(UPLOADS_URL_PREFIX, 1)[1])
+        elif not parsed_path.startswith(self.asset_index.base_upload_dir) and not os.path.isabs(parsed_path):
+            parsed_path = os.path.join(self.asset_index.base_upload_dir, parsed_path.lstrip("/\\"))
+        return os.path.normpath(parsed_path)
+
+    def _collect_strings(self, value: Any, found: Set[str]):
+        if isinstance(value, str):
+            if "." in value and len(value) < 2048:
+                found.add(self._normalize_reference(value))
+        elif isinstance(value, dict):
+            for item in value.values():
+                self._collect_strings(item, found)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect_strings(item, found)
+
+    def saved_workflow_references(self) -> Set[str]:
+        found: Set[str] = set()
+        if not os.path.isdir(self.saved_workflows_dir):
+            return found
+        for filename in os.listdir(self.saved_workflows_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.saved_workflows_dir, filename), "r") as f:
+                    self._collect_strings(json.load(f), found)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Skipping unreadable saved workflow {filename} during GC: {e}")
+        for provider in self._workflow_providers:
+            for definition in provider():
+                self._collect_strings(definition, found)
+        return found
+
+    def referenced_paths(self) -> Set[str]:
+        referenced = self.saved_workflow_references()
+        for provider in self._path_providers:
+            referenced.update(os.path.normpath(path) for path in provider())
+        return referenced
+
+    def collect(self, dry_run: bool = True, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now or time.time()
+        referenced = self.referenced_paths()
+        protected_executions = {execution_id for provider in self._execution_providers for execution_id in provider()}
+        usage_before = self.asset_index.total_size()
+        usage = usage_before
+
+        candidates: List[Dict[str, Any]] = []
+        kept = {"referenced": 0, "recent_execution": 0, "retained": 0}
+        for asset in self.asset_index.list_by_kind("artifact"):
+            if asset["path"] in referenced:
+                kept["referenced"] += 1
+                continue
+            if asset["execution_id"] in protected_executions:
+                kept["recent_execution"] += 1
+                continue
+
+            age = now - asset["created_at"]
+            if age > self.ttl_seconds:
+                reason = "expired"
+            elif self.quota_bytes and usage > self.quota_bytes and age > self.min_age_seconds:
+                reason = "quota"
+            else:
+                kept["retained"] += 1
+                continue
+
+            usage -= asset["size"]
+            candidates.append({
+                "path": asset["path"],
+                "size": asset["size"],
+                "execution_id": asset["execution_id"],
+                "age_seconds": int(age),
+                "reason": reason,
+            })
+
+        errors: List[Dict[str, Any]] = []
+        if not dry_run:
+            for candidate in candidates:
+                try:
+                    self.artifact_store.release(candidate["path"])
+                    self.asset_index.remove(candidate["path"])
+                    if self.on_delete:
+                        self.on_delete(candidate["path"])
+                except OSError as e:
+                    errors.append({"path": candidate["path"], "size": candidate["size"], "error": str(e)})
+
+        return {
+            "dry_run": dry_run,
+            "ttl_seconds": self.ttl_seconds,
+            "quota_bytes": self.quota_bytes,
+            "usage_bytes_before": usage_before,
+            "usage_bytes_after": usage if dry_run else self.asset_index.total_size(),
+            "kept": kept,
+            "deleted_count": len(candidates) - len(errors),
+            "freed_bytes": sum(candidate["size"] for candidate in candidates) - sum(error["size"] for error in errors),
+            "artifacts": candidates,
+            "errors": errors,
+        }
+
+    async def collect_async(self, dry_run: bool = True) -> Dict[str, Any]:
+        async with self._lock:
+            return await asyncio.to_thread(self.collect, dry_run)
+
+    async def run_periodically(self, interval_seconds: int):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                report = await self.collect_async(dry_run=False)
+                if report["deleted_count"]:
+                    print(f"Artifact GC deleted {report['deleted_count']} file(s), freed {report['freed_bytes']} bytes.")
+            except Exception as e:
+                print(f"Artifact GC run failed: {e}")
+
+_default_collector: Optional[ArtifactGarbageCollector] = None
+
+def get_artifact_gc() -> ArtifactGarbageCollector:
+    global _default_collector
+    if _default_collector is None:
+        _default_collector = ArtifactGarbageCollector(
+            get_asset_index(),
+            get_artifact_store(),
+            ttl_seconds=int(os.getenv("ARTIFACT_TTL_SECONDS", str(DEFAULT_ARTIFACT_TTL_SECONDS))),
+            quota_bytes=int(os.getenv("ARTIFACT_DISK_QUOTA_BYTES", "0")),
+            min_age_seconds=int(os.getenv("ARTIFACT_GC_MIN_AGE_SECONDS", str(DEFAULT_GC_MIN_AGE_SECONDS))),
+            on_delete=get_derivative_generator().remove_derivatives
+        )
+    return _default_collector
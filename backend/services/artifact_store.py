@@ -0,0 +1,152 @@
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional
+
+from ..utils.content_hash import file_content_hash, remember_content_hash
+
+BLOB_DIRNAME = ".blobs"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    name TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_refs_hash ON refs (hash);
+"""
+
+class ArtifactStore:
+    def __init__(self, db_path: str, base_dir: str = "uploads"):
+        self.db_path = db_path
+        self.base_dir = base_dir
+        self.blob_dir = os.path.join(base_dir, BLOB_DIRNAME)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def blob_path(self, content_hash: str, ext: str = "") -> str:
+        return os.path.join(self.blob_dir, content_hash[:2], f"{content_hash}{ext}")
+
+    def _link_into_place(self, blob_path: str, path: str) -> bool:
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.link(blob_path, temp_path)
+        except OSError:
+            return False
+        os.replace(temp_path, path)
+        return True
+
+    def _store_blob(self, path: str, blob_path: str):
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        try:
+            os.link(path, blob_path)
+        except OSError:
+            shutil.copyfile(path, blob_path)
+
+    def _release_ref(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT hash FROM refs WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("DELETE FROM refs WHERE name = ?", (name,))
+        return self._collect_if_unreferenced(row["hash"])
+
+    def _collect_if_unreferenced(self, content_hash: str) -> Optional[str]:
+        remaining = self._conn.execute("SELECT 1 FROM refs WHERE hash = ? LIMIT 1", (content_hash,)).fetchone()
+        if remaining is not None:
+            return None
+        blob = self._conn.execute("SELECT ext FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+        self._conn.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+        return self.blob_path(content_hash, blob["ext"]) if blob is not None else None
+
+    def ingest(self, path: str, content_hash: Optional[str] = None) -> str:
+        name = os.path.normpath(path)
+        ext = os.path.splitext(name)[1].lower()
+        content_hash = content_hash or file_content_hash(name)
+        orphaned_blob = None
+
+        with self._lock:
+            blob = self._conn.execute("SELECT ext FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+            blob_path = self.blob_path(content_hash, blob["ext"] if blob is not None else ext)
+            existing = self._conn.execute("SELECT hash FROM refs WHERE name = ?", (name,)).fetchone()
+            if existing is not None and existing["hash"] == content_hash and os.path.exists(blob_path):
+                return content_hash
+
+            if not os.path.exists(blob_path):
+                self._store_blob(name, blob_path)
+            elif not os.path.samefile(blob_path, name) and not self._link_into_place(blob_path, name):
+                print(f"Could not hard-link {name} to blob {content_hash}; keeping a separate copy.")
+            self._conn.execute(
+                "INSERT INTO blobs (hash, ext, size, created_at) VALUES (?, ?, ?, ?) ON CONFLICT(hash) DO NOTHING",
+                (content_hash, ext, os.path.getsize(blob_path), time.time())
+            )
+
+            self._conn.execute(
+                "INSERT INTO refs (name, hash, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET hash = excluded.hash, created_at = excluded.created_at",
+                (name, content_hash, time.time())
+            )
+            if existing is not None and existing["hash"] != content_hash:
+                orphaned_blob = self._collect_if_unreferenced(existing["hash"])
+            self._conn.commit()
+
+        if orphaned_blob and os.path.exists(orphaned_blob):
+            os.remove(orphaned_blob)
+        remember_content_hash(name, content_hash)
+        return content_hash
+
+    def release(self, path: str) -> bool:
+        name = os.path.normpath(path)
+        if os.path.exists(name):
+            os.remove(name)
+
+        with self._lock:
+            tracked = self._conn.execute("SELECT 1 FROM refs WHERE name = ?", (name,)).fetchone() is not None
+            orphaned_blob = self._release_ref(name)
+            self._conn.commit()
+
+        if orphaned_blob and os.path.exists(orphaned_blob):
+            os.remove(orphaned_blob)
+        return tracked
+
+    def resolve(self, path: str) -> Optional[str]:
+        row = self._conn.execute("SELECT hash FROM refs WHERE name = ?", (os.path.normpath(path),)).fetchone()
+        return row["hash"] if row is not None else None
+
+    def ref_count(self, content_hash: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM refs WHERE hash = ?", (content_hash,)).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        blob_row = self._conn.execute("SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS stored_bytes FROM blobs").fetchone()
+        ref_row = self._conn.execute(
+            "SELECT COUNT(*) AS refs, COALESCE(SUM(blobs.size), 0) AS logical_bytes FROM refs JOIN blobs ON blobs.hash = refs.hash"
+        ).fetchone()
+        return {
+            "blobs": blob_row["blobs"],
+            "refs": ref_row["refs"],
+            "stored_bytes": blob_row["stored_bytes"],
+            "logical_bytes": ref_row["logical_bytes"],
+            "deduplicated_bytes": ref_row["logical_bytes"] - blob_row["stored_bytes"],
+        }
+
+_default_artifact_store: Optional[ArtifactStore] = None
+
+def get_artifact_store() -> ArtifactStore:
+    global _default_artifact_store
+    if _default_artifact_store is None:
+        _default_artifact_store = ArtifactStore(os.getenv("ARTIFACT_STORE_PATH", "artifact_store.db"))
+    return _default_artifact_store
@@ -0,0 +1,428 @@
+import asyncio
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator, Callable
+
+from ..utils.content_hash import file_content_hash
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"}
+TEMPLATE_EXTENSIONS = {".json", ".yaml"}
+SORTABLE_COLUMNS = {"created_at", "filename", "size"}
+TOTAL_COUNT_CAP = 10000
+DEFAULT_RECONCILE_INTERVAL_SECONDS = 300
+ENGINE_ARTIFACT_PATTERN = re.compile(r"^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{32})_.+_[0-9a-f]{8}\.\w+$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    execution_id TEXT,
+    derivatives TEXT,
+    content_hash TEXT,
+    storage_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_assets_kind_created ON assets (kind, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_kind_filename ON assets (kind, filename, id);
+CREATE INDEX IF NOT EXISTS idx_assets_kind_size ON assets (kind, size, id);
+CREATE INDEX IF NOT EXISTS idx_assets_kind_category_created ON assets (kind, category, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_kind_type_created ON assets (kind, asset_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_assets_execution ON assets (execution_id);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def classify_asset_type(ext: str) -> str:
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext in TEMPLATE_EXTENSIONS:
+        return "template"
+    return "other"
+
+def encode_cursor(sort_value: Any, asset_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort_value, asset_id]).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    try:
+        sort_value, asset_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return sort_value, str(asset_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor.")
+
+class AssetIndex:
+    def __init__(self, db_path: str, base_upload_dir: str = "uploads"):
+        self.db_path = db_path
+        self.base_upload_dir = base_upload_dir
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._ensure_columns(conn, {"derivatives": "TEXT", "content_hash": "TEXT", "storage_key": "TEXT"})
+        conn.commit()
+        return conn
+
+    def _ensure_columns(self, conn: sqlite3.Connection, columns: Dict[str, str]):
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(assets)").fetchall()}
+        for column_name, column_type in columns.items():
+            if column_name not in existing:
+                conn.execute(f"ALTER TABLE assets ADD COLUMN {column_name} {column_type}")
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        self._listeners.append(listener)
+
+    def _notify_added(self, asset: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                listener(asset)
+            except Exception as e:
+                print(f"Asset index listener failed for {asset.get('path')}: {e}")
+
+    def _category_for_path(self, path: str) -> str:
+        relative_dir = os.path.dirname(os.path.relpath(path, start=self.base_upload_dir))
+        if not relative_dir or relative_dir.startswith(".."):
+            return "general"
+        return os.path.basename(relative_dir)
+
+    def _record_for_path(
+        self,
+        path: str,
+        category: Optional[str] = None,
+        kind: str = "upload",
+        execution_id: Optional[str] = None,
+        hash_content: bool = False,
+        content_hash: Optional[str] = None,
+        created_at: Optional[float] = None,
+        storage_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        filename = os.path.basename(path)
+        ext = os.path.splitext(filename)[1].lower()
+        try:
+            stat_result = os.stat(path)
+            size, modified_at = stat_result.st_size, stat_result.st_mtime
+        except OSError:
+            size, modified_at = 0, time.time()
+        created_at = created_at if created_at is not None else modified_at
+
+        return {
+            "id": uuid.uuid4().hex,
+            "path": os.path.normpath(path),
+            "category": category or self._category_for_path(path),
+            "filename": filename,
+            "ext": ext.strip("."),
+            "asset_type": classify_asset_type(ext),
+            "kind": kind,
+            "size": size,
+            "created_at": created_at,
+            "execution_id": execution_id,
+            "derivatives": None,
+            "content_hash": content_hash or (file_content_hash(path) if hash_content and os.path.exists(path) else None),
+            "storage_key": storage_key,
+        }
+
+    def _upsert(self, records: Iterable[Dict[str, Any]]):
+        self._conn.executemany(
+            """
+            INSERT INTO assets (id, path, category, filename, ext, asset_type, kind, size, created_at, execution_id, derivatives, content_hash, storage_key)
+            VALUES (:id, :path, :category, :filename, :ext, :asset_type, :kind, :size, :created_at, :execution_id, :derivatives, :content_hash, :storage_key)
+            ON CONFLICT(path) DO UPDATE SET category = excluded.category, kind = excluded.kind, size = excluded.size,
+                created_at = excluded.created_at, execution_id = excluded.execution_id, derivatives = NULL,
+                content_hash = excluded.content_hash, storage_key = excluded.storage_key
+            """,
+            list(records)
+        )
+
+    def add(
+        self,
+        path: str,
+        category: Optional[str] = None,
+        kind: str = "upload",
+        execution_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        created_at: Optional[float] = None,
+        storage_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        record = self._record_for_path(
+            path, category, kind, execution_id, hash_content=True, content_hash=content_hash,
+            created_at=created_at if created_at is not None else time.time(), storage_key=storage_key
+        )
+        with self._lock:
+            self._upsert([record])
+            self._conn.commit()
+        asset = self.get_by_path(path) or record
+        self._notify_added(asset)
+        return asset
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        records = [
+            self._record_for_path(
+                entry["path"],
+                entry.get("category"),
+                entry.get("kind", "upload"),
+                entry.get("execution_id"),
+                hash_content=True,
+                content_hash=entry.get("content_hash"),
+                created_at=entry.get("created_at") or time.time(),
+                storage_key=entry.get("storage_key")
+            )
+            for entry in entries
+        ]
+        if not records:
+            return []
+        with self._lock:
+            self._upsert(records)
+            self._conn.commit()
+            placeholders = ",".join("?" for _ in records)
+            rows = self._conn.execute(
+                f"SELECT * FROM assets WHERE path IN ({placeholders})", [record["path"] for record in records]
+            ).fetchall()
+        assets_by_path = {row["path"]: dict(row) for row in rows}
+        assets = [assets_by_path.get(record["path"], record) for record in records]
+        for asset in assets:
+            self._notify_added(asset)
+        return assets
+
+    def remove(self, path: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM assets WHERE path = ?", (os.path.normpath(path),))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def remove_many(self, paths: List[str]) -> int:
+        if not paths:
+            return 0
+        with self._lock:
+            cursor = self._conn.executemany(
+                "DELETE FROM assets WHERE path = ?", [(os.path.normpath(path),) for path in paths]
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def set_derivatives(self, path: str, derivatives: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE assets SET derivatives = ? WHERE path = ?",
+                (json.dumps(derivatives), os.path.normpath(path))
+            )
+            self._conn.commit()
+
+    def find_missing_derivatives(self, limit: int = 500) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM assets WHERE asset_type = 'image' AND derivatives IS NULL LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM assets WHERE id = ?", (asset_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_many(self, asset_ids: List[str]) -> List[Dict[str, Any]]:
+        if not asset_ids:
+            return []
+        placeholders = ",".join("?" for _ in asset_ids)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM assets WHERE id IN ({placeholders})", list(asset_ids)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_by_path(self, path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM assets WHERE path = ?", (os.path.normpath(path),)).fetchone()
+        return dict(row) if row else None
+
+    def _filter_clauses(
+        self,
+        category: Optional[str] = None,
+        asset_type: Optional[str] = None,
+        include_artifacts: bool = False,
+        extensions: Optional[List[str]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        execution_id: Optional[str] = None
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if not include_artifacts and not execution_id:
+            clauses.append("kind = 'upload'")
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if asset_type:
+            clauses.append("asset_type = ?")
+            params.append(asset_type)
+        if extensions:
+            normalized_extensions = [ext.lower().strip(".") for ext in extensions]
+            clauses.append(f"ext IN ({', '.join('?' for _ in normalized_extensions)})")
+            params.extend(normalized_extensions)
+        if min_size is not None:
+            clauses.append("size >= ?")
+            params.append(min_size)
+        if max_size is not None:
+            clauses.append("size <= ?")
+            params.append(max_size)
+        if created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        if execution_id:
+            clauses.append("execution_id = ?")
+            params.append(execution_id)
+        return clauses, params
+
+    def query(
+        self,
+        sort: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort column '{sort}'. Expected one of {sorted(SORTABLE_COLUMNS)}.")
+
+        clauses, params = self._filter_clauses(**filters)
+        if cursor:
+            cursor_value, cursor_id = decode_cursor(cursor)
+            clauses.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend([cursor_value, cursor_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = "SELECT * FROM assets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][sort], rows[-1]["id"])
+        return rows, next_cursor
+
+    def count_estimate(self, cap: int = TOTAL_COUNT_CAP, **filters: Any) -> Tuple[int, bool]:
+        clauses, params = self._filter_clauses(**filters)
+        sql = "SELECT 1 FROM assets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM ({sql} LIMIT ?)", params + [cap + 1]).fetchone()[0]
+        if total > cap:
+            return cap, True
+        return total, False
+
+    def is_built(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_meta WHERE key = 'built_at'").fetchone()
+        return row is not None
+
+    def list_by_kind(self, kind: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM assets WHERE kind = ? ORDER BY created_at, id", (kind,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def total_size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()[0]
+
+    def _scan(self, root: str) -> Iterator[Tuple[str, str]]:
+        for dirname, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                if filename.startswith('.'):
+                    continue
+                yield os.path.join(dirname, filename), "artifact" if ENGINE_ARTIFACT_PATTERN.match(filename) else "upload"
+
+    def rebuild(self, root: Optional[str] = None) -> int:
+        records = [self._record_for_path(path, kind=kind) for path, kind in self._scan(root or self.base_upload_dir)]
+
+        with self._lock:
+            self._conn.execute("DELETE FROM assets")
+            self._upsert(records)
+            self._conn.execute(
+                "INSERT INTO index_meta (key, value) VALUES ('built_at', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+        return len(records)
+
+    def reconcile(self, root: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT path FROM assets").fetchall()}
+        entries = []
+        for path, kind in self._scan(root or self.base_upload_dir):
+            if os.path.normpath(path) in indexed:
+                continue
+            try:
+                entries.append({"path": path, "kind": kind, "created_at": os.stat(path).st_mtime})
+            except OSError:
+                continue
+        return self.add_many(entries)
+
+    async def reconcile_periodically(self, interval_seconds: int):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                added = await asyncio.to_thread(self.reconcile)
+                if added:
+                    print(f"Asset index picked up {len(added)} unindexed file(s).")
+            except Exception as e:
+                print(f"Asset index reconcile failed: {e}")
+
+    def ensure_built(self, root: Optional[str] = None):
+        if not self.is_built():
+            indexed = self.rebuild(root)
+            print(f"Asset index built with {indexed} file(s).")
+            return
+        added = self.reconcile(root)
+        if added:
+            print(f"Asset index picked up {len(added)} unindexed file(s).")
+
+_default_asset_index: Optional[AssetIndex] = None
+
+def get_asset_index() -> AssetIndex:
+    global _default_asset_index
+    if _default_asset_index is None:
+        _default_asset_index = AssetIndex(os.getenv("ASSET_INDEX_PATH", "asset_index.db"))
+    return _default_asset_index
@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Callable, Set
+from PIL import Image, UnidentifiedImageError
+
+from .asset_index import AssetIndex, get_asset_index
+from ..utils.metrics import get_metrics_registry
+
+DERIVATIVE_DIRNAME = ".derivatives"
+DERIVATIVE_SIZES = {"thumb": 256, "preview": 1024}
+DERIVATIVE_QUALITY = {"webp": 80, "avif": 60}
+RASTER_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+
+EXECUTOR_QUEUE_DEPTH = get_metrics_registry().gauge(
+    "marketcanvas_executor_queue_depth", "Tasks queued or running on a background executor.", ("executor",)
+)
+
+def supported_derivative_formats() -> List[str]:
+    Image.init()
+    formats = ["webp"]
+    if "AVIF" in Image.SAVE:
+        formats.append("avif")
+    return formats
+
+def derivative_path(original_path: str, size_name: str, fmt: str) -> str:
+    directory, filename = os.path.split(original_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, DERIVATIVE_DIRNAME, f"{stem}.{size_name}.{fmt}")
+
+class DerivativeGenerator:
+    def __init__(self, asset_index: AssetIndex, max_workers: int = 2):
+        self.asset_index = asset_index
+        self.formats = supported_derivative_formats()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="derivatives")
+        self._queue_depth = EXECUTOR_QUEUE_DEPTH.labels("derivatives")
+        self._pending: Dict[str, Set[Future]] = {}
+        self._pending_lock = threading.Lock()
+
+    def generate(self, original_path: str) -> Dict[str, Any]:
+        try:
+            img = Image.open(original_path)
+            img.load()
+        except (UnidentifiedImageError, OSError) as e:
+            print(f"Skipping derivatives for {original_path}: {e}")
+            return {}
+
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+
+        original_mtime = os.path.getmtime(original_path)
+        derivatives: Dict[str, Any] = {}
+        for size_name, max_edge in sorted(DERIVATIVE_SIZES.items(), key=lambda item: item[1]):
+            if max(img.size) <= max_edge and derivatives:
+                break
+
+            resized = img.copy()
+            resized.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+            formats: Dict[str, str] = {}
+            for fmt in self.formats:
+                output_path = derivative_path(original_path, size_name, fmt)
+                if not os.path.exists(output_path) or os.path.getmtime(output_path) < original_mtime:
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                    resized.save(output_path, format=fmt.upper(), quality=DERIVATIVE_QUALITY[fmt])
+                formats[fmt] = output_path
+
+            derivatives[size_name] = {"width": resized.width, "height": resized.height, "formats": formats}
+        return derivatives
+
+    def _generate_and_record(self, original_path: str) -> Dict[str, Any]:
+        derivatives = self.generate(original_path)
+        self.asset_index.set_derivatives(original_path, derivatives)
+        return derivatives
+
+    def schedule(self, asset: Dict[str, Any]) -> Optional[Future]:
+        if asset.get("asset_type") != "image" or asset.get("ext") not in RASTER_EXTENSIONS:
+            return None
+        path = os.path.normpath(asset["path"])
+        self._queue_depth.inc()
+        with self._pending_lock:
+            future = self._executor.submit(self._generate_and_record, path)
+            self._pending.setdefault(path, set()).add(future)
+        future.add_done_callback(lambda done: self._finish(path, done))
+        return future
+
+    def _finish(self, path: str, future: Future):
+        self._queue_depth.dec()
+        with self._pending_lock:
+            futures = self._pending.get(path)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._pending[path]
+
+    def backfill(self, limit: int = 500) -> int:
+        missing = self.asset_index.find_missing_derivatives(limit)
+        for asset in missing:
+            if asset.get("ext") in RASTER_EXTENSIONS:
+                self.schedule(asset)
+            else:
+                self.asset_index.set_derivatives(asset["path"], {})
+        return len(missing)
+
+    def remove_derivatives(self, original_path: str):
+        path = os.path.normpath(original_path)
+        with self._pending_lock:
+            futures = self._pending.pop(path, set())
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(lambda _: self._remove_outputs(path))
+        self._remove_outputs(path)
+
+    def _remove_outputs(self, original_path: str):
+        for size_name in DERIVATIVE_SIZES:
+            for fmt in ("webp", "avif"):
+                output_path = derivative_path(original_path, size_name, fmt)
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+
+    def describe(self, asset: Dict[str, Any], url_for: Callable[[str], str]) -> Dict[str, Any]:
+        derivatives = asset.get("derivatives")
+        if isinstance(derivatives, str):
+            derivatives = json.loads(derivatives)
+        if not derivatives:
+            return {"derivatives": {}, "srcset": {}}
+
+        urls: Dict[str, Any] = {}
+        srcset_entries: Dict[str, List[str]] = {}
+        for size_name, info in derivatives.items():
+            urls[size_name] = {
+                "width": info["width"],
+                "height": info["height"],
+                **{fmt: url_for(path) for fmt, path in info["formats"].items()}
+            }
+            for fmt, path in info["formats"].items():
+                srcset_entries.setdefault(fmt, []).append(f"{url_for(path)} {info['width']}w")
+
+        return {
+            "derivatives": urls,
+            "srcset": {fmt: ", ".join(entries) for fmt, entries in srcset_entries.items()}
+        }
+
+_default_generator: Optional[DerivativeGenerator] = None
+
+def get_derivative_generator() -> DerivativeGenerator:
+    global _default_generator
+    if _default_generator is None:
+        asset_index = get_asset_index()
+        _default_generator = DerivativeGenerator(asset_index, max_workers=int(os.getenv("DERIVATIVE_WORKERS", "2")))
+        asset_index.add_listener(_default_generator.schedule)
+    return _default_generator
@@ -0,0 +1,69 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+DRAFT_SCALE = 0.5
+DRAFT_MAX_DIMENSION = 512
+DRAFT_MAX_STEPS = 12
+DRAFT_OUTPUT_QUALITY = 70
+DRAFT_PROVIDER_MODELS = {"openai": "dall-e-2", "fal": "flux-schnell"}
+DRAFT_PROVIDER_SIZES = {"openai": (512, 512)}
+FIXED_SIZE_PROVIDERS = {"stability"}
+
+COST_CLASSES = ("trivial", "cpu", "provider")
+
+def scale_for_draft(dimension: Any) -> Optional[int]:
+    if not dimension:
+        return None
+    return max(64, int(int(dimension) * DRAFT_SCALE) // 8 * 8)
+
+def require_image(params: Dict[str, Any], node_label: str) -> str:
+    input_image_path = params.get("image")
+    if not input_image_path:
+        raise ValueError(f"{node_label} node missing input 'image'.")
+    if not os.path.exists(input_image_path):
+        raise ValueError(f"{node_label} node: input image path does not exist: {input_image_path}")
+    return input_image_path
+
+class NodeType(ABC):
+    type_name: str = ""
+    name: str = ""
+    category: str = ""
+    inputs: List[str] = []
+    outputs: List[str] = []
+    properties: Dict[str, Dict[str, Any]] = {}
+    cost_class: str = "cpu"
+    cacheable: bool = True
+    provider_capability: Optional[str] = None
+
+    def draft_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return params
+
+    @abstractmethod
+    async def execute(
+        self,
+        engine: Any,
+        node: Dict[str, Any],
+        params: Dict[str, Any],
+        api_keys: Dict[str, str],
+        execution_id: str,
+        mode: str
+    ) -> Dict[str, Any]:
+        pass
+
+    def schema_properties(self, provider_registry: Any) -> Dict[str, Dict[str, Any]]:
+        if self.provider_capability is None or "provider" not in self.properties:
+            return self.properties
+        provider_property = {**self.properties["provider"], "options": provider_registry.names(self.provider_capability)}
+        return {**self.properties, "provider": provider_property}
+
+    def schema(self, provider_registry: Any) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "inputs": list(self.inputs),
+            "outputs": list(self.outputs),
+            "properties": self.schema_properties(provider_registry),
+            "cost_class": self.cost_class,
+            "cacheable": self.cacheable,
+        }
@@ -0,0 +1,403 @@
+import os
+from typing import Dict, Any
+from PIL import Image
+
+from ..ai_providers.base import GenerationRequest, TEXT_TO_IMAGE, IMAGE_TO_IMAGE
+from ...utils.content_hash import versioned_url
+from .base import (
+    NodeType, require_image, scale_for_draft,
+    DRAFT_SCALE, DRAFT_MAX_DIMENSION, DRAFT_MAX_STEPS, DRAFT_OUTPUT_QUALITY,
+    DRAFT_PROVIDER_MODELS, DRAFT_PROVIDER_SIZES, FIXED_SIZE_PROVIDERS
+)
+
+BASE_API_URL_FOR_UPLOADS = "http://localhost:8000/uploads"
+
+def _require_capability(engine, provider_name: str, capability: str):
+    provider_class = engine.provider_registry.get(provider_name)
+    if capability not in provider_class.capabilities:
+        raise ValueError(f"AI provider '{provider_name}' does not support {capability}. Providers that do: {engine.provider_registry.names(capability)}")
+
+def _draft_generation_params(params: Dict[str, Any], default_size: bool) -> Dict[str, Any]:
+    provider_name = str(params.get("provider") or "").lower()
+    params["steps"] = min(int(params.get("steps") or 30), DRAFT_MAX_STEPS)
+
+    if provider_name in DRAFT_PROVIDER_SIZES:
+        params["width"], params["height"] = DRAFT_PROVIDER_SIZES[provider_name]
+    elif provider_name not in FIXED_SIZE_PROVIDERS:
+        for dimension in ("width", "height"):
+            if params.get(dimension):
+                params[dimension] = scale_for_draft(params[dimension])
+        if default_size:
+            params.setdefault("width", scale_for_draft(1024))
+            params.setdefault("height", scale_for_draft(1024))
+    return params
+
+class ImageInputNode(NodeType):
+    type_name = "image_input"
+    name = "Image Input"
+    category = "input"
+    outputs = ["image"]
+    properties = {
+        "source_type": {"type": "select", "options": ["upload", "url"]},
+        "url": {"type": "text", "condition": "source_type=url"},
+        "file": {"type": "file", "condition": "source_type=upload"}
+    }
+    cost_class = "trivial"
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        source_type = params.get("source_type", "upload")
+        if source_type == "url":
+            image_url_param = params.get("url")
+            if not image_url_param: raise ValueError("Image Input node (URL) is missing 'url' parameter.")
+            image_path = await engine.save_image_from_url(image_url_param, execution_id, node["id"])
+        else:
+            image_path_param = params.get("file")
+            if not image_path_param:
+                raise ValueError(f"Image Input node (upload) is missing 'file' parameter.")
+
+            base_upload_dir = engine.file_handler.base_upload_dir
+            if not os.path.isabs(image_path_param) and not image_path_param.startswith(base_upload_dir):
+                full_image_path = os.path.join(base_upload_dir, image_path_param.lstrip('/\\'))
+            else:
+                full_image_path = image_path_param
+
+            if not os.path.exists(full_image_path):
+                 raise ValueError(f"Image Input node (upload) file not found at resolved path: {full_image_path} (original: {image_path_param})")
+            image_path = full_image_path
+        if mode == "draft":
+            image_path, _, _ = await engine.image_processor.create_preview(
+                image_path, DRAFT_MAX_DIMENSION, execution_id, node["id"]
+            )
+        return {"image": image_path}
+
+class TextInputNode(NodeType):
+    type_name = "text_input"
+    name = "Text Input"
+    category = "input"
+    outputs = ["text"]
+    properties = {"value": {"type": "textarea"}}
+    cost_class = "trivial"
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        return {"text": "" if params.get("value") is None else str(params["value"])}
+
+class NumberInputNode(NodeType):
+    type_name = "number_input"
+    name = "Number Input"
+    category = "input"
+    outputs = ["number"]
+    properties = {"value": {"type": "number", "default": 0}}
+    cost_class = "trivial"
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        value = params.get("value")
+        try:
+            number = float(value) if value not in (None, "") else 0.0
+        except (TypeError, ValueError):
+            raise ValueError(f"Number Input node value is not a number: {value!r}")
+        return {"number": int(number) if number.is_integer() else number}
+
+class TextToImageNode(NodeType):
+    type_name = "text_to_image"
+    name = "Text to Image"
+    category = "generation"
+    inputs = ["prompt"]
+    outputs = ["image"]
+    properties = {
+        "provider": {"type": "select", "options": []},
+        "model": {"type": "select", "dynamic": True},
+        "prompt": {"type": "textarea"},
+        "width": {"type": "number", "default": 1024},
+        "height": {"type": "number", "default": 1024},
+        "steps": {"type": "number", "default": 30},
+        "guidance_scale": {"type": "number", "default": 7.5}
+    }
+    cost_class = "provider"
+    cacheable = False
+    provider_capability = TEXT_TO_IMAGE
+
+    def draft_params(self, params):
+        provider_name = str(params.get("provider") or "").lower()
+        if provider_name in DRAFT_PROVIDER_MODELS:
+            params["model"] = DRAFT_PROVIDER_MODELS[provider_name]
+        return _draft_generation_params(params, default_size=True)
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        provider_name = params.get("provider")
+        prompt_val = params.get("prompt")
+        if not provider_name or not prompt_val:
+            raise ValueError("Text-to-Image node missing 'provider' or 'prompt'.")
+        _require_capability(engine, provider_name, TEXT_TO_IMAGE)
+
+        req = GenerationRequest(
+            prompt=prompt_val,
+            width=int(params.get("width", 1024)),
+            height=int(params.get("height", 1024)),
+            steps=int(params.get("steps", 30)),
+            guidance_scale=float(params.get("guidance_scale", 7.5)),
+            model=params.get("model"),
+            quality="standard" if mode == "draft" else None
+        )
+        res = await engine._call_provider(provider_name, "text_to_image", req, api_keys, execution_id)
+
+        if not res.success or not res.image_url:
+            raise RuntimeError(f"Text-to-Image generation failed for provider {provider_name}: {res.error}")
+
+        image_path = await engine.save_image_from_url(res.image_url, execution_id, node["id"])
+        return {"image": image_path}
+
+class ImageToImageNode(NodeType):
+    type_name = "image_to_image"
+    name = "Image to Image"
+    category = "generation"
+    inputs = ["image", "prompt"]
+    outputs = ["image"]
+    properties = {
+        "provider": {"type": "select", "options": []},
+        "prompt": {"type": "textarea"},
+        "strength": {"type": "slider", "min": 0, "max": 1, "default": 0.8}
+    }
+    cost_class = "provider"
+    cacheable = False
+    provider_capability = IMAGE_TO_IMAGE
+
+    def draft_params(self, params):
+        return _draft_generation_params(params, default_size=False)
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        provider_name = params.get("provider")
+        prompt_val = params.get("prompt")
+        input_image_path = params.get("image")
+        if not provider_name or not prompt_val or not input_image_path:
+            raise ValueError("Image-to-Image node missing 'provider', 'prompt', or input 'image'.")
+        if not os.path.exists(input_image_path):
+            raise ValueError(f"Image-to-Image node: input image path does not exist: {input_image_path}")
+        _require_capability(engine, provider_name, IMAGE_TO_IMAGE)
+
+        input_image_public_url = engine.file_handler.get_url_for_file(input_image_path, api_base_url=BASE_API_URL_FOR_UPLOADS)
+
+        img_pil = Image.open(input_image_path)
+        original_width, original_height = img_pil.size
+        img_pil.close()
+
+        req = GenerationRequest(
+            prompt=prompt_val,
+            image_url=input_image_public_url,
+            strength=float(params.get("strength", 0.8)),
+            width=int(params.get("width", original_width)),
+            height=int(params.get("height", original_height)),
+            steps=int(params.get("steps", 30)),
+            model=params.get("model"),
+            quality="standard" if mode == "draft" else None
+        )
+        res = await engine._call_provider(provider_name, "image_to_image", req, api_keys, execution_id)
+
+        if not res.success or not res.image_url:
+            raise RuntimeError(f"Image-to-Image generation failed for provider {provider_name}: {res.error}")
+
+        image_path = await engine.save_image_from_url(res.image_url, execution_id, node["id"])
+        return {"image": image_path}
+
+class StyleTransferNode(NodeType):
+    type_name = "style_transfer"
+    name = "Style Transfer"
+    category = "transformation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {
+        "style": {"type": "select", "options": ["vintage", "neon", "watercolor", "oil_painting"]},
+        "intensity": {"type": "slider", "min": 0, "max": 1, "default": 0.7}
+    }
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        style = params.get("style")
+        if not params.get("image") or not style:
+             raise ValueError("Style Transfer node missing input 'image' or 'style'.")
+        input_image_path = require_image(params, "Style Transfer")
+
+        processed_image_path = await engine.image_processor.apply_style_transfer(
+            input_image_path, style, float(params.get("intensity", 0.7)), execution_id, node["id"]
+        )
+        return {"image": processed_image_path}
+
+class TextOverlayNode(NodeType):
+    type_name = "text_overlay"
+    name = "Text Overlay"
+    category = "manipulation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {
+        "text": {"type": "text"},
+        "position": {"type": "select", "options": ["top", "center", "bottom"]},
+        "font_size": {"type": "number", "default": 32},
+        "font_color": {"type": "color", "default": "#ffffff"},
+        "background_color": {"type": "color", "default": "transparent"}
+    }
+
+    def draft_params(self, params):
+        params["font_size"] = max(8, int(int(params.get("font_size") or 32) * DRAFT_SCALE))
+        return params
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Text Overlay")
+        processed_image_path = await engine.image_processor.apply_text_overlay(
+            input_image_path,
+            str(params.get("text", "")),
+            str(params.get("position", "center")),
+            int(params.get("font_size", 32)),
+            str(params.get("font_color", "#ffffff")),
+            str(params.get("background_color", "transparent")),
+            execution_id, node["id"]
+        )
+        return {"image": processed_image_path}
+
+class CropResizeNode(NodeType):
+    type_name = "crop_resize"
+    name = "Crop & Resize"
+    category = "manipulation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {
+        "width": {"type": "number"},
+        "height": {"type": "number"},
+        "crop_type": {"type": "select", "options": ["center", "smart", "manual"]}
+    }
+
+    def draft_params(self, params):
+        for dimension in ("width", "height"):
+            if params.get(dimension):
+                params[dimension] = scale_for_draft(params[dimension])
+        return params
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Crop & Resize")
+        width_param = params.get("width")
+        height_param = params.get("height")
+
+        processed_image_path = await engine.image_processor.crop_resize_image(
+            input_image_path,
+            int(width_param) if width_param else None,
+            int(height_param) if height_param else None,
+            str(params.get("crop_type", "resize_only")),
+            execution_id, node["id"],
+            resample=Image.Resampling.BILINEAR if mode == "draft" else Image.Resampling.LANCZOS
+        )
+        return {"image": processed_image_path}
+
+class UpscaleNode(NodeType):
+    type_name = "upscale"
+    name = "Upscale"
+    category = "manipulation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {"scale": {"type": "select", "options": [2, 3, 4], "default": 2}}
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Upscale")
+        processed_image_path = await engine.image_processor.upscale_image(
+            input_image_path,
+            float(params.get("scale") or 2),
+            execution_id, node["id"],
+            resample=Image.Resampling.BILINEAR if mode == "draft" else Image.Resampling.LANCZOS
+        )
+        return {"image": processed_image_path}
+
+class BackgroundRemoveNode(NodeType):
+    type_name = "background_remove"
+    name = "Background Remove"
+    category = "manipulation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {
+        "tolerance": {"type": "slider", "min": 0, "max": 255, "default": 30},
+        "feather": {"type": "slider", "min": 0, "max": 10, "default": 1}
+    }
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Background Remove")
+        processed_image_path = await engine.image_processor.remove_background(
+            input_image_path,
+            int(params.get("tolerance", 30)),
+            float(params.get("feather", 1)),
+            execution_id, node["id"]
+        )
+        return {"image": processed_image_path}
+
+class FilterNode(NodeType):
+    type_name = "filter"
+    name = "Filter"
+    category = "transformation"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {
+        "filter": {"type": "select", "options": ["blur", "sharpen", "grayscale", "sepia", "brightness", "contrast", "saturation"]},
+        "amount": {"type": "slider", "min": 0, "max": 1, "default": 0.5}
+    }
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Filter")
+        filter_name = params.get("filter")
+        if not filter_name:
+            raise ValueError("Filter node missing 'filter'.")
+        processed_image_path = await engine.image_processor.apply_filter(
+            input_image_path, str(filter_name), float(params.get("amount", 0.5)), execution_id, node["id"]
+        )
+        return {"image": processed_image_path}
+
+class PreviewNode(NodeType):
+    type_name = "preview"
+    name = "Preview"
+    category = "output"
+    inputs = ["image"]
+    outputs = ["image"]
+    properties = {"max_size": {"type": "number", "default": DRAFT_MAX_DIMENSION}}
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Preview")
+        preview_path, _, _ = await engine.image_processor.create_preview(
+            input_image_path, int(params.get("max_size") or DRAFT_MAX_DIMENSION), execution_id, node["id"]
+        )
+        return {
+            "image": input_image_path,
+            "preview_url": versioned_url(
+                engine.file_handler.get_url_for_file(preview_path, api_base_url=BASE_API_URL_FOR_UPLOADS), preview_path
+            )
+        }
+
+class OutputNode(NodeType):
+    type_name = "output"
+    name = "Output"
+    category = "output"
+    inputs = ["image"]
+    outputs = []
+    properties = {
+        "format": {"type": "select", "options": ["png", "jpg", "webp"]},
+        "quality": {"type": "slider", "min": 1, "max": 100, "default": 90}
+    }
+
+    def draft_params(self, params):
+        params["quality"] = min(int(params.get("quality") or 90), DRAFT_OUTPUT_QUALITY)
+        return params
+
+    async def execute(self, engine, node, params, api_keys, execution_id, mode):
+        input_image_path = require_image(params, "Output")
+        final_image_path = await engine.image_processor.convert_image_format(
+            input_image_path,
+            str(params.get("format", "png")),
+            int(params.get("quality", 90)),
+            execution_id, node["id"]
+        )
+        return {
+            "final_image_path": final_image_path,
+            "final_image_url": versioned_url(
+                engine.file_handler.get_url_for_file(final_image_path, api_base_url=BASE_API_URL_FOR_UPLOADS), final_image_path
+            )
+        }
+
+BUILTIN_NODE_TYPES = [
+    ImageInputNode, TextInputNode, NumberInputNode,
+    TextToImageNode, ImageToImageNode,
+    StyleTransferNode, FilterNode,
+    TextOverlayNode, CropResizeNode, UpscaleNode, BackgroundRemoveNode,
+    PreviewNode, OutputNode,
+]
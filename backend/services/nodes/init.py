@@ -0,0 +1,8 @@
+from .base import NodeType, COST_CLASSES
+from .builtin import BUILTIN_NODE_TYPES
+from .registry import NodeRegistry, create_node_registry, get_node_registry
+
+__all__ = [
+    "NodeType", "COST_CLASSES", "BUILTIN_NODE_TYPES",
+    "NodeRegistry", "create_node_registry", "get_node_registry"
+]
@@ -0,0 +1,72 @@
+from typing import Dict, Any, List, Optional, Tuple, Type, Union
+
+from ..ai_providers.registry import ProviderRegistry, get_provider_registry
+from .base import NodeType, COST_CLASSES
+from .builtin import BUILTIN_NODE_TYPES
+
+class NodeRegistry:
+    def __init__(self, provider_registry: Optional[ProviderRegistry] = None):
+        self._node_types: Dict[str, NodeType] = {}
+        self._provider_registry = provider_registry
+        self.revision = 0
+
+    @property
+    def provider_registry(self) -> ProviderRegistry:
+        return self._provider_registry or get_provider_registry()
+
+    @property
+    def schema_revision(self) -> Tuple[int, int]:
+        return self.revision, self.provider_registry.revision
+
+    def register(self, node_type: Union[NodeType, Type[NodeType]], replace: bool = False) -> NodeType:
+        if isinstance(node_type, type):
+            node_type = node_type()
+        if not node_type.type_name:
+            raise ValueError(f"Node type {type(node_type).__name__} does not declare a type_name.")
+        if node_type.cost_class not in COST_CLASSES:
+            raise ValueError(f"Node type '{node_type.type_name}' has unknown cost class '{node_type.cost_class}'. Expected one of {list(COST_CLASSES)}.")
+        if node_type.type_name in self._node_types and not replace:
+            raise ValueError(f"Node type '{node_type.type_name}' is already registered.")
+        self._node_types[node_type.type_name] = node_type
+        self.revision += 1
+        return node_type
+
+    def unregister(self, type_name: str) -> bool:
+        if self._node_types.pop(type_name, None) is None:
+            return False
+        self.revision += 1
+        return True
+
+    def find(self, type_name: str) -> Optional[NodeType]:
+        return self._node_types.get(type_name)
+
+    def get(self, type_name: str) -> NodeType:
+        node_type = self._node_types.get(type_name)
+        if node_type is None:
+            raise ValueError(f"Unknown node type '{type_name}'. Registered types: {self.type_names()}")
+        return node_type
+
+    def type_names(self) -> List[str]:
+        return list(self._node_types)
+
+    def is_cacheable(self, type_name: str) -> bool:
+        node_type = self._node_types.get(type_name)
+        return node_type is not None and node_type.cacheable
+
+    def schema(self) -> Dict[str, Any]:
+        provider_registry = self.provider_registry
+        return {type_name: node_type.schema(provider_registry) for type_name, node_type in self._node_types.items()}
+
+def create_node_registry(provider_registry: Optional[ProviderRegistry] = None) -> NodeRegistry:
+    registry = NodeRegistry(provider_registry)
+    for node_type in BUILTIN_NODE_TYPES:
+        registry.register(node_type)
+    return registry
+
+_default_node_registry: Optional[NodeRegistry] = None
+
+def get_node_registry() -> NodeRegistry:
+    global _default_node_registry
+    if _default_node_registry is None:
+        _default_node_registry = create_node_registry()
+    return _default_node_registry
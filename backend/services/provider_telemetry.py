@@ -0,0 +1,301 @@
+import asyncio
+import contextvars
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, AsyncIterator
+
+import httpx
+
+from ..utils.metrics import get_metrics_registry
+
+DEFAULT_TELEMETRY_RETENTION_SECONDS = 30 * 24 * 3600
+DEFAULT_ROLLUP_WINDOW_SECONDS = 24 * 3600
+PRUNE_EVERY_N_CALLS = 500
+ROLLUP_PERCENTILES = (50, 95, 99)
+ROLLUP_METRICS = ("total_ms", "queue_ms", "connect_ms", "ttfb_ms")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS provider_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    provider TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    model TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    http_status INTEGER,
+    http_requests INTEGER NOT NULL DEFAULT 0,
+    queue_ms REAL NOT NULL,
+    connect_ms REAL,
+    ttfb_ms REAL,
+    total_ms REAL NOT NULL,
+    bytes_sent INTEGER NOT NULL DEFAULT 0,
+    bytes_received INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    execution_id TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_provider_calls_started ON provider_calls (started_at);
+CREATE INDEX IF NOT EXISTS idx_provider_calls_key ON provider_calls (provider, model, started_at);
+"""
+
+_metrics = get_metrics_registry()
+PROVIDER_REQUEST_SECONDS = _metrics.histogram(
+    "marketcanvas_provider_request_seconds", "Provider call latency including queueing.", ("provider", "operation", "status")
+)
+PROVIDER_COST_USD = _metrics.counter("marketcanvas_provider_cost_usd", "Estimated provider spend in USD.", ("provider",))
+
+_current_call: contextvars.ContextVar[Optional["ProviderCall"]] = contextvars.ContextVar("current_provider_call", default=None)
+
+def _response_bytes(response: httpx.Response) -> int:
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return 0
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class ProviderCall:
+    def __init__(self, provider: str, operation: str, model: str, execution_id: Optional[str] = None):
+        self.provider = provider
+        self.operation = operation
+        self.model = model
+        self.execution_id = execution_id
+        self.started_at = time.time()
+        self._created = time.perf_counter()
+        self._dispatched: Optional[float] = None
+        self._finished: Optional[float] = None
+        self.connect_ms: Optional[float] = None
+        self.ttfb_ms: Optional[float] = None
+        self.http_status: Optional[int] = None
+        self.http_requests = 0
+        self.bytes_sent = 0
+        self._responses: List[httpx.Response] = []
+        self.success = False
+        self.error: Optional[str] = None
+        self.cost_usd = 0.0
+
+    def mark_dispatched(self):
+        self._dispatched = time.perf_counter()
+
+    def finish(self, success: bool, error: Optional[str] = None, cost_usd: float = 0.0):
+        self._finished = time.perf_counter()
+        self.success = success
+        self.error = error
+        self.cost_usd = cost_usd if success else 0.0
+
+    @property
+    def queue_ms(self) -> float:
+        return ((self._dispatched or self._created) - self._created) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return ((self._finished or time.perf_counter()) - self._created) * 1000
+
+    @property
+    def bytes_received(self) -> int:
+        return sum(_response_bytes(response) for response in self._responses)
+
+    def _add_connect_ms(self, elapsed_ms: float):
+        self.connect_ms = (self.connect_ms or 0.0) + elapsed_ms
+
+    async def _on_request(self, request: httpx.Request):
+        self.http_requests += 1
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            self.bytes_sent += int(content_length)
+        request_started = time.perf_counter()
+        phase_started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            now = time.perf_counter()
+            if event_name.endswith(".started"):
+                phase_started[event_name[:-len(".started")]] = now
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                self._add_connect_ms((now - phase_started.get(event_name[:-len(".complete")], now)) * 1000)
+            elif event_name.endswith("receive_response_headers.complete") and self.ttfb_ms is None:
+                self.ttfb_ms = (now - request_started) * 1000
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+    async def _on_response(self, response: httpx.Response):
+        self.http_status = response.status_code
+        self._responses.append(response)
+
+    def as_row(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "provider": self.provider,
+            "operation": self.operation,
+            "model": self.model,
+            "success": int(self.success),
+            "http_status": self.http_status,
+            "http_requests": self.http_requests,
+            "queue_ms": self.queue_ms,
+            "connect_ms": self.connect_ms,
+            "ttfb_ms": self.ttfb_ms,
+            "total_ms": self.total_ms,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "cost_usd": self.cost_usd,
+            "execution_id": self.execution_id,
+            "error": self.error,
+        }
+
+async def _request_hook(request: httpx.Request):
+    call = _current_call.get()
+    if call is not None:
+        await call._on_request(request)
+
+async def _response_hook(response: httpx.Response):
+    call = _current_call.get()
+    if call is not None:
+        await call._on_response(response)
+
+def telemetry_event_hooks() -> Dict[str, List[Any]]:
+    return {"request": [_request_hook], "response": [_response_hook]}
+
+class ProviderTelemetry:
+    def __init__(self, db_path: str, retention_seconds: int = DEFAULT_TELEMETRY_RETENTION_SECONDS):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._calls_since_prune = 0
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @asynccontextmanager
+    async def track(self, provider: str, operation: str, model: Optional[str] = None, execution_id: Optional[str] = None) -> AsyncIterator[ProviderCall]:
+        call = ProviderCall(provider.lower(), operation, model or "default", execution_id)
+        token = _current_call.set(call)
+        try:
+            yield call
+        except BaseException as e:
+            if call._finished is None:
+                call.finish(False, error=str(e) or type(e).__name__)
+            raise
+        finally:
+            _current_call.reset(token)
+            if call._finished is None:
+                call.finish(False, error="Call ended without a result.")
+            await asyncio.to_thread(self.record, call)
+            PROVIDER_REQUEST_SECONDS.labels(call.provider, operation, "ok" if call.success else "error").observe(call.total_ms / 1000)
+            if call.cost_usd:
+                PROVIDER_COST_USD.labels(call.provider).inc(call.cost_usd)
+
+    def record(self, call: ProviderCall):
+        row = call.as_row()
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        with self._lock:
+            self._conn.execute(f"INSERT INTO provider_calls ({columns}) VALUES ({placeholders})", tuple(row.values()))
+            self._calls_since_prune += 1
+            if self._calls_since_prune >= PRUNE_EVERY_N_CALLS:
+                self._calls_since_prune = 0
+                self._conn.execute("DELETE FROM provider_calls WHERE started_at < ?", (time.time() - self.retention_seconds,))
+            self._conn.commit()
+
+    def recent(self, limit: int = 100, provider: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM provider_calls"
+        params: List[Any] = []
+        if provider:
+            query += " WHERE provider = ?"
+            params.append(provider.lower())
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{**dict(row), "success": bool(row["success"])} for row in rows]
+
+    def rollups(
+        self,
+        window_seconds: int = DEFAULT_ROLLUP_WINDOW_SECONDS,
+        provider: Optional[str] = None,
+        bucket_seconds: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        query = (
+            "SELECT started_at, provider, operation, model, success, total_ms, queue_ms, connect_ms, ttfb_ms, "
+            "bytes_received, cost_usd FROM provider_calls WHERE started_at >= ?"
+        )
+        params: List[Any] = [time.time() - window_seconds]
+        if provider:
+            query += " AND provider = ?"
+            params.append(provider.lower())
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        groups: Dict[tuple, List[sqlite3.Row]] = {}
+        for row in rows:
+            bucket = int(row["started_at"] // bucket_seconds * bucket_seconds) if bucket_seconds else None
+            groups.setdefault((row["provider"], row["operation"], row["model"], bucket), []).append(row)
+
+        rollups = []
+        for (provider_name, operation, model, bucket), group in sorted(groups.items(), key=lambda item: tuple(str(part) for part in item[0])):
+            successes = [row for row in group if row["success"]]
+            rollup: Dict[str, Any] = {
+                "provider": provider_name,
+                "operation": operation,
+                "model": model,
+                "calls": len(group),
+                "errors": len(group) - len(successes),
+                "error_rate": (len(group) - len(successes)) / len(group),
+                "avg_bytes_received": sum(row["bytes_received"] for row in group) / len(group),
+                "total_cost_usd": sum(row["cost_usd"] for row in group),
+                "avg_cost_usd": sum(row["cost_usd"] for row in successes) / len(successes) if successes else None,
+            }
+            if bucket_seconds:
+                rollup["bucket_start"] = bucket
+            for metric in ROLLUP_METRICS:
+                values = sorted(row[metric] for row in successes if row[metric] is not None)
+                for pct in ROLLUP_PERCENTILES:
+                    rollup[f"{metric}_p{pct}"] = percentile(values, pct)
+            rollups.append(rollup)
+        return rollups
+
+    def estimate(self, provider: str, model: Optional[str] = None, window_seconds: int = DEFAULT_ROLLUP_WINDOW_SECONDS) -> Optional[Dict[str, Any]]:
+        query = "SELECT total_ms, cost_usd FROM provider_calls WHERE provider = ? AND success = 1 AND started_at >= ?"
+        params: List[Any] = [provider.lower(), time.time() - window_seconds]
+        if model:
+            query += " AND model = ?"
+            params.append(model)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        if not rows:
+            return None
+        latencies = sorted(row["total_ms"] for row in rows)
+        return {
+            "samples": len(rows),
+            "latency_ms_p50": percentile(latencies, 50),
+            "latency_ms_p95": percentile(latencies, 95),
+            "cost_usd": sum(row["cost_usd"] for row in rows) / len(rows),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM provider_calls")
+            self._conn.commit()
+
+_default_provider_telemetry: Optional[ProviderTelemetry] = None
+
+def get_provider_telemetry() -> ProviderTelemetry:
+    global _default_provider_telemetry
+    if _default_provider_telemetry is None:
+        _default_provider_telemetry = ProviderTelemetry(
+            os.getenv("PROVIDER_TELEMETRY_PATH", "provider_telemetry.db"),
+            int(os.getenv("PROVIDER_TELEMETRY_RETENTION_SECONDS", str(DEFAULT_TELEMETRY_RETENTION_SECONDS)))
+        )
+    return _default_provider_telemetry
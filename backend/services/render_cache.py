@@ -0,0 +1,92 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..utils.metrics import cache_lookups_counter
+
+DEFAULT_RENDER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+CACHE_LOOKUPS = cache_lookups_counter()
+
+class RenderCache:
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_RENDER_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._hit_counter = CACHE_LOOKUPS.labels("render", "hit")
+        self._miss_counter = CACHE_LOOKUPS.labels("render", "miss")
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        existing = []
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if os.path.isfile(path) and not filename.endswith(".tmp"):
+                stat_result = os.stat(path)
+                existing.append((stat_result.st_atime, os.path.splitext(filename)[0], path, stat_result.st_size))
+
+        for _, key, path, size in sorted(existing):
+            self._entries[key] = (path, size)
+            self._total_bytes += size
+
+    def make_key(self, source_path: str, width: Optional[int], height: Optional[int], fmt: str, quality: int, crop_type: str) -> str:
+        stat_result = os.stat(source_path)
+        raw_key = f"{os.path.normpath(source_path)}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{width}|{height}|{fmt}|{quality}|{crop_type}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._miss_counter.inc()
+                return None
+            path, size = entry
+            if not os.path.exists(path):
+                del self._entries[key]
+                self._total_bytes -= size
+                self._miss_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+        self._hit_counter.inc()
+        os.utime(path)
+        return path
+
+    def put(self, key: str, path: str):
+        size = os.path.getsize(path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (path, size)
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted_key, (evicted_path, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                try:
+                    os.remove(evicted_path)
+                except OSError:
+                    pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+_default_render_cache: Optional[RenderCache] = None
+
+def get_render_cache() -> RenderCache:
+    global _default_render_cache
+    if _default_render_cache is None:
+        _default_render_cache = RenderCache(
+            os.getenv("RENDER_CACHE_DIR", "render_cache"),
+            max_bytes=int(os.getenv("RENDER_CACHE_MAX_BYTES", str(DEFAULT_RENDER_CACHE_MAX_BYTES)))
+        )
+    return _default_render_cache
@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+ByteSource = Union[bytes, AsyncIterator[bytes]]
+
+async def iter_byte_source(data: ByteSource) -> AsyncIterator[bytes]:
+    if isinstance(data, (bytes, bytearray)):
+        yield bytes(data)
+        return
+    async for chunk in data:
+        if chunk:
+            yield chunk
+
+class StorageBackend(ABC):
+    is_remote = False
+
+    @abstractmethod
+    async def write(self, key: str, data: ByteSource, content_type: Optional[str] = None) -> int:
+        pass
+
+    @abstractmethod
+    def read_stream(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        pass
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        pass
+
+    @abstractmethod
+    async def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        pass
+
+    @abstractmethod
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict[str, Any]]):
+        pass
+
+    @abstractmethod
+    async def abort_multipart_upload(self, key: str, upload_id: str):
+        pass
+
+    @abstractmethod
+    def presigned_url(self, key: str, expires_in: int = 3600, method: str = "GET") -> str:
+        pass
+
+    async def read(self, key: str) -> bytes:
+        return b"".join([chunk async for chunk in self.read_stream(key)])
+
+    async def exists(self, key: str) -> bool:
+        return await self.stat(key) is not None
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,33 @@
+import os
+from typing import Optional
+
+from .base import StorageBackend
+from .local_storage import LocalStorageBackend
+from .s3_storage import S3StorageBackend
+
+_default_storage_backend: Optional[StorageBackend] = None
+
+def create_storage_backend(backend_name: str) -> StorageBackend:
+    backend_name = backend_name.lower()
+    if backend_name == "local":
+        return LocalStorageBackend(os.getenv("UPLOAD_DIR", "uploads"))
+    elif backend_name == "s3":
+        endpoint_url = os.getenv("S3_ENDPOINT_URL")
+        bucket = os.getenv("S3_BUCKET")
+        if not endpoint_url or not bucket:
+            raise ValueError("S3 storage requires S3_ENDPOINT_URL and S3_BUCKET to be set.")
+        return S3StorageBackend(
+            endpoint_url,
+            bucket,
+            os.getenv("S3_ACCESS_KEY_ID", ""),
+            os.getenv("S3_SECRET_ACCESS_KEY", ""),
+            region=os.getenv("S3_REGION", "us-east-1")
+        )
+    else:
+        raise ValueError(f"Unknown storage backend: {backend_name}")
+
+def get_storage_backend() -> StorageBackend:
+    global _default_storage_backend
+    if _default_storage_backend is None:
+        _default_storage_backend = create_storage_backend(os.getenv("STORAGE_BACKEND", "local"))
+    return _default_storage_backend
@@ -0,0 +1,9 @@
+from .base import StorageBackend
+from .local_storage import LocalStorageBackend
+from .s3_storage import S3StorageBackend
+from .factory import create_storage_backend, get_storage_backend
+
+__all__ = [
+    "StorageBackend", "LocalStorageBackend", "S3StorageBackend",
+    "create_storage_backend", "get_storage_backend"
+]
@@ -0,0 +1,104 @@
+import os
+import shutil
+import uuid
+from typing import AsyncIterator, Dict, Any, List, Optional
+import aiofiles
+import aiofiles.os
+
+from .base import StorageBackend, ByteSource, DEFAULT_CHUNK_SIZE, iter_byte_source
+
+MULTIPART_DIRNAME = ".multipart"
+
+async def iter_local_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root_dir: str = "uploads", public_base_url: str = "/uploads"):
+        self.root_dir = root_dir
+        self.public_base_url = public_base_url.rstrip("/")
+        os.makedirs(root_dir, exist_ok=True)
+
+    def local_path(self, key: str) -> str:
+        normalized_key = os.path.normpath(key.lstrip("/\\"))
+        if normalized_key.startswith(".."):
+            raise ValueError(f"Storage key '{key}' escapes the storage root.")
+        return os.path.join(self.root_dir, normalized_key)
+
+    async def _write_file(self, path: str, data: ByteSource) -> int:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                async for chunk in iter_byte_source(data):
+                    await f.write(chunk)
+                    size += len(chunk)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return size
+
+    async def write(self, key: str, data: ByteSource, content_type: Optional[str] = None) -> int:
+        return await self._write_file(self.local_path(key), data)
+
+    async def read_stream(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        path = self.local_path(key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Storage key '{key}' not found.")
+        async for chunk in iter_local_file(path, chunk_size):
+            yield chunk
+
+    async def stat(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            stat_result = await aiofiles.os.stat(self.local_path(key))
+        except FileNotFoundError:
+            return None
+        return {"key": key, "size": stat_result.st_size, "modified_at": stat_result.st_mtime}
+
+    async def delete(self, key: str) -> bool:
+        path = self.local_path(key)
+        if not os.path.exists(path):
+            return False
+        await aiofiles.os.remove(path)
+        return True
+
+    def _multipart_dir(self, upload_id: str) -> str:
+        return os.path.join(self.root_dir, MULTIPART_DIRNAME, os.path.basename(upload_id))
+
+    async def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._multipart_dir(upload_id), exist_ok=True)
+        return upload_id
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        upload_dir = self._multipart_dir(upload_id)
+        if not os.path.isdir(upload_dir):
+            raise KeyError(f"Multipart upload '{upload_id}' not found.")
+        await self._write_file(os.path.join(upload_dir, f"{part_number:05d}.part"), data)
+        return str(part_number)
+
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict[str, Any]]):
+        upload_dir = self._multipart_dir(upload_id)
+        if not os.path.isdir(upload_dir):
+            raise KeyError(f"Multipart upload '{upload_id}' not found.")
+        part_paths = [os.path.join(upload_dir, f"{int(part['part_number']):05d}.part") for part in sorted(parts, key=lambda p: int(p["part_number"]))]
+
+        async def part_chunks():
+            for part_path in part_paths:
+                async for chunk in iter_local_file(part_path):
+                    yield chunk
+
+        await self.write(key, part_chunks())
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    async def abort_multipart_upload(self, key: str, upload_id: str):
+        shutil.rmtree(self._multipart_dir(upload_id), ignore_errors=True)
+
+    def presigned_url(self, key: str, expires_in: int = 3600, method: str = "GET") -> str:
+        return f"{self.public_base_url}/{key.lstrip('/')}"
@@ -0,0 +1,230 @@
+import hashlib
+import hmac
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from xml.etree import ElementTree
+import httpx
+
+from .base import StorageBackend, ByteSource, DEFAULT_CHUNK_SIZE, MULTIPART_PART_SIZE, iter_byte_source
+
+SIGNING_ALGORITHM = "AWS4-HMAC-SHA256"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+MAX_PRESIGN_EXPIRY = 7 * 24 * 3600
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+def _find_text(xml_body: bytes, tag_name: str) -> Optional[str]:
+    for element in ElementTree.fromstring(xml_body).iter():
+        if element.tag.rsplit("}", 1)[-1] == tag_name:
+            return element.text
+    return None
+
+class S3StorageBackend(StorageBackend):
+    is_remote = True
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = "us-east-1",
+        part_size: int = MULTIPART_PART_SIZE,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+        self.part_size = part_size
+        self.client = httpx.AsyncClient(timeout=300.0, transport=transport)
+
+    def _object_url(self, key: str) -> Tuple[str, str]:
+        canonical_uri = "/" + quote(f"{self.bucket}/{key.lstrip('/')}", safe="/-_.~")
+        return f"{self.endpoint_url}{canonical_uri}", canonical_uri
+
+    def _host(self) -> str:
+        parts = urlsplit(self.endpoint_url)
+        default_port = 443 if parts.scheme == "https" else 80
+        return parts.hostname if parts.port in (None, default_port) else f"{parts.hostname}:{parts.port}"
+
+    def _signing_key(self, date_stamp: str) -> bytes:
+        key = _hmac(f"AWS4{self.secret_access_key}".encode("utf-8"), date_stamp)
+        key = _hmac(key, self.region)
+        key = _hmac(key, "s3")
+        return _hmac(key, "aws4_request")
+
+    def _signature(
+        self,
+        method: str,
+        canonical_uri: str,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        payload_hash: str,
+        amz_date: str
+    ) -> Tuple[str, str, str]:
+        date_stamp = amz_date[:8]
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        canonical_query = "&".join(
+            f"{quote(name, safe='-_.~')}={quote(value, safe='-_.~')}" for name, value in sorted(query.items())
+        )
+        signed_header_names = sorted(name.lower() for name in headers)
+        canonical_headers = "".join(f"{name}:{str(headers[name]).strip()}\n" for name in signed_header_names)
+        signed_headers = ";".join(signed_header_names)
+
+        canonical_request = "\n".join([method, canonical_uri, canonical_query, canonical_headers, signed_headers, payload_hash])
+        string_to_sign = "\n".join([SIGNING_ALGORITHM, amz_date, scope, _sha256_hex(canonical_request.encode("utf-8"))])
+        signature = hmac.new(self._signing_key(date_stamp), string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        return signature, scope, signed_headers
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        query: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> httpx.Response:
+        query = query or {}
+        url, canonical_uri = self._object_url(key)
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        payload_hash = _sha256_hex(body)
+        headers = {
+            "host": self._host(),
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+            **{name.lower(): value for name, value in (extra_headers or {}).items()},
+        }
+        signature, scope, signed_headers = self._signature(method, canonical_uri, query, headers, payload_hash, amz_date)
+        headers["authorization"] = (
+            f"{SIGNING_ALGORITHM} Credential={self.access_key_id}/{scope}, SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        del headers["host"]
+
+        request = self.client.build_request(method, url, params=query or None, headers=headers, content=body or None)
+        return await self.client.send(request, stream=stream)
+
+    def _raise_for_status(self, response: httpx.Response, action: str, key: str):
+        if response.status_code == 404:
+            raise FileNotFoundError(f"Storage key '{key}' not found.")
+        if response.status_code >= 300:
+            raise RuntimeError(f"S3 {action} failed for '{key}' ({response.status_code}): {response.text}")
+
+    async def write(self, key: str, data: ByteSource, content_type: Optional[str] = None) -> int:
+        extra_headers = {"content-type": content_type} if content_type else None
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        parts: List[Dict[str, Any]] = []
+        size = 0
+
+        try:
+            async for chunk in iter_byte_source(data):
+                buffer.extend(chunk)
+                size += len(chunk)
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = await self.create_multipart_upload(key, content_type)
+                    part_number = len(parts) + 1
+                    etag = await self.upload_part(key, upload_id, part_number, bytes(buffer[:self.part_size]))
+                    parts.append({"part_number": part_number, "etag": etag})
+                    del buffer[:self.part_size]
+
+            if upload_id is None:
+                response = await self._request("PUT", key, body=bytes(buffer), extra_headers=extra_headers)
+                self._raise_for_status(response, "upload", key)
+                return size
+
+            if buffer:
+                part_number = len(parts) + 1
+                parts.append({"part_number": part_number, "etag": await self.upload_part(key, upload_id, part_number, bytes(buffer))})
+            await self.complete_multipart_upload(key, upload_id, parts)
+            return size
+        except BaseException:
+            if upload_id is not None:
+                await self.abort_multipart_upload(key, upload_id)
+            raise
+
+    async def read_stream(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        response = await self._request("GET", key, stream=True)
+        try:
+            if response.status_code >= 300:
+                await response.aread()
+                self._raise_for_status(response, "download", key)
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def stat(self, key: str) -> Optional[Dict[str, Any]]:
+        response = await self._request("HEAD", key)
+        if response.status_code == 404:
+            return None
+        self._raise_for_status(response, "stat", key)
+        return {
+            "key": key,
+            "size": int(response.headers.get("content-length", 0)),
+            "etag": response.headers.get("etag"),
+            "content_type": response.headers.get("content-type"),
+        }
+
+    async def delete(self, key: str) -> bool:
+        response = await self._request("DELETE", key)
+        if response.status_code == 404:
+            return False
+        self._raise_for_status(response, "delete", key)
+        return True
+
+    async def create_multipart_upload(self, key: str, content_type: Optional[str] = None) -> str:
+        extra_headers = {"content-type": content_type} if content_type else None
+        response = await self._request("POST", key, query={"uploads": ""}, extra_headers=extra_headers)
+        self._raise_for_status(response, "multipart initiation", key)
+        upload_id = _find_text(response.content, "UploadId")
+        if not upload_id:
+            raise RuntimeError(f"S3 multipart initiation for '{key}' returned no UploadId.")
+        return upload_id
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> str:
+        response = await self._request("PUT", key, query={"partNumber": str(part_number), "uploadId": upload_id}, body=data)
+        self._raise_for_status(response, f"part {part_number} upload", key)
+        return response.headers.get("etag", "")
+
+    async def complete_multipart_upload(self, key: str, upload_id: str, parts: List[Dict[str, Any]]):
+        part_elements = "".join(
+            f"<Part><PartNumber>{int(part['part_number'])}</PartNumber><ETag>{part['etag']}</ETag></Part>"
+            for part in sorted(parts, key=lambda p: int(p["part_number"]))
+        )
+        body = f"<CompleteMultipartUpload>{part_elements}</CompleteMultipartUpload>".encode("utf-8")
+        response = await self._request("POST", key, query={"uploadId": upload_id}, body=body)
+        self._raise_for_status(response, "multipart completion", key)
+        if b"<Error>" in response.content:
+            raise RuntimeError(f"S3 multipart completion failed for '{key}': {_find_text(response.content, 'Message')}")
+
+    async def abort_multipart_upload(self, key: str, upload_id: str):
+        response = await self._request("DELETE", key, query={"uploadId": upload_id})
+        if response.status_code not in (204, 404):
+            self._raise_for_status(response, "multipart abort", key)
+
+    def presigned_url(self, key: str, expires_in: int = 3600, method: str = "GET") -> str:
+        url, canonical_uri = self._object_url(key)
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        query = {
+            "X-Amz-Algorithm": SIGNING_ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key_id}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(min(expires_in, MAX_PRESIGN_EXPIRY)),
+            "X-Amz-SignedHeaders": "host",
+        }
+        signature, _, _ = self._signature(method, canonical_uri, query, {"host": self._host()}, UNSIGNED_PAYLOAD, amz_date)
+        query["X-Amz-Signature"] = signature
+        return str(httpx.URL(url, params=query))
+
+    async def aclose(self):
+        await self.client.aclose()
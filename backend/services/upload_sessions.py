@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+
+from ..utils.upload_stream import (
+    StreamingUploadWriter, UploadTooLargeError, UnsupportedUploadError, FORMAT_EXTENSIONS, max_upload_size
+)
+
+SESSION_DIRNAME = ".upload_sessions"
+DEFAULT_SESSION_TTL_SECONDS = 24 * 3600
+ALLOWED_UPLOAD_EXTENSIONS = set().union(*FORMAT_EXTENSIONS.values())
+
+class UploadOffsetMismatchError(ValueError):
+    def __init__(self, expected_offset: int):
+        super().__init__(f"Upload offset mismatch; expected {expected_offset}.")
+        self.expected_offset = expected_offset
+
+class UploadSessionManager:
+    def __init__(self, base_upload_dir: str = "uploads", max_size: Optional[int] = None, ttl_seconds: int = DEFAULT_SESSION_TTL_SECONDS):
+        self.session_dir = os.path.join(base_upload_dir, SESSION_DIRNAME)
+        self.max_size = max_size if max_size is not None else max_upload_size()
+        self.ttl_seconds = ttl_seconds
+        self._writers: Dict[str, StreamingUploadWriter] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        os.makedirs(self.session_dir, exist_ok=True)
+
+    def _meta_path(self, session_id: str) -> str:
+        return os.path.join(self.session_dir, f"{os.path.basename(session_id)}.json")
+
+    def _data_path(self, session_id: str) -> str:
+        return os.path.join(self.session_dir, os.path.basename(session_id))
+
+    def _save(self, session: Dict[str, Any]):
+        temp_path = f"{self._meta_path(session['id'])}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(session, f)
+        os.replace(temp_path, self._meta_path(session["id"]))
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        meta_path = self._meta_path(session_id)
+        if not os.path.exists(meta_path):
+            raise KeyError(f"Upload session '{session_id}' not found or expired.")
+        with open(meta_path, "r") as f:
+            session = json.load(f)
+        partial_path = f"{self._data_path(session_id)}.partial"
+        session["offset"] = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        return session
+
+    def create(self, filename: str, category: str, total_size: int) -> Dict[str, Any]:
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in ALLOWED_UPLOAD_EXTENSIONS:
+            raise UnsupportedUploadError(f"File type '{ext or filename}' is not accepted for upload.")
+        if total_size > self.max_size:
+            raise UploadTooLargeError(f"'{filename}' exceeds the maximum upload size of {self.max_size} bytes.")
+
+        session = {
+            "id": uuid.uuid4().hex,
+            "filename": os.path.basename(filename),
+            "category": category,
+            "total_size": total_size,
+            "created_at": time.time(),
+            "offset": 0,
+        }
+        self._save(session)
+        return session
+
+    def _writer_for(self, session: Dict[str, Any]) -> StreamingUploadWriter:
+        writer = self._writers.get(session["id"])
+        if writer is None or writer.size != session["offset"]:
+            writer = StreamingUploadWriter(self._data_path(session["id"]), session["filename"], max_size=session["total_size"], append=True)
+            self._writers[session["id"]] = writer
+        return writer
+
+    async def append(self, session_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            session = self.get(session_id)
+            if offset != session["offset"]:
+                raise UploadOffsetMismatchError(session["offset"])
+
+            writer = self._writer_for(session)
+            try:
+                async for chunk in chunks:
+                    await writer.write(chunk)
+            except (UploadTooLargeError, UnsupportedUploadError):
+                await self.abort(session_id)
+                raise
+            finally:
+                await writer.close()
+            return self.get(session_id)
+
+    async def complete(self, session_id: str) -> Tuple[str, int, str, Dict[str, Any]]:
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            session = self.get(session_id)
+            if session["offset"] != session["total_size"]:
+                raise UploadOffsetMismatchError(session["offset"])
+
+            writer = self._writer_for(session)
+            try:
+                path, size, content_hash = await writer.finalize()
+            except UnsupportedUploadError:
+                await self.abort(session_id)
+                raise
+            self._writers.pop(session_id, None)
+            self._locks.pop(session_id, None)
+            os.remove(self._meta_path(session_id))
+            return path, size, content_hash, session
+
+    async def abort(self, session_id: str) -> bool:
+        writer = self._writers.pop(session_id, None)
+        if writer is not None:
+            await writer.close()
+        self._locks.pop(session_id, None)
+        removed = False
+        for path in (self._meta_path(session_id), f"{self._data_path(session_id)}.partial", self._data_path(session_id)):
+            if os.path.exists(path):
+                os.remove(path)
+                removed = True
+        return removed
+
+    async def expire_stale(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        expired = 0
+        for filename in os.listdir(self.session_dir):
+            if not filename.endswith(".json"):
+                continue
+            session_id = filename[:-len(".json")]
+            try:
+                session = self.get(session_id)
+            except (KeyError, ValueError):
+                continue
+            if now - session["created_at"] > self.ttl_seconds and await self.abort(session_id):
+                expired += 1
+        return expired
+
+_default_session_manager: Optional[UploadSessionManager] = None
+
+def get_upload_session_manager() -> UploadSessionManager:
+    global _default_session_manager
+    if _default_session_manager is None:
+        _default_session_manager = UploadSessionManager(
+            os.getenv("UPLOAD_DIR", "uploads"),
+            ttl_seconds=int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(DEFAULT_SESSION_TTL_SECONDS)))
+        )
+    return _default_session_manager
@@ -0,0 +1,79 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.metrics import cache_lookups_counter
+
+DEFAULT_WORKFLOW_CACHE_SIZE = 256
+
+CACHE_LOOKUPS = cache_lookups_counter()
+
+class ParsedWorkflowCache:
+    def __init__(self, max_entries: int = DEFAULT_WORKFLOW_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._hit_counter = CACHE_LOOKUPS.labels("workflow", "hit")
+        self._miss_counter = CACHE_LOOKUPS.labels("workflow", "miss")
+
+    def get(self, workflow_id: str, version: int) -> Optional[Any]:
+        key = (workflow_id, version)
+        with self._lock:
+            workflow = self._entries.get(key)
+            if workflow is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+            return workflow
+
+    def put(self, workflow_id: str, version: int, workflow: Any):
+        if self.max_entries <= 0:
+            return
+        key = (workflow_id, version)
+        with self._lock:
+            self._entries[key] = workflow
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, workflow_id: str) -> int:
+        with self._lock:
+            stale_keys = [key for key in self._entries if key[0] == workflow_id]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+            return len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+_default_workflow_cache: Optional[ParsedWorkflowCache] = None
+
+def get_workflow_cache() -> ParsedWorkflowCache:
+    global _default_workflow_cache
+    if _default_workflow_cache is None:
+        _default_workflow_cache = ParsedWorkflowCache(int(os.getenv("WORKFLOW_CACHE_SIZE", str(DEFAULT_WORKFLOW_CACHE_SIZE))))
+    return _default_workflow_cache
@@ -1,34 +1,65 @@
 import asyncio
+import hashlib
+import json
 import os
-import uuid
-from typing import Dict, Any, List, Optional, Tuple
-from collections import deque
+import time
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+from collections import deque, OrderedDict
 import httpx
-from PIL import Image
 
-from ..services.ai_providers.base import BaseAIProvider, GenerationRequest
-from ..services.ai_providers.openai_provider import OpenAIProvider
-from ..services.ai_providers.fal_provider import FalProvider
-from ..services.ai_providers.stability_provider import StabilityProvider
+from ..services.ai_providers.base import BaseAIProvider, GenerationRequest, GenerationResponse
+from ..services.ai_providers.registry import get_provider_registry
 from ..utils.file_handler import FileHandler
 from ..utils.image_processor import ImageProcessor
+from ..utils.content_hash import versioned_url
+from ..utils.workflow_diff import PRESENTATION_ONLY_NODE_FIELDS
+from ..utils.metrics import get_metrics_registry, cache_lookups_counter, FAST_BUCKETS
+from ..utils.tracing import get_tracer, current_span, new_trace_id, trace_id_for, SPAN_KIND_CLIENT
+from .nodes.registry import get_node_registry
+from .asset_index import get_asset_index
+from .artifact_store import get_artifact_store
+from .provider_telemetry import get_provider_telemetry
+
+NODE_RESULT_CACHE_SIZE = 512
+
+EXECUTION_MODES = ("final", "draft")
+DRAFT_RUN_HISTORY_SIZE = 64
+RECENT_EXECUTION_HISTORY_SIZE = 256
+
+PROVIDER_CONCURRENCY_LIMITS = {"openai": 4, "fal": 8, "stability": 4}
+DEFAULT_PROVIDER_CONCURRENCY = 4
+BATCH_MAX_CONCURRENCY = 8
+
+_metrics = get_metrics_registry()
+NODE_EXECUTION_SECONDS = _metrics.histogram(
+    "marketcanvas_node_execution_seconds", "Node execution time by node type.", ("node_type", "mode", "status")
+)
+WORKFLOW_MAKESPAN_SECONDS = _metrics.histogram(
+    "marketcanvas_workflow_makespan_seconds", "Wall-clock time to run a compiled workflow plan.", ("mode", "status")
+)
+CACHE_LOOKUPS = cache_lookups_counter()
+NODES_IN_FLIGHT = _metrics.gauge("marketcanvas_nodes_in_flight", "Nodes currently executing.")
+PROVIDER_QUEUE_SECONDS = _metrics.histogram(
+    "marketcanvas_provider_queue_seconds", "Time spent waiting for a provider concurrency slot.", ("provider",), buckets=FAST_BUCKETS
+)
+PROVIDER_QUEUE_DEPTH = _metrics.gauge(
+    "marketcanvas_provider_queue_depth", "Provider calls waiting for or holding a concurrency slot.", ("provider",)
+)
 
 class WorkflowEngine:
     def __init__(self):
         self.file_handler = FileHandler()
-        self.image_processor = ImageProcessor(self.file_handler)
-        self.node_type_configs = self._get_default_node_type_configs()
-
-    def _get_default_node_type_configs(self) -> Dict[str, Any]:
-        return {
-            "image_input": {"outputs": ["image"], "properties": {"source_type":{}, "url":{}, "file":{}}},
-            "text_to_image": {"inputs": ["prompt"], "outputs": ["image"], "properties": {"provider":{}, "model":{}, "prompt":{}, "width":{}, "height":{}, "steps":{}, "guidance_scale":{}}},
-            "image_to_image": {"inputs": ["image", "prompt"], "outputs": ["image"], "properties": {"provider":{}, "prompt":{}, "strength":{}}},
-            "style_transfer": {"inputs": ["image"], "outputs": ["image"], "properties": {"style":{}, "intensity":{}}},
-            "text_overlay": {"inputs": ["image"], "outputs": ["image"], "properties": {"text":{}, "position":{}, "font_size":{}, "font_color":{}, "background_color":{}}},
-            "crop_resize": {"inputs": ["image"], "outputs": ["image"], "properties": {"width":{}, "height":{}, "crop_type":{}}},
-            "output": {"inputs": ["image"], "outputs": [], "properties": {"format":{}, "quality":{}}},
-        }
+        self.asset_index = get_asset_index()
+        self.artifact_store = get_artifact_store()
+        self.image_processor = ImageProcessor(self.file_handler, self.asset_index, self.artifact_store)
+        self.node_registry = get_node_registry()
+        self.provider_registry = get_provider_registry()
+        self.provider_telemetry = get_provider_telemetry()
+        self._node_result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._draft_runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._recent_execution_ids: deque = deque(maxlen=RECENT_EXECUTION_HISTORY_SIZE)
+        self._inflight_nodes: Dict[str, asyncio.Future] = {}
+        self._provider_limiters: Dict[str, asyncio.Semaphore] = {}
 
     async def _get_ai_provider(self, provider_name: str, api_keys: Dict[str, str]) -> BaseAIProvider:
         api_key = api_keys.get(provider_name.lower())
@@ -37,264 +68,400 @@ class WorkflowEngine:
             if not api_key:
                  raise ValueError(f"API key for {provider_name} not found. Ensure it's set in the UI and passed correctly.")
 
-        provider_name_lower = provider_name.lower()
-        if provider_name_lower == "openai":
-            return OpenAIProvider(api_key)
-        elif provider_name_lower == "fal":
-            return FalProvider(api_key)
-        elif provider_name_lower == "stability":
-            return StabilityProvider(api_key)
-        else:
-            raise ValueError(f"Unknown AI provider: {provider_name}")
+        return self.provider_registry.create(provider_name, api_key)
+
+    async def _call_provider(
+        self,
+        provider_name: str,
+        operation: str,
+        request: GenerationRequest,
+        api_keys: Dict[str, str],
+        execution_id: Optional[str] = None
+    ) -> GenerationResponse:
+        provider_class = self.provider_registry.get(provider_name)
+        span_attributes = {"provider.name": provider_class.provider_name, "provider.operation": operation}
+        with get_tracer().span(f"provider.{operation}", span_attributes, kind=SPAN_KIND_CLIENT) as span:
+            async with await self._get_ai_provider(provider_name, api_keys) as provider:
+                async with self.provider_telemetry.track(provider_name, operation, request.model, execution_id) as call:
+                    queue_depth = PROVIDER_QUEUE_DEPTH.labels(call.provider)
+                    queue_depth.inc()
+                    try:
+                        async with self._provider_limiter(provider_name):
+                            call.mark_dispatched()
+                            PROVIDER_QUEUE_SECONDS.labels(call.provider).observe(call.queue_ms / 1000)
+                            res = await getattr(provider, operation)(request)
+                    finally:
+                        queue_depth.dec()
+                        span.set_attributes({
+                            "provider.queue_ms": call.queue_ms,
+                            "provider.connect_ms": call.connect_ms,
+                            "provider.ttfb_ms": call.ttfb_ms,
+                            "http.status_code": call.http_status,
+                            "http.request_count": call.http_requests,
+                            "http.request.body.size": call.bytes_sent,
+                            "http.response.body.size": call.bytes_received,
+                        })
+                    model = (res.metadata or {}).get("model") or request.model
+                    call.model = model or call.model
+                    call.finish(res.success, error=res.error, cost_usd=provider_class.estimated_cost(model))
+            span.set_attributes({"provider.model": call.model, "provider.cost_usd": call.cost_usd, "provider.success": res.success})
+            if not res.success:
+                span.record_exception(RuntimeError(res.error or "Provider call failed."))
+        return res
+
+    async def save_image_from_url(self, image_url: str, execution_id: str, node_id: str) -> str:
+        with get_tracer().span("file.save_image_from_url", {"node.id": node_id}):
+            image_path = await self.file_handler.save_image_from_url(image_url, execution_id, node_id)
+        self._register_artifact(image_path, execution_id)
+        return image_path
+
+    def _content_address(self, value: Any) -> Any:
+        if isinstance(value, str):
+            content_hash = self.artifact_store.resolve(value)
+            if content_hash:
+                return f"sha256:{content_hash}"
+        return value
+
+    def _node_cache_key(self, node: Dict[str, Any], node_inputs: Dict[str, Any], mode: str = "final") -> str:
+        properties = {k: v for k, v in (node.get("data") or {}).items() if k not in PRESENTATION_ONLY_NODE_FIELDS}
+        inputs = {name: self._content_address(value) for name, value in node_inputs.items()}
+        payload = json.dumps(
+            {"type": node["type"], "properties": properties, "inputs": inputs, "mode": mode},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_cached_node_outputs(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        cached_outputs = self._node_result_cache.get(cache_key)
+        if cached_outputs is None:
+            return None
+
+        for output_name in ("image", "final_image_path"):
+            output_path = cached_outputs.get(output_name)
+            if output_path and not os.path.exists(output_path):
+                del self._node_result_cache[cache_key]
+                return None
+
+        self._node_result_cache.move_to_end(cache_key)
+        return cached_outputs
+
+    def _store_node_outputs(self, cache_key: str, outputs: Dict[str, Any]):
+        self._node_result_cache[cache_key] = outputs
+        self._node_result_cache.move_to_end(cache_key)
+        while len(self._node_result_cache) > NODE_RESULT_CACHE_SIZE:
+            self._node_result_cache.popitem(last=False)
+
+    def _provider_limiter(self, provider_name: str) -> asyncio.Semaphore:
+        provider_key = provider_name.lower()
+        if provider_key not in self._provider_limiters:
+            limit = PROVIDER_CONCURRENCY_LIMITS.get(provider_key, DEFAULT_PROVIDER_CONCURRENCY)
+            self._provider_limiters[provider_key] = asyncio.Semaphore(limit)
+        return self._provider_limiters[provider_key]
+
+    def recent_execution_ids(self) -> List[str]:
+        return list(self._recent_execution_ids)
+
+    def referenced_artifact_paths(self) -> List[str]:
+        paths = []
+        for cached_outputs in list(self._node_result_cache.values()):
+            for output_name in ("image", "final_image_path"):
+                if cached_outputs.get(output_name):
+                    paths.append(cached_outputs[output_name])
+        return paths
+
+    def _register_artifact(self, path: str, execution_id: str):
+        with get_tracer().span("artifact.register"):
+            content_hash = self.artifact_store.ingest(path)
+            self.asset_index.add(path, kind="artifact", execution_id=execution_id, content_hash=content_hash)
+
+    def _node_span_attributes(self, node: Dict[str, Any], mode: str) -> Dict[str, Any]:
+        return {"node.id": node["id"], "node.type": node["type"], "workflow.mode": mode}
 
     async def _execute_node(
         self,
         node: Dict[str, Any],
         node_inputs: Dict[str, Any],
         api_keys: Dict[str, str],
-        execution_id: str
+        execution_id: str,
+        mode: str = "final"
     ) -> Dict[str, Any]:
-        node_type = node["type"]
-        node_data_properties = node["data"]
-        outputs = {}
-
-        current_node_params = {**node_data_properties, **node_inputs}
-
-        if node_type == "image_input":
-            source_type = current_node_params.get("source_type", "upload")
-            if source_type == "url":
-                image_url_param = current_node_params.get("url")
-                if not image_url_param: raise ValueError("Image Input node (URL) is missing 'url' parameter.")
-                image_path = await self.file_handler.save_image_from_url(image_url_param, execution_id, node["id"])
-            else:
-                image_path_param = current_node_params.get("file")
-                if not image_path_param:
-                    raise ValueError(f"Image Input node (upload) is missing 'file' parameter.")
-
-                if not os.path.isabs(image_path_param) and not image_path_param.startswith(self.file_handler.base_upload_dir):
-                    full_image_path = os.path.join(self.file_handler.base_upload_dir, image_path_param.lstrip('/\\'))
-                else:
-                    full_image_path = image_path_param
-
-                if not os.path.exists(full_image_path):
-                     raise ValueError(f"Image Input node (upload) file not found at resolved path: {full_image_path} (original: {image_path_param})")
-                image_path = full_image_path
-            outputs["image"] = image_path
+        with get_tracer().span(f"node.{node['type']}", {**self._node_span_attributes(node, mode), "cache.hit": False}):
+            node_type = self.node_registry.get(node["type"])
+            current_node_params = {**node["data"], **node_inputs}
+            if mode == "draft":
+                current_node_params = node_type.draft_params(current_node_params)
+            return await node_type.execute(self, node, current_node_params, api_keys, execution_id, mode)
 
-        elif node_type == "text_to_image":
-            provider_name = current_node_params.get("provider")
-            prompt_val = current_node_params.get("prompt")
-            if not provider_name or not prompt_val:
-                raise ValueError("Text-to-Image node missing 'provider' or 'prompt'.")
+    def _node_properties_signature(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in (node.get("data") or {}).items() if k not in PRESENTATION_ONLY_NODE_FIELDS}
 
-            async with await self._get_ai_provider(provider_name, api_keys) as provider:
-                req = GenerationRequest(
-                    prompt=prompt_val,
-                    width=int(current_node_params.get("width", 1024)),
-                    height=int(current_node_params.get("height", 1024)),
-                    steps=int(current_node_params.get("steps", 30)),
-                    guidance_scale=float(current_node_params.get("guidance_scale", 7.5))
-                )
-                res = await provider.text_to_image(req)
-
-            if not res.success or not res.image_url:
-                raise RuntimeError(f"Text-to-Image generation failed for provider {provider_name}: {res.error}")
-
-            image_path = await self.file_handler.save_image_from_url(res.image_url, execution_id, node["id"])
-            outputs["image"] = image_path
-
-        elif node_type == "image_to_image":
-            provider_name = current_node_params.get("provider")
-            prompt_val = current_node_params.get("prompt")
-            input_image_path = current_node_params.get("image")
-            if not provider_name or not prompt_val or not input_image_path:
-                raise ValueError("Image-to-Image node missing 'provider', 'prompt', or input 'image'.")
-            if not os.path.exists(input_image_path):
-                raise ValueError(f"Image-to-Image node: input image path does not exist: {input_image_path}")
-
-            base_api_url_for_uploads = "http://localhost:8000/uploads"
-            input_image_public_url = self.file_handler.get_url_for_file(input_image_path, api_base_url=base_api_url_for_uploads)
-
-            img_pil = Image.open(input_image_path)
-            original_width, original_height = img_pil.size
-            img_pil.close()
-
-            async with await self._get_ai_provider(provider_name, api_keys) as provider:
-                req = GenerationRequest(
-                    prompt=prompt_val,
-                    image_url=input_image_public_url,
-                    strength=float(current_node_params.get("strength", 0.8)),
-                    width=int(current_node_params.get("width", original_width)),
-                    height=int(current_node_params.get("height", original_height)),
-                    steps=int(current_node_params.get("steps", 30)),
+    def _eliminate_common_subexpressions(
+        self,
+        order: List[str],
+        node_map: Dict[str, Dict[str, Any]],
+        incoming: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]],
+        roots: List[str],
+        volatile_node_ids: Optional[set] = None
+    ) -> Tuple[List[str], Dict[str, List[Tuple[str, Optional[str], Optional[str]]]], Dict[str, str]]:
+        aliases: Dict[str, str] = {}
+        canonical_by_signature: Dict[str, str] = {}
+        rewritten_incoming: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {}
+        unique_order: List[str] = []
+
+        for node_id in order:
+            node = node_map[node_id]
+            node_incoming = [(aliases.get(source_id, source_id), s_handle, t_handle) for source_id, s_handle, t_handle in incoming[node_id]]
+
+            if node_id in roots or not self.node_registry.is_cacheable(node["type"]) or (volatile_node_ids and node_id in volatile_node_ids):
+                signature = f"unique:{node_id}"
+            else:
+                signature = json.dumps(
+                    {"type": node["type"], "properties": self._node_properties_signature(node), "inputs": sorted(node_incoming, key=str)},
+                    sort_keys=True,
+                    default=str
                 )
-                res = await provider.image_to_image(req)
-
-            if not res.success or not res.image_url:
-                raise RuntimeError(f"Image-to-Image generation failed for provider {provider_name}: {res.error}")
 
-            image_path = await self.file_handler.save_image_from_url(res.image_url, execution_id, node["id"])
-            outputs["image"] = image_path
+            canonical_id = canonical_by_signature.setdefault(signature, node_id)
+            if canonical_id != node_id:
+                aliases[node_id] = canonical_id
+                continue
 
-        elif node_type == "style_transfer":
-            input_image_path = current_node_params.get("image")
-            style = current_node_params.get("style")
-            intensity = float(current_node_params.get("intensity", 0.7))
-            if not input_image_path or not style:
-                 raise ValueError("Style Transfer node missing input 'image' or 'style'.")
-            if not os.path.exists(input_image_path):
-                raise ValueError(f"Style Transfer node: input image path does not exist: {input_image_path}")
+            rewritten_incoming[node_id] = node_incoming
+            unique_order.append(node_id)
 
-            processed_image_path = await self.image_processor.apply_style_transfer(
-                input_image_path, style, intensity, execution_id, node["id"]
-            )
-            outputs["image"] = processed_image_path
-
-        elif node_type == "text_overlay":
-            input_image_path = current_node_params.get("image")
-            text_content = str(current_node_params.get("text", ""))
-            if not input_image_path:
-                raise ValueError("Text Overlay node missing input 'image'.")
-            if not os.path.exists(input_image_path):
-                raise ValueError(f"Text Overlay node: input image path does not exist: {input_image_path}")
-
-            processed_image_path = await self.image_processor.apply_text_overlay(
-                input_image_path,
-                text_content,
-                str(current_node_params.get("position", "center")),
-                int(current_node_params.get("font_size", 32)),
-                str(current_node_params.get("font_color", "#ffffff")),
-                str(current_node_params.get("background_color", "transparent")),
-                execution_id, node["id"]
-            )
-            outputs["image"] = processed_image_path
-
-        elif node_type == "crop_resize":
-            input_image_path = current_node_params.get("image")
-            if not input_image_path:
-                raise ValueError("Crop & Resize node missing input 'image'.")
-            if not os.path.exists(input_image_path):
-                raise ValueError(f"Crop & Resize node: input image path does not exist: {input_image_path}")
-
-            width_param = current_node_params.get("width")
-            height_param = current_node_params.get("height")
-
-            processed_image_path = await self.image_processor.crop_resize_image(
-                input_image_path,
-                int(width_param) if width_param else None,
-                int(height_param) if height_param else None,
-                str(current_node_params.get("crop_type", "resize_only")),
-                execution_id, node["id"]
-            )
-            outputs["image"] = processed_image_path
-
-        elif node_type == "output":
-            input_image_path = current_node_params.get("image")
-            if not input_image_path:
-                raise ValueError("Output node missing input 'image'.")
-            if not os.path.exists(input_image_path):
-                raise ValueError(f"Output node: input image path does not exist: {input_image_path}")
-
-            final_image_path = await self.image_processor.convert_image_format(
-                input_image_path,
-                str(current_node_params.get("format", "png")),
-                int(current_node_params.get("quality", 90)),
-                execution_id, node["id"]
-            )
-            outputs["final_image_path"] = final_image_path
-            base_api_url_for_uploads = "http://localhost:8000/uploads"
-            outputs["final_image_url"] = self.file_handler.get_url_for_file(final_image_path, api_base_url=base_api_url_for_uploads)
-
-        else:
-            outputs = {**node_inputs}
+        if aliases:
+            print(f"Merged {len(aliases)} duplicate node(s) into shared computations: {aliases}")
 
-        return outputs
+        return unique_order, rewritten_incoming, aliases
 
-    async def execute_workflow(
+    def _compile_workflow(
         self,
         nodes: List[Dict[str, Any]],
         edges: List[Dict[str, Any]],
-        api_keys: Dict[str, str]
+        target_node_ids: Optional[List[str]] = None,
+        volatile_node_ids: Optional[set] = None
     ) -> Dict[str, Any]:
-        execution_id = str(uuid.uuid4())
-
-        adj: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {node["id"]: [] for node in nodes}
-        in_degree: Dict[str, int] = {node["id"]: 0 for node in nodes}
         node_map: Dict[str, Dict[str, Any]] = {node["id"]: node for node in nodes}
+        incoming: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {node_id: [] for node_id in node_map}
 
         for edge in edges:
             source_id, target_id = edge["source"], edge["target"]
-            source_handle = edge.get("sourceHandle")
-            target_handle = edge.get("targetHandle")
-
             if source_id in node_map and target_id in node_map:
-                adj[source_id].append((target_id, source_handle, target_handle))
-                in_degree[target_id] += 1
+                incoming[target_id].append((source_id, edge.get("sourceHandle"), edge.get("targetHandle")))
             else:
                 print(f"Warning: Edge references non-existent node. Source: {source_id}, Target: {target_id}")
 
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
+        if target_node_ids:
+            unknown_targets = [node_id for node_id in target_node_ids if node_id not in node_map]
+            if unknown_targets:
+                raise ValueError(f"Requested target node(s) not found in workflow: {unknown_targets}")
+            roots = list(dict.fromkeys(target_node_ids))
+        else:
+            roots = [node_id for node_id, node in node_map.items() if node["type"] == "output"]
+
+        required: set = set()
+        stack = list(roots)
+        while stack:
+            node_id = stack.pop()
+            if node_id in required:
+                continue
+            required.add(node_id)
+            stack.extend(source_id for source_id, _, _ in incoming[node_id] if source_id not in required)
+
+        pending: Dict[str, int] = {node_id: 0 for node_id in required}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in required}
+        for node_id in required:
+            for source_id, _, _ in incoming[node_id]:
+                pending[node_id] += 1
+                dependents[source_id].append(node_id)
+
+        queue = deque(node_id for node_id in node_map if node_id in required and pending[node_id] == 0)
+        order: List[str] = []
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for dependent_id in dependents[node_id]:
+                pending[dependent_id] -= 1
+                if pending[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        if len(order) < len(required):
+            cyclic = [node_id for node_id in node_map if node_id in required and pending[node_id] > 0]
+            print(f"Error: Cycle detected among nodes required for the requested outputs: {cyclic}")
+            raise RuntimeError(f"Cycle detected in workflow graph, nodes not executed: {cyclic}")
+
+        skipped = len(node_map) - len(required)
+        if skipped:
+            print(f"Pruned {skipped} node(s) that do not contribute to the requested outputs.")
+
+        order, plan_incoming, aliases = self._eliminate_common_subexpressions(
+            order, node_map, incoming, roots, volatile_node_ids
+        )
 
-        node_execution_outputs: Dict[str, Dict[str, Any]] = {}
-        executed_count = 0
+        return {
+            "node_map": node_map,
+            "incoming": plan_incoming,
+            "order": order,
+            "aliases": aliases,
+            "targets": roots,
+        }
 
-        while queue:
-            current_node_id = queue.popleft()
-            current_node_obj = node_map[current_node_id]
-            executed_count += 1
-
-            inputs_for_current_node: Dict[str, Any] = {}
-
-            for N_id, N_degree in in_degree.items():
-                for neighbor_id, s_handle, t_handle in adj[N_id]:
-                    if neighbor_id == current_node_id:
-                        source_node_id = N_id
-
-                        if not t_handle:
-                            node_config = self.node_type_configs.get(current_node_obj["type"], {})
-                            expected_inputs = node_config.get("inputs", [])
-                            if len(expected_inputs) == 1:
-                                t_handle = expected_inputs[0]
-                            else:
-                                print(f"Warning: Edge from {source_node_id} to {current_node_id} missing targetHandle, and target node expects multiple or zero named inputs. Skipping this input.")
-                                continue
-
-                        if source_node_id in node_execution_outputs:
-                            source_all_outputs = node_execution_outputs[source_node_id]
-
-                            if s_handle and s_handle in source_all_outputs:
-                                inputs_for_current_node[t_handle] = source_all_outputs[s_handle]
-                            elif not s_handle and len(source_all_outputs) == 1:
-                                inputs_for_current_node[t_handle] = list(source_all_outputs.values())[0]
-                            elif not s_handle and t_handle in source_all_outputs:
-                                inputs_for_current_node[t_handle] = source_all_outputs[t_handle]
-                            else:
-                                print(f"Warning: Could not map output from {source_node_id} (handle: {s_handle}) to input {t_handle} of {current_node_id}. Available source outputs: {list(source_all_outputs.keys())}")
-                        else:
-                            print(f"Error: Source node {source_node_id} has no outputs recorded when trying to feed {current_node_id}.")
+    def _collect_node_inputs(
+        self,
+        node: Dict[str, Any],
+        incoming_edges: List[Tuple[str, Optional[str], Optional[str]]],
+        node_execution_outputs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        current_node_id = node["id"]
+        inputs_for_current_node: Dict[str, Any] = {}
+
+        for source_node_id, s_handle, t_handle in incoming_edges:
+            if not t_handle:
+                node_type = self.node_registry.find(node["type"])
+                expected_inputs = node_type.inputs if node_type is not None else []
+                if len(expected_inputs) == 1:
+                    t_handle = expected_inputs[0]
+                else:
+                    print(f"Warning: Edge from {source_node_id} to {current_node_id} missing targetHandle, and target node expects multiple or zero named inputs. Skipping this input.")
+                    continue
+
+            if source_node_id in node_execution_outputs:
+                source_all_outputs = node_execution_outputs[source_node_id]
+
+                if s_handle and s_handle in source_all_outputs:
+                    inputs_for_current_node[t_handle] = source_all_outputs[s_handle]
+                elif not s_handle and len(source_all_outputs) == 1:
+                    inputs_for_current_node[t_handle] = list(source_all_outputs.values())[0]
+                elif not s_handle and t_handle in source_all_outputs:
+                    inputs_for_current_node[t_handle] = source_all_outputs[t_handle]
+                else:
+                    print(f"Warning: Could not map output from {source_node_id} (handle: {s_handle}) to input {t_handle} of {current_node_id}. Available source outputs: {list(source_all_outputs.keys())}")
+            else:
+                print(f"Error: Source node {source_node_id} has no outputs recorded when trying to feed {current_node_id}.")
+
+        return inputs_for_current_node
+
+    def _dirty_node_ids(self, plan: Dict[str, Any], changed_node_ids: List[str]) -> set:
+        aliases = plan.get("aliases", {})
+        dirty = {aliases.get(node_id, node_id) for node_id in changed_node_ids}
+        for node_id in plan["order"]:
+            if any(source_id in dirty for source_id, _, _ in plan["incoming"][node_id]):
+                dirty.add(node_id)
+        return dirty
+
+    async def _run_plan(
+        self,
+        plan: Dict[str, Any],
+        api_keys: Dict[str, str],
+        execution_id: str,
+        use_cache: bool = False,
+        skip_node_ids: Optional[List[str]] = None,
+        mode: str = "final",
+        changed_node_ids: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        started = time.perf_counter()
+        status = "error"
+        span_attributes = {"execution.id": execution_id, "workflow.mode": mode, "workflow.node_count": len(plan["order"])}
+        try:
+            with get_tracer().span("workflow.run", span_attributes, trace_id=trace_id_for(execution_id)):
+                node_execution_outputs = await self._run_plan_nodes(
+                    plan, api_keys, execution_id, use_cache, skip_node_ids, mode, changed_node_ids
+                )
+            status = "ok"
+            return node_execution_outputs
+        finally:
+            WORKFLOW_MAKESPAN_SECONDS.labels(mode, status).observe(time.perf_counter() - started)
 
+    async def _run_plan_nodes(
+        self,
+        plan: Dict[str, Any],
+        api_keys: Dict[str, str],
+        execution_id: str,
+        use_cache: bool,
+        skip_node_ids: Optional[List[str]],
+        mode: str,
+        changed_node_ids: Optional[List[str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        node_execution_outputs: Dict[str, Dict[str, Any]] = {}
+        cached_node_count = 0
+        self._recent_execution_ids.append(execution_id)
+        dirty_node_ids = self._dirty_node_ids(plan, changed_node_ids) if changed_node_ids is not None else None
+        if dirty_node_ids is not None:
+            print(f"Incremental run {execution_id}: {len(dirty_node_ids & set(plan['order']))} of {len(plan['order'])} node(s) affected by changes.")
+
+        for current_node_id in plan["order"]:
+            if skip_node_ids and current_node_id in skip_node_ids:
+                continue
+            current_node_obj = plan["node_map"][current_node_id]
+            inputs_for_current_node = self._collect_node_inputs(
+                current_node_obj, plan["incoming"][current_node_id], node_execution_outputs
+            )
+
+            cache_key = self._node_cache_key(current_node_obj, inputs_for_current_node, mode)
+            if use_cache or (dirty_node_ids is not None and current_node_id not in dirty_node_ids):
+                cached_outputs = self._get_cached_node_outputs(cache_key)
+                pending = self._inflight_nodes.get(cache_key) if cached_outputs is None else None
+                if cached_outputs is not None or pending is not None:
+                    span_attributes = {
+                        **self._node_span_attributes(current_node_obj, mode), "cache.hit": True, "cache.inflight": pending is not None
+                    }
+                    with get_tracer().span(f"node.{current_node_obj['type']}", span_attributes):
+                        if pending is not None:
+                            try:
+                                cached_outputs = await asyncio.shield(pending)
+                            except Exception as e:
+                                raise RuntimeError(f"Workflow execution failed at node {current_node_id} ({current_node_obj['type']}): {str(e)}") from e
+                if cached_outputs is not None:
+                    CACHE_LOOKUPS.labels("node_result", "hit").inc()
+                    cached_node_count += 1
+                    node_execution_outputs[current_node_id] = cached_outputs
+                    continue
+                CACHE_LOOKUPS.labels("node_result", "miss").inc()
+
+            inflight = asyncio.get_running_loop().create_future()
+            inflight.add_done_callback(lambda future: future.cancelled() or future.exception())
+            self._inflight_nodes[cache_key] = inflight
+            node_started = time.perf_counter()
+            NODES_IN_FLIGHT.inc()
             try:
-                current_node_generated_outputs = await self._execute_node(
+                node_execution_outputs[current_node_id] = await self._execute_node(
                     current_node_obj,
                     inputs_for_current_node,
                     api_keys,
-                    execution_id
+                    execution_id,
+                    mode
                 )
-                node_execution_outputs[current_node_id] = current_node_generated_outputs
+                NODE_EXECUTION_SECONDS.labels(current_node_obj["type"], mode, "ok").observe(time.perf_counter() - node_started)
+                self._store_node_outputs(cache_key, node_execution_outputs[current_node_id])
+                inflight.set_result(node_execution_outputs[current_node_id])
             except Exception as e:
+                NODE_EXECUTION_SECONDS.labels(current_node_obj["type"], mode, "error").observe(time.perf_counter() - node_started)
+                inflight.set_exception(e)
                 print(f"Error executing node {current_node_id} ({current_node_obj['type']}): {e}")
                 raise RuntimeError(f"Workflow execution failed at node {current_node_id} ({current_node_obj['type']}): {str(e)}") from e
-
-            for neighbor_id, _, _ in adj[current_node_id]:
-                in_degree[neighbor_id] -= 1
-                if in_degree[neighbor_id] == 0:
-                    queue.append(neighbor_id)
-
-        if executed_count < len(nodes):
-            not_executed = [nid for nid, deg in in_degree.items() if deg > 0]
-            print(f"Error: Workflow execution incomplete. Possible cycle or disconnected components. Nodes not executed (due to pending inputs): {not_executed}")
-            raise RuntimeError("Cycle detected in workflow graph or disconnected components, not all nodes executed.")
-
+            finally:
+                NODES_IN_FLIGHT.dec()
+                if not inflight.done():
+                    inflight.cancel()
+                if self._inflight_nodes.get(cache_key) is inflight:
+                    del self._inflight_nodes[cache_key]
+
+        for alias_id, canonical_id in plan.get("aliases", {}).items():
+            if canonical_id in node_execution_outputs:
+                node_execution_outputs[alias_id] = node_execution_outputs[canonical_id]
+
+        span = current_span()
+        if span is not None:
+            span.set_attribute("workflow.cached_node_count", cached_node_count)
+        return node_execution_outputs
+
+    def _collect_final_results(
+        self,
+        plan: Dict[str, Any],
+        node_execution_outputs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        node_map = plan["node_map"]
         final_results: Dict[str, Any] = {}
         for node_id_loop, exec_outputs_loop in node_execution_outputs.items():
             if node_map[node_id_loop]["type"] == "output":
@@ -306,3 +473,200 @@ class WorkflowEngine:
                         "source_path": exec_outputs_loop.get("final_image_path")
                     }
         return final_results
+
+    async def execute_workflow(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        api_keys: Dict[str, str],
+        target_node_ids: Optional[List[str]] = None,
+        execution_id: Optional[str] = None,
+        use_cache: bool = False,
+        mode: str = "final",
+        changed_node_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}'. Expected one of {list(EXECUTION_MODES)}.")
+        execution_id = execution_id or new_trace_id()
+
+        plan = self._compile_workflow(nodes, edges, target_node_ids)
+        node_execution_outputs = await self._run_plan(
+            plan, api_keys, execution_id, use_cache=use_cache, mode=mode, changed_node_ids=changed_node_ids
+        )
+
+        if mode == "draft":
+            self._draft_runs[execution_id] = {"nodes": nodes, "edges": edges, "target_node_ids": target_node_ids}
+            while len(self._draft_runs) > DRAFT_RUN_HISTORY_SIZE:
+                self._draft_runs.popitem(last=False)
+
+        return self._collect_final_results(plan, node_execution_outputs)
+
+    def _estimate_provider_call(self, provider_name: str, model: Optional[str]) -> Dict[str, Any]:
+        provider_class = self.provider_registry.get(provider_name)
+        model = model or provider_class.default_model
+        estimate = {
+            "provider": provider_class.provider_name,
+            "model": model,
+            "cost_usd": provider_class.estimated_cost(model),
+            "latency_ms": None,
+            "latency_ms_p95": None,
+            "samples": 0,
+            "source": "declared"
+        }
+        observed = self.provider_telemetry.estimate(provider_name, model)
+        if observed is not None:
+            estimate["cost_usd"] = observed["cost_usd"]
+            estimate["source"] = "observed"
+        else:
+            observed = self.provider_telemetry.estimate(provider_name)
+            if observed is not None:
+                estimate["source"] = "provider_aggregate"
+        if observed is not None:
+            estimate["latency_ms"] = observed["latency_ms_p50"]
+            estimate["latency_ms_p95"] = observed["latency_ms_p95"]
+            estimate["samples"] = observed["samples"]
+        return estimate
+
+    def estimate_workflow(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        target_node_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        plan = self._compile_workflow(nodes, edges, target_node_ids)
+        node_estimates: Dict[str, Dict[str, Any]] = {}
+        finish_ms: Dict[str, float] = {}
+
+        for node_id in plan["order"]:
+            node = plan["node_map"][node_id]
+            node_type = self.node_registry.get(node["type"])
+            estimate: Dict[str, Any] = {"type": node["type"], "cost_class": node_type.cost_class, "cost_usd": 0.0, "latency_ms": None}
+            provider_name = (node.get("data") or {}).get("provider")
+            if node_type.cost_class == "provider" and provider_name:
+                estimate.update(self._estimate_provider_call(provider_name, node["data"].get("model")))
+
+            start_ms = max((finish_ms[source_id] for source_id, _, _ in plan["incoming"][node_id]), default=0.0)
+            finish_ms[node_id] = start_ms + (estimate["latency_ms"] or 0.0)
+            node_estimates[node_id] = estimate
+
+        return {
+            "total_cost_usd": sum(estimate["cost_usd"] for estimate in node_estimates.values()),
+            "critical_path_ms": max(finish_ms.values(), default=0.0),
+            "provider_calls": sum(1 for estimate in node_estimates.values() if estimate["cost_class"] == "provider"),
+            "nodes": node_estimates
+        }
+
+    async def promote_draft(
+        self,
+        draft_execution_id: str,
+        api_keys: Dict[str, str],
+        execution_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        draft_run = self._draft_runs.get(draft_execution_id)
+        if draft_run is None:
+            raise KeyError(f"Draft execution '{draft_execution_id}' not found or expired.")
+
+        return await self.execute_workflow(
+            nodes=draft_run["nodes"],
+            edges=draft_run["edges"],
+            api_keys=api_keys,
+            target_node_ids=draft_run["target_node_ids"],
+            execution_id=execution_id,
+            use_cache=True,
+            mode="final"
+        )
+
+    def _apply_row_overrides(self, plan: Dict[str, Any], overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        if not overrides:
+            return plan
+
+        node_map = dict(plan["node_map"])
+        for node_id, properties in overrides.items():
+            if node_id not in node_map:
+                raise ValueError(f"Override references unknown node '{node_id}'.")
+            node = node_map[node_id]
+            node_map[node_id] = {**node, "data": {**(node.get("data") or {}), **properties}}
+        return {**plan, "node_map": node_map}
+
+    async def execute_batch(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        api_keys: Dict[str, str],
+        rows: List[Dict[str, Dict[str, Any]]],
+        target_node_ids: Optional[List[str]] = None,
+        mode: str = "final",
+        max_concurrency: int = BATCH_MAX_CONCURRENCY
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}'. Expected one of {list(EXECUTION_MODES)}.")
+
+        overridden_node_ids = {node_id for overrides in rows for node_id in overrides}
+        plan = self._compile_workflow(nodes, edges, target_node_ids, volatile_node_ids=overridden_node_ids)
+        row_slots = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_row(row_index: int, overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+            async with row_slots:
+                execution_id = new_trace_id()
+                try:
+                    row_plan = self._apply_row_overrides(plan, overrides)
+                    node_execution_outputs = await self._run_plan(row_plan, api_keys, execution_id, use_cache=True, mode=mode)
+                    return {
+                        "row": row_index,
+                        "success": True,
+                        "execution_id": execution_id,
+                        "result": self._collect_final_results(row_plan, node_execution_outputs)
+                    }
+                except Exception as e:
+                    return {"row": row_index, "success": False, "execution_id": execution_id, "error": str(e)}
+
+        row_tasks = [asyncio.create_task(run_row(row_index, overrides)) for row_index, overrides in enumerate(rows)]
+        try:
+            for finished_row in asyncio.as_completed(row_tasks):
+                yield await finished_row
+        finally:
+            for row_task in row_tasks:
+                row_task.cancel()
+
+    async def preview_node(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        api_keys: Dict[str, str],
+        node_id: str,
+        max_size: int = 512,
+        execution_id: Optional[str] = None,
+        mode: str = "final"
+    ) -> Dict[str, Any]:
+        execution_id = execution_id or new_trace_id()
+        with get_tracer().span("workflow.preview", {"execution.id": execution_id, "node.id": node_id}, trace_id=trace_id_for(execution_id)):
+            plan = self._compile_workflow(nodes, edges, [node_id])
+            target_node = plan["node_map"][node_id]
+
+            if target_node["type"] == "output":
+                node_execution_outputs = await self._run_plan(
+                    plan, api_keys, execution_id, use_cache=True, skip_node_ids=[node_id], mode=mode
+                )
+                target_outputs = self._collect_node_inputs(target_node, plan["incoming"][node_id], node_execution_outputs)
+            else:
+                node_execution_outputs = await self._run_plan(plan, api_keys, execution_id, use_cache=True, mode=mode)
+                target_outputs = node_execution_outputs.get(node_id, {})
+
+            source_image_path = target_outputs.get("image")
+            if not source_image_path or not os.path.exists(source_image_path):
+                raise ValueError(f"Node {node_id} ({target_node['type']}) did not produce an image to preview.")
+
+            preview_path, preview_width, preview_height = await self.image_processor.create_preview(
+                source_image_path, max_size, execution_id, node_id
+            )
+            base_api_url_for_uploads = "http://localhost:8000/uploads"
+            return {
+                "node_id": node_id,
+                "preview_url": versioned_url(
+                    self.file_handler.get_url_for_file(preview_path, api_base_url=base_api_url_for_uploads), preview_path
+                ),
+                "preview_path": preview_path,
+                "source_path": source_image_path,
+                "width": preview_width,
+                "height": preview_height
+            }
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from sqlalchemy import select, delete, func, and_, or_
+from sqlalchemy.engine import Engine
+
+from ..db.database import create_db_engine, create_session_factory, run_migrations
+from ..db.models import WorkflowRecord, WorkflowVersionRecord
+from ..utils.workflow_diff import diff_workflows, apply_workflow_delta, changed_node_ids
+from ..utils.workflow_codec import encode_document, decode_document, STORAGE_FORMATS
+from .asset_index import encode_cursor, decode_cursor
+
+LEGACY_WORKFLOW_DIR = "saved_workflows"
+SNAPSHOT_INTERVAL = 20
+EMPTY_WORKFLOW: Dict[str, Any] = {"nodes": [], "edges": []}
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _summary(record: WorkflowRecord) -> Dict[str, Any]:
+    return {
+        "id": record.id,
+        "name": record.name,
+        "owner": record.owner,
+        "description": record.description,
+        "node_count": record.node_count,
+        "edge_count": record.edge_count,
+        "version": record.current_version,
+        "created_at": record.created_at.isoformat(),
+        "updated_at": record.updated_at.isoformat(),
+    }
+
+class WorkflowRepository:
+    def __init__(self, engine: Engine, storage_format: str = "compact"):
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown workflow storage format '{storage_format}'. Expected one of {list(STORAGE_FORMATS)}.")
+        self.engine = engine
+        self.storage_format = storage_format
+        self.Session = create_session_factory(engine)
+
+    def _encode(self, document: Dict[str, Any]) -> bytes:
+        return encode_document(document, self.storage_format)
+
+    def save(self, workflow_id: str, definition: Dict[str, Any], owner: Optional[str] = None) -> Dict[str, Any]:
+        now = _utcnow()
+        definition = json.loads(_dumps(definition))
+        with self.Session.begin() as session:
+            record = session.get(WorkflowRecord, workflow_id)
+            if record is None:
+                record = WorkflowRecord(id=workflow_id, created_at=now, updated_at=now, current_version=0)
+                session.add(record)
+                previous = EMPTY_WORKFLOW
+            else:
+                previous = decode_document(record.definition)
+
+            delta = diff_workflows(previous, definition)
+            if record.current_version == 0 or delta:
+                version = record.current_version + 1
+                is_snapshot = (version - 1) % SNAPSHOT_INTERVAL == 0
+                session.add(WorkflowVersionRecord(
+                    workflow_id=workflow_id,
+                    version=version,
+                    is_snapshot=is_snapshot,
+                    payload=self._encode(definition if is_snapshot else delta),
+                    changed_nodes=_dumps(changed_node_ids(previous, definition, delta)),
+                    created_at=now
+                ))
+                record.current_version = version
+                record.name = definition.get("name") or workflow_id
+                record.description = definition.get("description")
+                record.node_count = len(definition.get("nodes") or [])
+                record.edge_count = len(definition.get("edges") or [])
+                record.definition = self._encode(definition)
+                record.updated_at = now
+            if owner is not None and owner != record.owner:
+                record.owner = owner
+                record.updated_at = now
+            session.flush()
+            return _summary(record)
+
+    def checkout(self, workflow_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        with self.Session() as session:
+            record = session.get(WorkflowRecord, workflow_id)
+            if record is None or (version is not None and not 1 <= version <= record.current_version):
+                return None
+            if version is None or version == record.current_version:
+                return decode_document(record.definition)
+
+            snapshot_version = session.scalar(
+                select(func.max(WorkflowVersionRecord.version)).where(
+                    WorkflowVersionRecord.workflow_id == workflow_id,
+                    WorkflowVersionRecord.is_snapshot.is_(True),
+                    WorkflowVersionRecord.version <= version
+                )
+            )
+            payloads = session.scalars(
+                select(WorkflowVersionRecord.payload).where(
+                    WorkflowVersionRecord.workflow_id == workflow_id,
+                    WorkflowVersionRecord.version >= snapshot_version,
+                    WorkflowVersionRecord.version <= version
+                ).order_by(WorkflowVersionRecord.version)
+            ).all()
+
+        definition = decode_document(payloads[0])
+        for payload in payloads[1:]:
+            definition = apply_workflow_delta(definition, decode_document(payload))
+        return definition
+
+    def versions(self, workflow_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self.Session() as session:
+            if session.get(WorkflowRecord, workflow_id) is None:
+                return None
+            rows = session.execute(
+                select(
+                    WorkflowVersionRecord.version,
+                    WorkflowVersionRecord.is_snapshot,
+                    WorkflowVersionRecord.changed_nodes,
+                    WorkflowVersionRecord.created_at,
+                    func.length(WorkflowVersionRecord.payload)
+                ).where(WorkflowVersionRecord.workflow_id == workflow_id).order_by(WorkflowVersionRecord.version.desc())
+            ).all()
+        return [
+            {
+                "version": version,
+                "snapshot": is_snapshot,
+                "changed_node_ids": json.loads(changed_nodes),
+                "created_at": created_at.isoformat(),
+                "stored_bytes": stored_bytes,
+            }
+            for version, is_snapshot, changed_nodes, created_at, stored_bytes in rows
+        ]
+
+    def diff(self, workflow_id: str, from_version: int, to_version: Optional[int] = None) -> Dict[str, Any]:
+        old = self.checkout(workflow_id, from_version)
+        new = self.checkout(workflow_id, to_version)
+        if old is None or new is None:
+            raise KeyError(f"Workflow '{workflow_id}' has no version {from_version if old is None else to_version}.")
+        delta = diff_workflows(old, new)
+        return {
+            "workflow_id": workflow_id,
+            "from_version": from_version,
+            "to_version": to_version or self.get_summary(workflow_id)["version"],
+            "delta": delta,
+            "changed_node_ids": changed_node_ids(old, new, delta),
+        }
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        with self.Session() as session:
+            definition = session.scalar(select(WorkflowRecord.definition).where(WorkflowRecord.id == workflow_id))
+        return decode_document(definition) if definition is not None else None
+
+    def current_version(self, workflow_id: str) -> Optional[int]:
+        with self.Session() as session:
+            return session.scalar(select(WorkflowRecord.current_version).where(WorkflowRecord.id == workflow_id))
+
+    def get_summary(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        with self.Session() as session:
+            record = session.get(WorkflowRecord, workflow_id)
+            return _summary(record) if record is not None else None
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        owner: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        columns = [getattr(WorkflowRecord, column.name) for column in WorkflowRecord.__table__.columns if column.name != "definition"]
+        statement = select(*columns)
+        if owner is not None:
+            statement = statement.where(WorkflowRecord.owner == owner)
+        if name_prefix:
+            statement = statement.where(WorkflowRecord.name.startswith(name_prefix, autoescape=True))
+        if cursor:
+            cursor_updated_at, cursor_id = decode_cursor(cursor)
+            cursor_time = datetime.fromisoformat(cursor_updated_at)
+            statement = statement.where(or_(
+                WorkflowRecord.updated_at < cursor_time,
+                and_(WorkflowRecord.updated_at == cursor_time, WorkflowRecord.id < cursor_id)
+            ))
+        statement = statement.order_by(WorkflowRecord.updated_at.desc(), WorkflowRecord.id.desc()).limit(limit + 1)
+
+        with self.Session() as session:
+            rows = session.execute(statement).all()
+
+        workflows = [_summary(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(workflows[-1]["updated_at"], workflows[-1]["id"])
+        return workflows, next_cursor
+
+    def count(self, owner: Optional[str] = None) -> int:
+        statement = select(func.count()).select_from(WorkflowRecord)
+        if owner is not None:
+            statement = statement.where(WorkflowRecord.owner == owner)
+        with self.Session() as session:
+            return session.scalar(statement)
+
+    def delete(self, workflow_id: str) -> bool:
+        with self.Session.begin() as session:
+            result = session.execute(delete(WorkflowRecord).where(WorkflowRecord.id == workflow_id))
+            return result.rowcount > 0
+
+    def iter_definitions(self) -> Iterator[Dict[str, Any]]:
+        with self.Session() as session:
+            for definition in session.scalars(select(WorkflowRecord.definition).execution_options(yield_per=200)):
+                yield decode_document(definition)
+
+    def import_legacy_directory(self, directory: str = LEGACY_WORKFLOW_DIR) -> int:
+        if not os.path.isdir(directory):
+            return 0
+        imported = 0
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            workflow_id = filename[:-len(".json")]
+            if self.get_summary(workflow_id) is not None:
+                continue
+            try:
+                with open(os.path.join(directory, filename), "r") as f:
+                    self.save(workflow_id, json.load(f))
+                imported += 1
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Skipping legacy workflow {filename}: {e}")
+        return imported
+
+_default_repository: Optional[WorkflowRepository] = None
+_default_repository_lock = threading.Lock()
+
+def get_workflow_repository() -> WorkflowRepository:
+    global _default_repository
+    if _default_repository is None:
+        with _default_repository_lock:
+            if _default_repository is None:
+                engine = create_db_engine()
+                run_migrations(engine)
+                repository = WorkflowRepository(engine, os.getenv("WORKFLOW_STORAGE_FORMAT", "compact"))
+                imported = repository.import_legacy_directory()
+                if imported:
+                    print(f"Imported {imported} workflow(s) from {LEGACY_WORKFLOW_DIR}/.")
+                _default_repository = repository
+    return _default_repository
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+ROW_ID_COLUMN = "row_id"
+
+def normalize_row_overrides(row: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
+    row_id = row.get(ROW_ID_COLUMN)
+    overrides: Dict[str, Dict[str, Any]] = {}
+
+    for key, value in row.items():
+        if key == ROW_ID_COLUMN or value is None or value == "":
+            continue
+
+        if isinstance(value, dict):
+            overrides.setdefault(key, {}).update(value)
+        elif "." in key:
+            node_id, property_name = key.split(".", 1)
+            overrides.setdefault(node_id, {})[property_name] = value
+        else:
+            raise ValueError(f"Column '{key}' must be of the form 'node_id.property' or map a node id to its properties.")
+
+    return (str(row_id) if row_id is not None else None), overrides
+
+def parse_parameter_table(content: bytes, filename: Optional[str] = None, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    text = content.decode("utf-8-sig")
+    name = (filename or "").lower()
+    media_type = (content_type or "").lower()
+
+    if name.endswith(".csv") or "csv" in media_type:
+        raw_rows: List[Dict[str, Any]] = list(csv.DictReader(io.StringIO(text)))
+    elif name.endswith((".jsonl", ".ndjson")) or "ndjson" in media_type or "jsonl" in media_type:
+        raw_rows = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                raw_rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+    else:
+        raise ValueError("Parameter table must be a .csv or .jsonl file.")
+
+    rows = []
+    for row_index, raw_row in enumerate(raw_rows):
+        if not isinstance(raw_row, dict):
+            raise ValueError(f"Row {row_index} is not an object.")
+        row_id, overrides = normalize_row_overrides(raw_row)
+        rows.append({"row_id": row_id or str(row_index), "overrides": overrides})
+    return rows
@@ -0,0 +1,49 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_MEMO_SIZE = 4096
+URL_VERSION_LENGTH = 16
+
+_hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+def file_content_hash(path: str, stat_result: Optional[os.stat_result] = None) -> str:
+    stat_result = stat_result or os.stat(path)
+    memo_key = (os.path.abspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _hash_memo_lock:
+        cached_hash = _hash_memo.get(memo_key)
+        if cached_hash is not None:
+            _hash_memo.move_to_end(memo_key)
+            return cached_hash
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = content_hash
+        while len(_hash_memo) > HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return content_hash
+
+def remember_content_hash(path: str, content_hash: str, stat_result: Optional[os.stat_result] = None):
+    stat_result = stat_result or os.stat(path)
+    memo_key = (os.path.abspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = content_hash
+        _hash_memo.move_to_end(memo_key)
+        while len(_hash_memo) > HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+
+def url_version(path: str) -> str:
+    return file_content_hash(path)[:URL_VERSION_LENGTH]
+
+def versioned_url(url: str, path: str) -> str:
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}v={url_version(path)}"
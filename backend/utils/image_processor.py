@@ -1,14 +1,50 @@
 import os
+import time
 import uuid
-from typing import Optional, Tuple
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, UnidentifiedImageError
+from typing import Optional, Tuple, Dict, Any
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont, ImageOps, UnidentifiedImageError
 import numpy as np
 
+from .metrics import get_metrics_registry, FAST_BUCKETS
+from .tracing import get_tracer, traced
+
+_metrics = get_metrics_registry()
+IMAGE_DECODE_SECONDS = _metrics.histogram(
+    "marketcanvas_image_decode_seconds", "Time to decode source images.", ("format", "operation"), buckets=FAST_BUCKETS
+)
+IMAGE_ENCODE_SECONDS = _metrics.histogram(
+    "marketcanvas_image_encode_seconds", "Time to encode and write processed images.", ("format",), buckets=FAST_BUCKETS
+)
+
 class ImageProcessor:
-    def __init__(self, file_handler):
+    def __init__(self, file_handler, asset_index=None, artifact_store=None):
         self.file_handler = file_handler
+        self.asset_index = asset_index
+        self.artifact_store = artifact_store
+
+    def _open_image(self, image_path: str) -> Image.Image:
+        try:
+            return Image.open(image_path)
+        except UnidentifiedImageError:
+            raise ValueError(f"Cannot identify image file: {image_path}")
+
+    def _decode(self, img: Image.Image, operation: str) -> Image.Image:
+        started = time.perf_counter()
+        with get_tracer().span("image.decode", {"image.format": img.format, "image.width": img.width, "image.height": img.height}):
+            img.load()
+        IMAGE_DECODE_SECONDS.labels(img.format or "unknown", operation).observe(time.perf_counter() - started)
+        return img
 
-    async def _save_processed_image(self, image: Image.Image, original_path: str, operation_name: str, execution_id: str, node_id: str, target_format: str = "PNG") -> str:
+    def _load_image(self, image_path: str, operation: str) -> Image.Image:
+        return self._decode(self._open_image(image_path), operation)
+
+    def _encode(self, img: Image.Image, output_path: str, pil_format: str, save_kwargs: Dict[str, Any]):
+        started = time.perf_counter()
+        with get_tracer().span("image.encode", {"image.format": pil_format, "image.width": img.width, "image.height": img.height}):
+            img.save(output_path, format=pil_format, **save_kwargs)
+        IMAGE_ENCODE_SECONDS.labels(pil_format).observe(time.perf_counter() - started)
+
+    async def _save_processed_image(self, image: Image.Image, original_path: str, operation_name: str, execution_id: str, node_id: str, target_format: str = "PNG", save_kwargs: Optional[Dict[str, Any]] = None) -> str:
         try:
             relative_original_path = os.path.relpath(original_path, start=self.file_handler.base_upload_dir)
             original_subdir = os.path.dirname(relative_original_path)
@@ -30,14 +66,16 @@ class ImageProcessor:
             elif image.mode != 'P':
                  image = image.convert('RGB')
 
-        image.save(output_path, format=pil_format)
+        self._encode(image, output_path, pil_format, save_kwargs or {})
+        with get_tracer().span("artifact.register"):
+            content_hash = self.artifact_store.ingest(output_path) if self.artifact_store is not None else None
+            if self.asset_index is not None:
+                self.asset_index.add(output_path, kind="artifact", execution_id=execution_id, content_hash=content_hash)
         return output_path
 
+    @traced("image.style_transfer")
     async def apply_style_transfer(self, image_path: str, style: str, intensity: float, execution_id: str, node_id: str) -> str:
-        try:
-            img = Image.open(image_path).convert("RGB")
-        except UnidentifiedImageError:
-            raise ValueError(f"Cannot identify image file: {image_path}")
+        img = self._load_image(image_path, "style_transfer").convert("RGB")
 
         if style == "vintage":
             r, g, b = img.split()
@@ -59,15 +97,13 @@ class ImageProcessor:
 
         return await self._save_processed_image(img, image_path, f"styled_{style}", execution_id, node_id)
 
+    @traced("image.text_overlay")
     async def apply_text_overlay(
         self, image_path: str, text_content: str, position: str,
         font_size: int, font_color: str, background_color: str,
         execution_id: str, node_id: str
     ) -> str:
-        try:
-            img = Image.open(image_path).convert("RGBA")
-        except UnidentifiedImageError:
-            raise ValueError(f"Cannot identify image file: {image_path}")
+        img = self._load_image(image_path, "text_overlay").convert("RGBA")
 
         draw = ImageDraw.Draw(img)
 
@@ -113,23 +149,18 @@ class ImageProcessor:
 
         return await self._save_processed_image(img, image_path, "text_overlay", execution_id, node_id, target_format="PNG")
 
-    async def crop_resize_image(
-        self, image_path: str, width: Optional[int],
+    def resize_with_crop(
+        self, img: Image.Image, width: Optional[int],
         height: Optional[int], crop_type: str,
-        execution_id: str, node_id: str
-    ) -> str:
-        try:
-            img = Image.open(image_path)
-        except UnidentifiedImageError:
-            raise ValueError(f"Cannot identify image file: {image_path}")
-
+        resample: Image.Resampling = Image.Resampling.LANCZOS
+    ) -> Image.Image:
         original_width, original_height = img.size
 
         target_width = width if width and width > 0 else original_width
         target_height = height if height and height > 0 else original_height
 
         if crop_type == "resize_only" or not width or not height:
-            img_processed = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+            img_processed = img.resize((target_width, target_height), resample)
         elif crop_type == "center_crop":
             img_aspect = original_width / original_height
             target_aspect = target_width / target_height
@@ -141,7 +172,7 @@ class ImageProcessor:
                 new_width = target_width
                 new_height = int(new_width / img_aspect)
 
-            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img_resized = img.resize((new_width, new_height), resample)
 
             left = (new_width - target_width) / 2
             top = (new_height - target_height) / 2
@@ -158,25 +189,147 @@ class ImageProcessor:
             else:
                 new_width = target_width
                 new_height = int(new_width / img_aspect)
-            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img_resized = img.resize((new_width, new_height), resample)
             left = (new_width - target_width) / 2
             top = (new_height - target_height) / 2
             right = (new_width + target_width) / 2
             bottom = (new_height + target_height) / 2
             img_processed = img_resized.crop((left, top, right, bottom))
         else:
-            img_processed = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+            img_processed = img.resize((target_width, target_height), resample)
 
+        return img_processed
+
+    @traced("image.crop_resize")
+    async def crop_resize_image(
+        self, image_path: str, width: Optional[int],
+        height: Optional[int], crop_type: str,
+        execution_id: str, node_id: str,
+        resample: Image.Resampling = Image.Resampling.LANCZOS
+    ) -> str:
+        img = self._load_image(image_path, "crop_resize")
+
+        img_processed = self.resize_with_crop(img, width, height, crop_type, resample)
         return await self._save_processed_image(img_processed, image_path, "crop_resize", execution_id, node_id)
 
+    @traced("image.upscale")
+    async def upscale_image(
+        self, image_path: str, scale: float,
+        execution_id: str, node_id: str,
+        resample: Image.Resampling = Image.Resampling.LANCZOS
+    ) -> str:
+        img = self._load_image(image_path, "upscale")
+
+        if scale <= 0:
+            raise ValueError(f"Upscale factor must be positive, got {scale}")
+        target_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img_processed = img.resize(target_size, resample)
+        return await self._save_processed_image(img_processed, image_path, f"upscale_{scale:g}x", execution_id, node_id)
+
+    @traced("image.background_remove")
+    async def remove_background(
+        self, image_path: str, tolerance: int, feather: float,
+        execution_id: str, node_id: str
+    ) -> str:
+        img = self._load_image(image_path, "background_remove").convert("RGBA")
+
+        pixels = np.asarray(img, dtype=np.int16)
+        rgb = pixels[..., :3]
+        border = np.concatenate([rgb[0], rgb[-1], rgb[:, 0], rgb[:, -1]])
+        background = np.median(border, axis=0)
+        distance = np.abs(rgb - background).max(axis=-1)
+        mask = Image.fromarray(np.where(distance <= tolerance, 0, 255).astype(np.uint8), mode="L")
+        if feather > 0:
+            mask = mask.filter(ImageFilter.GaussianBlur(radius=feather))
+
+        alpha = np.minimum(pixels[..., 3], np.asarray(mask, dtype=np.int16)).astype(np.uint8)
+        img.putalpha(Image.fromarray(alpha, mode="L"))
+        return await self._save_processed_image(img, image_path, "background_remove", execution_id, node_id, target_format="PNG")
+
+    @traced("image.filter")
+    async def apply_filter(
+        self, image_path: str, filter_name: str, amount: float,
+        execution_id: str, node_id: str
+    ) -> str:
+        img = self._load_image(image_path, "filter")
+
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        alpha = img.getchannel("A") if img.mode == "RGBA" else None
+        rgb = img.convert("RGB")
+
+        if filter_name == "blur":
+            rgb = rgb.filter(ImageFilter.GaussianBlur(radius=amount * 5))
+        elif filter_name == "sharpen":
+            rgb = rgb.filter(ImageFilter.UnsharpMask(radius=2, percent=int(50 + amount * 200), threshold=3))
+        elif filter_name == "grayscale":
+            rgb = Image.blend(rgb, ImageOps.grayscale(rgb).convert("RGB"), amount)
+        elif filter_name == "sepia":
+            rgb = Image.blend(rgb, ImageOps.colorize(ImageOps.grayscale(rgb), "#2e1f0f", "#f2e3c6"), amount)
+        elif filter_name == "brightness":
+            rgb = ImageEnhance.Brightness(rgb).enhance(amount * 2)
+        elif filter_name == "contrast":
+            rgb = ImageEnhance.Contrast(rgb).enhance(amount * 2)
+        elif filter_name == "saturation":
+            rgb = ImageEnhance.Color(rgb).enhance(amount * 2)
+        else:
+            raise ValueError(f"Unsupported filter: {filter_name}")
+
+        if alpha is not None:
+            rgb.putalpha(alpha)
+        return await self._save_processed_image(rgb, image_path, f"filter_{filter_name}", execution_id, node_id)
+
+    @traced("image.render_variant")
+    def render_variant(
+        self, image_path: str, output_path: str,
+        width: Optional[int], height: Optional[int],
+        target_format_str: str, quality: int,
+        crop_type: str = "center_crop"
+    ) -> Tuple[int, int]:
+        img = self._open_image(image_path)
+
+        original_width, original_height = img.size
+        if width and not height:
+            height = max(1, round(original_height * width / original_width))
+        elif height and not width:
+            width = max(1, round(original_width * height / original_height))
+        width, height = width or original_width, height or original_height
+        no_upscale = min(1.0, original_width / width, original_height / height)
+        width, height = max(1, int(width * no_upscale)), max(1, int(height * no_upscale))
+
+        if img.format == "JPEG":
+            img.draft("RGB", (width, height))
+        self._decode(img, "render_variant")
+
+        pil_format = target_format_str.upper()
+        if pil_format == "JPG": pil_format = "JPEG"
+        if pil_format == "JPEG" and img.mode != "RGB":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA")
+
+        reduce_factor = int(min(img.width / width, img.height / height) // 2)
+        if reduce_factor >= 2:
+            img = img.reduce(reduce_factor)
+
+        img_processed = self.resize_with_crop(img, width, height, crop_type, Image.Resampling.LANCZOS)
+
+        save_kwargs: Dict[str, Any] = {}
+        if pil_format in ("JPEG", "WEBP", "AVIF"):
+            save_kwargs["quality"] = quality
+        if pil_format == "JPEG":
+            save_kwargs["progressive"] = True
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._encode(img_processed, output_path, pil_format, save_kwargs)
+        return img_processed.size
+
+    @traced("image.convert")
     async def convert_image_format(
         self, image_path: str, target_format_str: str, quality: int,
         execution_id: str, node_id: str
     ) -> str:
-        try:
-            img = Image.open(image_path)
-        except UnidentifiedImageError:
-            raise ValueError(f"Cannot identify image file: {image_path}")
+        img = self._load_image(image_path, "convert")
 
         pil_format = target_format_str.upper()
         if pil_format == "JPG": pil_format = "JPEG"
@@ -196,4 +349,25 @@ class ImageProcessor:
             if img.mode == 'RGBA' or img.mode == 'LA':
                 save_kwargs['lossless'] = False
 
-        return await self._save_processed_image(img, image_path, f"converted_{target_format_str.lower()}", execution_id, node_id, target_format=target_format_str)
+        return await self._save_processed_image(img, image_path, f"converted_{target_format_str.lower()}", execution_id, node_id, target_format=target_format_str, save_kwargs=save_kwargs)
+
+    @traced("image.preview")
+    async def create_preview(
+        self, image_path: str, max_size: int,
+        execution_id: str, node_id: str
+    ) -> Tuple[str, int, int]:
+        img = self._open_image(image_path)
+
+        if img.format == "JPEG":
+            img.draft("RGB", (max_size, max_size))
+        self._decode(img, "preview")
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+
+        img.thumbnail((max_size, max_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+        preview_path = await self._save_processed_image(
+            img, image_path, "preview", execution_id, node_id,
+            target_format="WEBP", save_kwargs={"quality": 80, "method": 0}
+        )
+        return preview_path, img.width, img.height
@@ -0,0 +1,300 @@
+import asyncio
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+DEFAULT_SERVICE_NAME = "marketcanvas-backend"
+RECENT_TRACE_LIMIT = 200
+MAX_SPANS_PER_TRACE = 2048
+TRACING_EXPORTERS = ("off", "memory", "file", "otlp")
+
+_TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+def trace_id_for(execution_id: str) -> str:
+    candidate = execution_id.replace("-", "").lower()
+    if _TRACE_ID_PATTERN.match(candidate) and candidate != "0" * 32:
+        return candidate
+    return hashlib.sha256(execution_id.encode("utf-8")).hexdigest()[:32]
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Optional[Dict[str, Any]] = None, kind: int = SPAN_KIND_INTERNAL):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status_code = STATUS_UNSET
+        self.status_message: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def record_exception(self, error: BaseException):
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error) or type(error).__name__
+        self.attributes["exception.type"] = type(error).__name__
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": {STATUS_UNSET: "unset", STATUS_OK: "ok", STATUS_ERROR: "error"}[self.status_code],
+            "status_message": self.status_message,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class SpanExporter(ABC):
+    synchronous = False
+
+    @abstractmethod
+    def export(self, resource_spans: Dict[str, Any]):
+        pass
+
+    def shutdown(self):
+        pass
+
+class FileSpanExporter(SpanExporter):
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, resource_spans: Dict[str, Any]):
+        line = json.dumps(resource_spans, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+class OTLPHttpSpanExporter(SpanExporter):
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._client = httpx.Client(headers=headers, timeout=timeout)
+
+    def export(self, resource_spans: Dict[str, Any]):
+        response = self._client.post(self.url, json=resource_spans)
+        response.raise_for_status()
+
+    def shutdown(self):
+        self._client.close()
+
+class Tracer:
+    def __init__(self, exporter: Optional[SpanExporter] = None, service_name: str = DEFAULT_SERVICE_NAME, enabled: bool = True, recent_limit: int = RECENT_TRACE_LIMIT):
+        self.exporter = exporter
+        self.service_name = service_name
+        self.enabled = enabled
+        self.recent_limit = recent_limit
+        self._lock = threading.Lock()
+        self._open_traces: Dict[str, List[Span]] = {}
+        self._recent: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._export_executor: Optional[ThreadPoolExecutor] = None
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None, trace_id: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL) -> Iterator[Any]:
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        if trace_id is not None and parent is not None and parent.trace_id != trace_id:
+            parent = None
+        span = Span(
+            name,
+            parent.trace_id if parent is not None else (trace_id or new_trace_id()),
+            parent.span_id if parent is not None else None,
+            attributes,
+            kind
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+            if span.status_code == STATUS_UNSET:
+                span.status_code = STATUS_OK
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            spans = self._open_traces.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_span_id is not None and len(spans) < MAX_SPANS_PER_TRACE:
+                return
+            del self._open_traces[span.trace_id]
+            recent = self._recent.setdefault(span.trace_id, [])
+            recent.extend(spans)
+            self._recent.move_to_end(span.trace_id)
+            while len(self._recent) > self.recent_limit:
+                self._recent.popitem(last=False)
+        self._export(spans)
+
+    def _export(self, spans: List[Span]):
+        if self.exporter is None:
+            return
+        payload = self.to_otlp(spans)
+        if self.exporter.synchronous:
+            self._export_safely(payload)
+            return
+        with self._lock:
+            if self._export_executor is None:
+                self._export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+            executor = self._export_executor
+        executor.submit(self._export_safely, payload)
+
+    def _export_safely(self, payload: Dict[str, Any]):
+        try:
+            self.exporter.export(payload)
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+
+    def to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{"scope": {"name": "marketcanvas"}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }
+
+    def get_trace(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            spans = list(self._recent.get(trace_id_for(trace_id), []))
+        if not spans:
+            return None
+        return [span.to_dict() for span in sorted(spans, key=lambda span: span.start_ns)]
+
+    def flush(self, timeout: float = 5.0):
+        if self._export_executor is not None:
+            self._export_executor.submit(lambda: None).result(timeout=timeout)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._export_executor = self._export_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def traced(name: str) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def create_span_exporter(kind: str) -> Optional[SpanExporter]:
+    if kind == "file":
+        return FileSpanExporter(os.getenv("TRACING_FILE_PATH", "traces.jsonl"))
+    if kind == "otlp":
+        return OTLPHttpSpanExporter(os.getenv("OTLP_ENDPOINT", "http://localhost:4318"))
+    if kind in ("off", "memory"):
+        return None
+    raise ValueError(f"Unknown tracing exporter: {kind}. Expected one of {list(TRACING_EXPORTERS)}")
+
+_default_tracer: Optional[Tracer] = None
+
+def get_tracer() -> Tracer:
+    global _default_tracer
+    if _default_tracer is None:
+        exporter_kind = os.getenv("TRACING_EXPORTER", "memory").lower()
+        _default_tracer = Tracer(
+            create_span_exporter(exporter_kind),
+            service_name=os.getenv("TRACING_SERVICE_NAME", DEFAULT_SERVICE_NAME),
+            enabled=exporter_kind != "off"
+        )
+    return _default_tracer
@@ -0,0 +1,255 @@
+import hashlib
+import os
+import uuid
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import aiofiles
+
+try:
+    from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+except ImportError:
+    from multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SNIFF_BYTES = 512
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+MAX_FORM_FIELD_SIZE = 64 * 1024
+
+FORMAT_EXTENSIONS = {
+    "png": {".png"},
+    "jpeg": {".jpg", ".jpeg"},
+    "gif": {".gif"},
+    "webp": {".webp"},
+    "avif": {".avif"},
+    "svg": {".svg"},
+    "text": {".json", ".yaml"},
+}
+
+class UploadTooLargeError(ValueError):
+    pass
+
+class UnsupportedUploadError(ValueError):
+    pass
+
+class MalformedUploadError(ValueError):
+    pass
+
+def max_upload_size() -> int:
+    return int(os.getenv("MAX_FILE_SIZE", str(DEFAULT_MAX_FILE_SIZE)))
+
+def sniff_format(head: bytes) -> Optional[str]:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "avif"
+
+    text_head = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if text_head.startswith(b"<svg") or (text_head.startswith(b"<?xml") and b"<svg" in head):
+        return "svg"
+    try:
+        text_head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.reason != "unexpected end of data":
+            return None
+    return None if b"\x00" in text_head else "text"
+
+def validate_upload_head(head: bytes, filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    detected = sniff_format(head)
+    if detected is None:
+        raise UnsupportedUploadError(f"Unrecognized file content for '{filename}'.")
+    if ext not in FORMAT_EXTENSIONS[detected]:
+        raise UnsupportedUploadError(f"File content looks like {detected.upper()} but the filename is '{filename}'.")
+    return detected
+
+class StreamingUploadWriter:
+    def __init__(self, dest_path: str, filename: str, max_size: Optional[int] = None, append: bool = False):
+        self.dest_path = dest_path
+        self.filename = filename
+        self.max_size = max_size if max_size is not None else max_upload_size()
+        self.temp_path = f"{dest_path}.partial" if append else f"{dest_path}.{uuid.uuid4().hex[:8]}.tmp"
+        self.size = 0
+        self.detected_format: Optional[str] = None
+        self._head = b""
+        self._digest = hashlib.sha256()
+        self._file = None
+        self._resumed = False
+
+    async def _open(self):
+        os.makedirs(os.path.dirname(self.dest_path) or ".", exist_ok=True)
+        if not self._resumed and os.path.exists(self.temp_path):
+            async with aiofiles.open(self.temp_path, "rb") as existing:
+                while True:
+                    chunk = await existing.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self._track(chunk)
+        self._resumed = True
+        self._file = await aiofiles.open(self.temp_path, "ab")
+
+    def _track(self, chunk: bytes):
+        if self.detected_format is None and len(self._head) < SNIFF_BYTES:
+            self._head += chunk[:SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self.detected_format = validate_upload_head(self._head, self.filename)
+        self.size += len(chunk)
+        self._digest.update(chunk)
+
+    async def write(self, chunk: bytes):
+        if self._file is None:
+            await self._open()
+        if self.size + len(chunk) > self.max_size:
+            raise UploadTooLargeError(f"'{self.filename}' exceeds the maximum upload size of {self.max_size} bytes.")
+        self._track(chunk)
+        await self._file.write(chunk)
+
+    async def close(self):
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+
+    async def finalize(self) -> Tuple[str, int, str]:
+        if self._file is None:
+            await self._open()
+        await self.close()
+        if self.detected_format is None:
+            self.detected_format = validate_upload_head(self._head, self.filename)
+        os.makedirs(os.path.dirname(self.dest_path) or ".", exist_ok=True)
+        os.replace(self.temp_path, self.dest_path)
+        return self.dest_path, self.size, self._digest.hexdigest()
+
+    async def abort(self):
+        await self.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+async def iter_upload_file(upload_file, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await upload_file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+async def stream_upload_to_path(
+    chunks: AsyncIterator[bytes],
+    dest_path: str,
+    filename: str,
+    max_size: Optional[int] = None
+) -> Tuple[str, int, str]:
+    writer = StreamingUploadWriter(dest_path, filename, max_size)
+    try:
+        async for chunk in chunks:
+            await writer.write(chunk)
+        return await writer.finalize()
+    except BaseException:
+        await writer.abort()
+        raise
+
+class MultipartUpload:
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.path: Optional[str] = None
+        self.size = 0
+        self.content_hash: Optional[str] = None
+
+async def receive_multipart_upload(
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    destination: Callable[[str, Dict[str, str]], str],
+    file_field: str = "file",
+    max_size: Optional[int] = None
+) -> MultipartUpload:
+    media_type, params = parse_options_header(content_type or "")
+    boundary = params.get(b"boundary")
+    if media_type != b"multipart/form-data" or not boundary:
+        raise MalformedUploadError("Expected a multipart/form-data request body.")
+
+    upload = MultipartUpload()
+    events: List[Tuple[str, bytes]] = []
+    part: Dict[str, object] = {}
+
+    def on_part_begin():
+        part.clear()
+        part.update(headers={}, field=bytearray(), value=bytearray(), kind=None)
+
+    def on_header_field(data: bytes, start: int, end: int):
+        part["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][bytes(part["field"]).lower()] = bytes(part["value"])
+        part["field"], part["value"] = bytearray(), bytearray()
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        if part["name"] == file_field and b"filename" in options:
+            part["kind"] = "file"
+            events.append(("begin", options[b"filename"]))
+            upload.content_type = part["headers"].get(b"content-type", b"").decode("latin-1") or None
+        else:
+            part["kind"] = "field"
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if part["kind"] == "file":
+            events.append(("data", bytes(data[start:end])))
+        else:
+            part["value"] += data[start:end]
+            if len(part["value"]) > MAX_FORM_FIELD_SIZE:
+                raise MalformedUploadError(f"Form field '{part['name']}' is too large.")
+
+    def on_part_end():
+        if part["kind"] == "field":
+            upload.fields[part["name"]] = bytes(part["value"]).decode("utf-8", "replace")
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    writer: Optional[StreamingUploadWriter] = None
+    try:
+        async for chunk in chunks:
+            parser.write(chunk)
+            for event, payload in events:
+                if event == "begin":
+                    if writer is not None:
+                        raise MalformedUploadError(f"Only one '{file_field}' part is accepted.")
+                    upload.filename = os.path.basename(payload.decode("utf-8", "replace").replace("\\", "/"))
+                    if not upload.filename:
+                        raise MalformedUploadError("No filename provided.")
+                    writer = StreamingUploadWriter(destination(upload.filename, upload.fields), upload.filename, max_size)
+                else:
+                    await writer.write(payload)
+            events.clear()
+        parser.finalize()
+        if writer is None:
+            raise MalformedUploadError(f"No '{file_field}' part in the request body.")
+        writer.dest_path = destination(upload.filename, upload.fields)
+        upload.path, upload.size, upload.content_hash = await writer.finalize()
+        return upload
+    except BaseException as e:
+        if writer is not None:
+            await writer.abort()
+        if isinstance(e, MultipartParseError):
+            raise MalformedUploadError(f"Malformed multipart body: {e}") from e
+        raise
+
+def unique_upload_filename(filename: str) -> str:
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    safe_stem = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in stem) or "upload"
+    return f"{safe_stem}_{uuid.uuid4().hex[:8]}{ext.lower()}"
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Dict, Any, List, Optional, Union
+import msgpack
+import zstandard
+
+COMPACT_MEDIA_TYPE = "application/vnd.marketcanvas.workflow+msgpack"
+JSON_MEDIA_TYPE = "application/json"
+COMPACT_MAGIC = b"MCW\x01"
+COMPACT_COMPRESSION_LEVEL = 3
+STORAGE_FORMATS = ("compact", "json")
+DEFAULT_MAX_DECODED_SIZE = 32 * 1024 * 1024
+DECOMPRESS_CHUNK_SIZE = 256 * 1024
+
+NODE_COLUMNS = ("id", "type", "position", "data")
+EDGE_COLUMNS = ("id", "source", "target", "sourceHandle", "targetHandle", "type")
+INTERNED_NODE_COLUMNS = {"id", "type"}
+INTERNED_EDGE_COLUMNS = {"source", "target", "sourceHandle", "targetHandle", "type"}
+
+_compressor = zstandard.ZstdCompressor(level=COMPACT_COMPRESSION_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+def max_decoded_size() -> int:
+    return int(os.getenv("WORKFLOW_MAX_DECODED_SIZE", str(DEFAULT_MAX_DECODED_SIZE)))
+
+class _StringTable:
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings: List[str] = strings if strings is not None else []
+        self._index: Dict[str, int] = {value: i for i, value in enumerate(self.strings)}
+
+    def intern(self, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+def _is_point(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {"x", "y"}
+
+def _pack_rows(items: List[Dict[str, Any]], columns: tuple, interned: set, strings: _StringTable) -> List[List[Any]]:
+    rows = []
+    for item in items:
+        row = []
+        present = []
+        extras = {}
+        for column in columns:
+            value = item.get(column)
+            if column in interned and value is not None and not isinstance(value, str):
+                extras[column] = value
+                value = None
+            elif column == "position" and value is not None and not _is_point(value):
+                extras[column] = value
+                value = None
+            elif column in item:
+                present.append(column)
+            if column in interned:
+                value = strings.intern(value)
+            elif column == "position" and value is not None:
+                value = [value["x"], value["y"]]
+            row.append(value)
+        extras.update((key, value) for key, value in item.items() if key not in columns)
+        if extras or len(present) != len(columns):
+            row.append([extras, present])
+        rows.append(row)
+    return rows
+
+def _unpack_rows(rows: List[List[Any]], columns: tuple, interned: set, strings: _StringTable) -> List[Dict[str, Any]]:
+    table = strings.strings
+    width = len(columns)
+    kinds = [1 if column in interned else 2 if column == "position" else 0 for column in columns]
+    items = []
+    for row in rows:
+        item: Dict[str, Any] = {}
+        present = columns
+        if len(row) > width:
+            extras, present = row[width]
+        for column, kind, value in zip(columns, kinds, row):
+            if present is not columns and column not in present:
+                continue
+            if kind == 1 and value is not None:
+                value = table[value]
+            elif kind == 2 and isinstance(value, list):
+                value = {"x": value[0], "y": value[1]}
+            item[column] = value
+        if len(row) > width:
+            item.update(extras)
+        items.append(item)
+    return items
+
+def encode_compact(document: Dict[str, Any]) -> bytes:
+    strings = _StringTable()
+    body = dict(document)
+    tabular = []
+    for section_name, columns, interned in (("nodes", NODE_COLUMNS, INTERNED_NODE_COLUMNS), ("edges", EDGE_COLUMNS, INTERNED_EDGE_COLUMNS)):
+        if isinstance(body.get(section_name), list):
+            body[section_name] = _pack_rows(body[section_name], columns, interned, strings)
+            tabular.append(section_name)
+    packed = msgpack.packb({"s": strings.strings, "t": tabular, "d": body}, use_bin_type=True)
+    return COMPACT_MAGIC + _compressor.compress(packed)
+
+def _decompress(data: bytes, max_output_size: Optional[int]) -> bytes:
+    chunks = []
+    total = 0
+    with _decompressor.stream_reader(data) as reader:
+        while True:
+            chunk = reader.read(DECOMPRESS_CHUNK_SIZE)
+            if not chunk:
+                break
+            total += len(chunk)
+            if max_output_size is not None and total > max_output_size:
+                raise ValueError(f"Compact workflow document expands beyond {max_output_size} bytes.")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+def decode_compact(data: bytes, max_output_size: Optional[int] = None) -> Dict[str, Any]:
+    if not data.startswith(COMPACT_MAGIC):
+        raise ValueError("Payload is not a compact workflow document.")
+    try:
+        packed = _decompress(data[len(COMPACT_MAGIC):], max_output_size)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"Compact workflow document is corrupt: {e}")
+    envelope = msgpack.unpackb(packed, raw=False, strict_map_key=False)
+    strings = _StringTable(envelope["s"])
+    document = envelope["d"]
+    for section_name in envelope["t"]:
+        columns, interned = (NODE_COLUMNS, INTERNED_NODE_COLUMNS) if section_name == "nodes" else (EDGE_COLUMNS, INTERNED_EDGE_COLUMNS)
+        document[section_name] = _unpack_rows(document[section_name], columns, interned, strings)
+    return document
+
+def encode_document(document: Dict[str, Any], storage_format: str = "compact") -> bytes:
+    if storage_format == "compact":
+        return encode_compact(document)
+    if storage_format == "json":
+        return json.dumps(document, separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"Unknown workflow storage format '{storage_format}'. Expected one of {list(STORAGE_FORMATS)}.")
+
+def decode_document(data: Union[bytes, str]) -> Dict[str, Any]:
+    if isinstance(data, str):
+        return json.loads(data)
+    if data.startswith(COMPACT_MAGIC):
+        return decode_compact(data)
+    return json.loads(data)
+
+def is_compact_media_type(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.split(";", 1)[0].strip().lower() == COMPACT_MEDIA_TYPE
+
+def accepts_compact(accept: Optional[str]) -> bool:
+    if not accept:
+        return False
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.partition(";")
+        if media_type.strip().lower() == COMPACT_MEDIA_TYPE:
+            return "q=0" not in params.replace(" ", "").split(";")
+    return False
@@ -0,0 +1,140 @@
+import copy
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+PRESENTATION_ONLY_NODE_FIELDS = {"label"}
+PRESENTATION_NODE_KEYS = {"position", "width", "height", "selected", "dragging"}
+EXECUTION_EDGE_KEYS = {"source", "target", "sourceHandle", "targetHandle"}
+GRAPH_SECTIONS = ("nodes", "edges")
+
+def _flatten(item: Dict[str, Any]) -> Dict[str, Any]:
+    flat: Dict[str, Any] = {}
+    for key, value in item.items():
+        if key == "data" and isinstance(value, dict) and value:
+            for data_key, data_value in value.items():
+                flat[f"data.{data_key}"] = data_value
+        else:
+            flat[key] = value
+    return flat
+
+def _set_path(item: Dict[str, Any], path: str, value: Any):
+    if path.startswith("data."):
+        data = item.get("data")
+        if not isinstance(data, dict):
+            data = item["data"] = {}
+        data[path[len("data."):]] = value
+    else:
+        item[path] = value
+
+def _unset_path(item: Dict[str, Any], path: str):
+    if path.startswith("data.") and isinstance(item.get("data"), dict):
+        item["data"].pop(path[len("data."):], None)
+    else:
+        item.pop(path, None)
+
+def _diff_fields(old_flat: Dict[str, Any], new_flat: Dict[str, Any]) -> Dict[str, Any]:
+    changes: Dict[str, Any] = {}
+    changed = {path: value for path, value in new_flat.items() if path not in old_flat or old_flat[path] != value}
+    removed = [path for path in old_flat if path not in new_flat]
+    if changed:
+        changes["set"] = changed
+    if removed:
+        changes["unset"] = removed
+    return changes
+
+def _diff_items(old_items: List[Dict[str, Any]], new_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    old_index = OrderedDict((item["id"], item) for item in old_items)
+    new_index = OrderedDict((item["id"], item) for item in new_items)
+    section: Dict[str, Any] = {}
+
+    added = [item for item_id, item in new_index.items() if item_id not in old_index]
+    removed = [item_id for item_id in old_index if item_id not in new_index]
+    modified = []
+    for item_id, item in new_index.items():
+        if item_id in old_index and old_index[item_id] != item:
+            modified.append({"id": item_id, **_diff_fields(_flatten(old_index[item_id]), _flatten(item))})
+
+    if added:
+        section["added"] = added
+    if removed:
+        section["removed"] = removed
+    if modified:
+        section["modified"] = modified
+
+    implied_order = [item_id for item_id in old_index if item_id in new_index] + [item["id"] for item in added]
+    if implied_order != list(new_index):
+        section["order"] = list(new_index)
+    return section
+
+def diff_workflows(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    delta: Dict[str, Any] = {}
+    for section_name in GRAPH_SECTIONS:
+        section = _diff_items(old.get(section_name) or [], new.get(section_name) or [])
+        if section:
+            delta[section_name] = section
+
+    fields = _diff_fields(
+        {key: value for key, value in old.items() if key not in GRAPH_SECTIONS},
+        {key: value for key, value in new.items() if key not in GRAPH_SECTIONS}
+    )
+    if fields:
+        delta["fields"] = fields
+    return delta
+
+def _apply_items(items: List[Dict[str, Any]], section: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not section:
+        return items
+    index = OrderedDict((item["id"], item) for item in items)
+    for item_id in section.get("removed", []):
+        index.pop(item_id, None)
+    for change in section.get("modified", []):
+        item = index[change["id"]]
+        for path in change.get("unset", []):
+            _unset_path(item, path)
+        for path, value in change.get("set", {}).items():
+            _set_path(item, path, value)
+    for item in section.get("added", []):
+        index[item["id"]] = item
+    if "order" in section:
+        return [index[item_id] for item_id in section["order"]]
+    return list(index.values())
+
+def apply_workflow_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    result = copy.deepcopy(base)
+    delta = copy.deepcopy(delta)
+    fields = delta.get("fields", {})
+    for key in fields.get("unset", []):
+        result.pop(key, None)
+    result.update(fields.get("set", {}))
+    for section_name in GRAPH_SECTIONS:
+        result[section_name] = _apply_items(result.get(section_name) or [], delta.get(section_name))
+    return result
+
+def _is_execution_relevant(path: str) -> bool:
+    if path in PRESENTATION_NODE_KEYS:
+        return False
+    return not (path.startswith("data.") and path[len("data."):] in PRESENTATION_ONLY_NODE_FIELDS)
+
+def changed_node_ids(old: Dict[str, Any], new: Dict[str, Any], delta: Optional[Dict[str, Any]] = None) -> List[str]:
+    delta = delta if delta is not None else diff_workflows(old, new)
+    new_node_ids = {node["id"] for node in new.get("nodes") or []}
+    old_edges = {edge["id"]: edge for edge in old.get("edges") or []}
+    new_edges = {edge["id"]: edge for edge in new.get("edges") or []}
+    changed: set = set()
+
+    nodes = delta.get("nodes", {})
+    changed.update(node["id"] for node in nodes.get("added", []))
+    for change in nodes.get("modified", []):
+        paths = list(change.get("set", {})) + change.get("unset", [])
+        if any(_is_execution_relevant(path) for path in paths):
+            changed.add(change["id"])
+
+    edges = delta.get("edges", {})
+    changed.update(edge["target"] for edge in edges.get("added", []))
+    changed.update(old_edges[edge_id]["target"] for edge_id in edges.get("removed", []) if edge_id in old_edges)
+    for change in edges.get("modified", []):
+        paths = list(change.get("set", {})) + change.get("unset", [])
+        if any(path in EXECUTION_EDGE_KEYS for path in paths):
+            changed.update(edge["target"] for edge in (old_edges.get(change["id"]), new_edges.get(change["id"])) if edge)
+
+    return sorted(changed & new_node_ids)
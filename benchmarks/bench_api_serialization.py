@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+
+from backend.api.fast_json import FastJSONRoute, PreserializedJSON, GZIP_MINIMUM_SIZE, GZIP_COMPRESS_LEVEL
+from backend.api.models.responses import GenericResponse
+from backend.services.nodes.registry import get_node_registry
+
+def generate_assets(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"{i:08x}",
+            "filename": f"product_{i}.png",
+            "path": f"uploads/products/product_{i}.png",
+            "url": f"/uploads/products/product_{i}.png?v=0123456789abcdef",
+            "size": 1024 * (i % 900 + 1),
+            "asset_type": "image",
+            "category": "products",
+            "created_at": "2026-10-19T12:00:00",
+            "width": 1024,
+            "height": 1024,
+        }
+        for i in range(count)
+    ]
+
+def build_before_app(assets: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/node-types")
+    async def node_types():
+        return get_node_registry().schema()
+
+    @app.get("/assets")
+    async def list_assets():
+        return {"assets": assets, "next_cursor": None}
+
+    @app.get("/wrapped", response_model=GenericResponse)
+    async def wrapped():
+        return GenericResponse(data={"assets": assets})
+
+    return app
+
+def build_after_app(assets: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+    app.router.route_class = FastJSONRoute
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+    node_types_payload = PreserializedJSON(get_node_registry().schema())
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/node-types")
+    async def node_types(request: Request):
+        return node_types_payload.response(request)
+
+    @router.get("/assets")
+    async def list_assets():
+        return {"assets": assets, "next_cursor": None}
+
+    @router.get("/wrapped", response_model=GenericResponse)
+    async def wrapped():
+        return GenericResponse(data={"assets": assets})
+
+    app.include_router(router)
+    return app
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int, headers: Dict[str, str]) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        wire_bytes = int(response.headers.get("content-length", len(response.content)))
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                (await client.get(path, headers=headers)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {"rps": requests / elapsed, "bytes": wire_bytes}
+
+async def run(requests: int, concurrency: int, asset_count: int):
+    assets = generate_assets(asset_count)
+    before_app, after_app = build_before_app(assets), build_after_app(assets)
+    variants = [
+        ("before", before_app, {"accept-encoding": "gzip"}),
+        ("after", after_app, {"accept-encoding": "identity"}),
+        ("after+gzip", after_app, {"accept-encoding": "gzip"}),
+    ]
+    print(f"{'route':<12} {'variant':<11} {'req/s':>10} {'wire bytes':>12}")
+    for path in ("/node-types", "/assets", "/wrapped"):
+        for variant, app, headers in variants:
+            result = await measure(app, path, requests, concurrency, headers)
+            print(f"{path:<12} {variant:<11} {result['rps']:>10.0f} {result['bytes']:>12}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Requests/sec for API serialization before and after orjson, pre-serialized payloads and gzip.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--assets", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.assets))
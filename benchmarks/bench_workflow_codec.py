@@ -0,0 +1,59 @@
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from backend.api.models.workflows import WorkflowRequest
+from backend.utils.workflow_codec import encode_compact, decode_compact
+
+NODE_TYPES = ["image_input", "text_to_image", "style_transfer", "text_overlay", "crop_resize", "filter", "output"]
+
+def generate_workflow(node_count: int, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    nodes = [
+        {
+            "id": f"node_{i}",
+            "type": rng.choice(NODE_TYPES),
+            "position": {"x": rng.uniform(0, 4000), "y": rng.uniform(0, 4000)},
+            "data": {"label": f"Step {i}", "prompt": "studio shot of a sneaker, soft light", "width": 1024, "height": 1024, "intensity": 0.7},
+        }
+        for i in range(node_count)
+    ]
+    edges = [
+        {"id": f"edge_{i}", "source": f"node_{rng.randrange(i)}", "target": f"node_{i}", "sourceHandle": "image", "targetHandle": "image"}
+        for i in range(1, node_count)
+    ]
+    return WorkflowRequest(nodes=nodes, edges=edges, name="benchmark").model_dump()
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(node_counts: List[int], repeat: int):
+    print(f"{'nodes':>7} {'format':<14} {'bytes':>10} {'encode ms':>10} {'decode ms':>10} {'load ms':>10}")
+    for node_count in node_counts:
+        workflow = generate_workflow(node_count)
+        codecs = {
+            "json indent=2": (lambda w: json.dumps(w, indent=2).encode("utf-8"), json.loads),
+            "json compact": (lambda w: json.dumps(w, separators=(",", ":")).encode("utf-8"), json.loads),
+            "msgpack+zstd": (encode_compact, decode_compact),
+        }
+        for name, (encode, decode) in codecs.items():
+            payload = encode(workflow)
+            assert decode(payload) == workflow
+            encode_seconds = best_of(repeat, lambda: encode(workflow))
+            decode_seconds = best_of(repeat, lambda: decode(payload))
+            load_seconds = best_of(repeat, lambda: WorkflowRequest.model_validate(decode(payload)))
+            print(f"{node_count:>7} {name:<14} {len(payload):>10} {encode_seconds * 1000:>10.2f} {decode_seconds * 1000:>10.2f} {load_seconds * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON and compact msgpack+zstd workflow encodings.")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.nodes, args.repeat)
@@ -173,8 +173,18 @@ def node_inspector_panel():
                         size="2",
                         width="100%",
                         on_click=WorkflowState.execute_selected_node,
+                        loading=WorkflowState.is_previewing,
                         color_scheme="blue"
                     ),
+                    rx.cond(
+                        WorkflowState.selected_node_preview_url != "",
+                        rx.image(
+                            src=WorkflowState.selected_node_preview_url,
+                            width="100%",
+                            border_radius="8px",
+                            border="1px solid var(--border)"
+                        )
+                    ),
                     rx.button(
                         "Duplicate Node",
                         size="2",
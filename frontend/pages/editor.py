@@ -33,6 +33,25 @@ def top_menu_bar():
                     loading=WorkflowState.is_executing,
                     on_click=WorkflowState.execute_workflow
                 ),
+                rx.hstack(
+                    rx.switch(
+                        checked=WorkflowState.draft_mode,
+                        on_change=WorkflowState.toggle_draft_mode,
+                        size="1"
+                    ),
+                    rx.text("Draft", size="2"),
+                    spacing="1",
+                    align="center"
+                ),
+                rx.button(
+                    rx.icon("sparkles"),
+                    "Promote to Final",
+                    size="2",
+                    variant="outline",
+                    loading=WorkflowState.is_executing,
+                    disabled=WorkflowState.last_draft_execution_id == "",
+                    on_click=WorkflowState.promote_to_final
+                ),
                 rx.button(
                     rx.icon("square"),
                     "Stop",
@@ -1,9 +1,13 @@
 import reflex as rx
 from typing import Dict, Any, List, Optional
 import json
+import os
 import uuid
 from datetime import datetime
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+
 class AppState(rx.State):
     user_id: str = ""
     session_id: str = ""
@@ -84,9 +88,18 @@ class AppState(rx.State):
             uploaded_files = []
 
             for file in files:
-                file_path = f"uploads/{self.user_id}_{file.filename}"
-                with open(file_path, "wb") as f:
-                    f.write(await file.read())
+                file_path = f"uploads/{self.user_id}_{os.path.basename(file.filename)}"
+                written = 0
+                try:
+                    with open(file_path, "wb") as f:
+                        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                            written += len(chunk)
+                            if written > MAX_UPLOAD_SIZE:
+                                raise ValueError(f"{file.filename} exceeds the {MAX_UPLOAD_SIZE} byte upload limit")
+                            f.write(chunk)
+                except ValueError:
+                    os.remove(file_path)
+                    raise
 
                 uploaded_files.append(file_path)
                 self.add_to_log(f"File uploaded: {file.filename}")
@@ -13,6 +13,10 @@ class WorkflowState(rx.State):
     node_types: Dict[str, Dict[str, Any]] = {}
     execution_results: Dict[str, Any] = {}
     is_executing: bool = False
+    node_previews: Dict[str, str] = {}
+    draft_mode: bool = False
+    last_draft_execution_id: str = ""
+    is_previewing: bool = False
     workflow_templates: Dict[str, Dict[str, Any]] = {}
     custom_styles: List[Dict[str, Any]] = []
 
@@ -231,7 +235,8 @@ class WorkflowState(rx.State):
             workflow_data = {
                 "nodes": self.nodes,
                 "edges": self.edges,
-                "api_keys": {}
+                "api_keys": {},
+                "mode": "draft" if self.draft_mode else "final"
             }
 
             async with httpx.AsyncClient(timeout=300.0) as client:
@@ -243,6 +248,7 @@ class WorkflowState(rx.State):
                 if response.status_code == 200:
                     result = response.json()
                     self.execution_results = result["result"]
+                    self.last_draft_execution_id = result["execution_id"] if self.draft_mode else ""
                 else:
                     print(f"Execution failed: {response.text}")
 
@@ -251,11 +257,77 @@ class WorkflowState(rx.State):
         finally:
             self.is_executing = False
 
+    @rx.event
+    def toggle_draft_mode(self):
+        self.draft_mode = not self.draft_mode
+
+    @rx.event
+    async def promote_to_final(self):
+        if not self.last_draft_execution_id:
+            return
+
+        try:
+            self.is_executing = True
+
+            async with httpx.AsyncClient(timeout=300.0) as client:
+                response = await client.post(
+                    f"http://localhost:8000/api/v1/execute-workflow/{self.last_draft_execution_id}/promote",
+                    json={"api_keys": {}}
+                )
+
+                if response.status_code == 200:
+                    result = response.json()
+                    self.execution_results = result["result"]
+                    self.last_draft_execution_id = ""
+                else:
+                    print(f"Promotion failed: {response.text}")
+
+        except Exception as e:
+            print(f"Workflow promotion error: {e}")
+        finally:
+            self.is_executing = False
+
+    @rx.computed
+    def selected_node_preview_url(self) -> str:
+        if not self.selected_node_id:
+            return ""
+        return self.node_previews.get(self.selected_node_id, "")
+
     @rx.event
     async def execute_selected_node(self):
         if not self.selected_node_id:
             return
 
+        node_id = self.selected_node_id
+        try:
+            self.is_previewing = True
+
+            preview_request = {
+                "nodes": self.nodes,
+                "edges": self.edges,
+                "api_keys": {},
+                "node_id": node_id,
+                "max_size": 512,
+                "mode": "draft"
+            }
+
+            async with httpx.AsyncClient(timeout=300.0) as client:
+                response = await client.post(
+                    "http://localhost:8000/api/v1/preview-node",
+                    json=preview_request
+                )
+
+                if response.status_code == 200:
+                    preview = response.json()["data"]
+                    self.node_previews = {**self.node_previews, node_id: preview["preview_url"]}
+                else:
+                    print(f"Node preview failed: {response.text}")
+
+        except Exception as e:
+            print(f"Node preview error: {e}")
+        finally:
+            self.is_previewing = False
+
     @rx.event
     def duplicate_selected_node(self):
         if not self.selected_node:
@@ -306,6 +378,7 @@ class WorkflowState(rx.State):
         self.edges = []
         self.clear_selection()
         self.execution_results = {}
+        self.node_previews = {}
 
     @rx.event
     def handle_nodes_change(self, changes: List[Dict[str, Any]]):
@@ -0,0 +1,48 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import types
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+STATE_DIR = tempfile.mkdtemp(prefix="marketcanvas-tests-")
+os.environ.update({
+    "ASSET_INDEX_PATH": os.path.join(STATE_DIR, "asset_index.db"),
+    "ARTIFACT_STORE_PATH": os.path.join(STATE_DIR, "artifact_store.db"),
+    "PROVIDER_TELEMETRY_PATH": os.path.join(STATE_DIR, "provider_telemetry.db"),
+    "RENDER_CACHE_DIR": os.path.join(STATE_DIR, "render_cache"),
+    "TRACING_FILE_PATH": os.path.join(STATE_DIR, "traces.jsonl"),
+    "DATABASE_URL": f"sqlite:///{os.path.join(STATE_DIR, 'marketcanvas.db')}",
+})
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_working_directory():
+    invocation_dir = os.getcwd()
+    os.chdir(STATE_DIR)
+    try:
+        yield STATE_DIR
+    finally:
+        os.chdir(invocation_dir)
+        shutil.rmtree(STATE_DIR, ignore_errors=True)
+
+if importlib.util.find_spec("backend.utils.file_handler") is None:
+    class FileHandler:
+        def __init__(self, base_upload_dir: str = "uploads", workflow_subdir: str = "workflow_outputs"):
+            self.base_upload_dir = base_upload_dir
+            self.workflow_upload_subdir = workflow_subdir
+
+        def get_url_for_file(self, file_path: str, api_base_url: str = "/uploads") -> str:
+            return api_base_url.rstrip("/") + "/" + os.path.relpath(file_path, self.base_upload_dir).replace(os.sep, "/")
+
+        async def save_image_from_url(self, image_url: str, execution_id: str, node_id: str, sub_dir_override=None) -> str:
+            raise NotImplementedError("backend.utils.file_handler is not available in this checkout.")
+
+    file_handler_module = types.ModuleType("backend.utils.file_handler")
+    file_handler_module.FileHandler = FileHandler
+    sys.modules["backend.utils.file_handler"] = file_handler_module
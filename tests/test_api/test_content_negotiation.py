@@ -0,0 +1,51 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from backend.api.content_negotiation import workflow_body
+from backend.utils.workflow_codec import COMPACT_MEDIA_TYPE, encode_compact
+
+
+class Payload(BaseModel):
+    name: str
+    count: int
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.post("/workflows")
+    async def save(payload: Payload = Depends(workflow_body(Payload))):
+        return payload
+
+    return TestClient(app)
+
+
+def test_compact_and_json_bodies_are_accepted(client):
+    compact = client.post("/workflows", content=encode_compact({"name": "a", "count": 1}), headers={"content-type": COMPACT_MEDIA_TYPE})
+    assert compact.status_code == 200 and compact.json() == {"name": "a", "count": 1}
+    assert client.post("/workflows", json={"name": "b", "count": 2}).json() == {"name": "b", "count": 2}
+
+
+@pytest.mark.parametrize("content, content_type, error_type, loc", [
+    (b"{not json", "application/json", "json_invalid", ["body"]),
+    (b'{"name": "a", "count": "many"}', "application/json", "int_parsing", ["body", "count"]),
+    (b"not compact", COMPACT_MEDIA_TYPE, "value_error", ["body"]),
+])
+def test_undecodable_bodies_are_validation_errors(client, content, content_type, error_type, loc):
+    response = client.post("/workflows", content=content, headers={"content-type": content_type})
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == error_type and error["loc"] == loc
+
+
+def test_compact_bodies_that_expand_past_the_limit_are_rejected(client, monkeypatch):
+    monkeypatch.setenv("WORKFLOW_MAX_DECODED_SIZE", "4096")
+    body = encode_compact({"name": "x" * 1_000_000, "count": 1})
+    assert len(body) < 4096
+
+    response = client.post("/workflows", content=body, headers={"content-type": COMPACT_MEDIA_TYPE})
+    assert response.status_code == 422
+    assert "expands beyond 4096 bytes" in response.json()["detail"][0]["msg"]
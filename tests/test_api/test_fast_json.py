@@ -0,0 +1,62 @@
+import gzip
+from datetime import datetime
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.api.fast_json import FastJSONRoute, ORJSONResponse, PreserializedJSON
+from backend.api.models.responses import GenericResponse
+
+
+def _client(payload: PreserializedJSON) -> TestClient:
+    app = FastAPI()
+    app.router.route_class = FastJSONRoute
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/plain", status_code=201)
+    async def plain():
+        return {"tags": {"a"}, "created_at": datetime(2026, 1, 2, 3, 4, 5), "model": GenericResponse(message="hi")}
+
+    @router.get("/model", response_model=GenericResponse)
+    async def model():
+        return GenericResponse(data={"n": 1})
+
+    @router.get("/static")
+    async def static(request: Request):
+        return payload.response(request)
+
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def test_routes_without_response_model_render_with_orjson():
+    async def plain():
+        return {}
+
+    assert FastJSONRoute("/plain", plain).response_class is ORJSONResponse
+    assert FastJSONRoute("/model", plain, response_model=GenericResponse).response_class is not ORJSONResponse
+
+    response = _client(PreserializedJSON({})).get("/api/plain")
+    assert response.status_code == 201
+    assert response.json() == {"tags": ["a"], "created_at": "2026-01-02T03:04:05", "model": {"success": True, "message": "hi", "data": None}}
+
+
+def test_response_model_routes_keep_pydantic_serialization():
+    response = _client(PreserializedJSON({})).get("/api/model")
+    assert response.json() == {"success": True, "message": None, "data": {"n": 1}}
+
+
+def test_preserialized_payload_is_gzipped_and_revalidated():
+    payload = PreserializedJSON({"items": ["node"] * 1000})
+    client = _client(payload)
+
+    compressed = client.get("/api/static", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json() == {"items": ["node"] * 1000}
+    assert len(payload.gzipped) < len(payload.body)
+    assert gzip.decompress(payload.gzipped) == payload.body
+
+    plain = client.get("/api/static", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    revalidated = client.get("/api/static", headers={"If-None-Match": plain.headers["etag"]})
+    assert revalidated.status_code == 304
@@ -0,0 +1,44 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.api.http_cache import ContentHashedStaticFiles, cached_file_response, IMMUTABLE_CACHE_CONTROL
+from backend.utils.content_hash import versioned_url
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "image.png").write_bytes(b"not really a png")
+    app = FastAPI()
+    app.mount("/static", ContentHashedStaticFiles(directory=str(tmp_path)), name="static")
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return cached_file_response(request, str(tmp_path / "image.png"), media_type="image/png")
+
+    return TestClient(app), tmp_path
+
+
+@pytest.mark.parametrize("route", ["/static/image.png", "/file"])
+def test_etag_round_trip_returns_304(client, route):
+    test_client, _ = client
+    first = test_client.get(route)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+
+    second = test_client.get(route, headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_versioned_url_is_immutable_until_content_changes(client):
+    test_client, tmp_path = client
+    image_path = str(tmp_path / "image.png")
+    url = versioned_url("/static/image.png", image_path)
+
+    response = test_client.get(url)
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    (tmp_path / "image.png").write_bytes(b"different bytes entirely")
+    assert versioned_url("/static/image.png", image_path) != url
+    assert test_client.get(url).headers["cache-control"] == "no-cache"
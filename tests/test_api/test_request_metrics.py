@@ -0,0 +1,33 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.request_metrics import MetricsMiddleware, register_cache_hit_ratio
+from backend.utils.metrics import MetricsRegistry, cache_lookups_counter
+
+def test_request_latency_is_labelled_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    text = registry.render()
+    assert 'marketcanvas_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in text
+    assert 'marketcanvas_http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in text
+    assert "marketcanvas_http_requests_in_progress 0" in text
+
+def test_cache_hit_ratio_is_computed_at_scrape_time():
+    registry = MetricsRegistry()
+    register_cache_hit_ratio(registry)
+    lookups = cache_lookups_counter()
+    lookups.labels("test_ratio", "hit").inc(3)
+    lookups.labels("test_ratio", "miss").inc()
+
+    assert 'marketcanvas_cache_hit_ratio{cache="test_ratio"} 0.75' in registry.render()
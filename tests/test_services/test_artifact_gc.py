@@ -0,0 +1,63 @@
+import json
+import os
+import time
+from backend.services.artifact_gc import ArtifactGarbageCollector
+from backend.services.artifact_store import ArtifactStore
+from backend.services.asset_index import AssetIndex
+
+def _write(path, content: bytes, age_seconds: float):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    old = time.time() - age_seconds
+    os.utime(path, (old, old))
+    return old
+
+def test_gc_removes_only_unreferenced_expired_artifacts(tmp_path):
+    base_dir = str(tmp_path / "uploads")
+    saved_dir = tmp_path / "saved_workflows"
+    saved_dir.mkdir()
+
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=base_dir)
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=base_dir)
+    paths = {name: os.path.join(base_dir, "workflow_outputs", f"{name}.png") for name in ("old", "saved", "recent", "fresh")}
+    for name, path in paths.items():
+        created_at = _write(path, name.encode(), age_seconds=10 if name == "fresh" else 3600)
+        index.add(path, kind="artifact", execution_id=f"exec-{name}", content_hash=store.ingest(path), created_at=created_at)
+
+    upload_path = os.path.join(base_dir, "general", "logo.png")
+    index.add(upload_path, kind="upload", created_at=_write(upload_path, b"logo", age_seconds=3600))
+
+    with open(saved_dir / "campaign.json", "w") as f:
+        json.dump({"nodes": [{"data": {"file": "workflow_outputs/saved.png"}}]}, f)
+
+    collector = ArtifactGarbageCollector(index, store, saved_workflows_dir=str(saved_dir), ttl_seconds=60)
+    collector.add_execution_provider(lambda: ["exec-recent"])
+
+    report = collector.collect(dry_run=True)
+    assert [artifact["path"] for artifact in report["artifacts"]] == [os.path.normpath(paths["old"])]
+    assert report["kept"] == {"referenced": 1, "recent_execution": 1, "retained": 1}
+    assert os.path.exists(paths["old"])
+
+    report = collector.collect(dry_run=False)
+    assert report["deleted_count"] == 1
+    assert not os.path.exists(paths["old"])
+    assert all(os.path.exists(paths[name]) for name in ("saved", "recent", "fresh"))
+    assert os.path.exists(upload_path)
+
+def test_gc_enforces_quota_oldest_first(tmp_path):
+    base_dir = str(tmp_path / "uploads")
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=base_dir)
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=base_dir)
+    for age, name in ((3000, "a"), (2000, "b"), (1000, "c")):
+        path = os.path.join(base_dir, "workflow_outputs", f"{name}.png")
+        created_at = _write(path, name.encode() * 100, age_seconds=age)
+        index.add(path, kind="artifact", content_hash=store.ingest(path), created_at=created_at)
+
+    collector = ArtifactGarbageCollector(
+        index, store, saved_workflows_dir=str(tmp_path / "none"), ttl_seconds=10**6, quota_bytes=150, min_age_seconds=0
+    )
+    report = collector.collect(dry_run=True)
+    assert [os.path.basename(artifact["path"]) for artifact in report["artifacts"]] == ["a.png", "b.png"]
+    assert all(artifact["reason"] == "quota" for artifact in report["artifacts"])
+    assert report["usage_bytes_after"] == 100
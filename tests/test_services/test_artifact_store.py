@@ -0,0 +1,83 @@
+import os
+import time
+from backend.services.artifact_store import ArtifactStore
+from backend.services.asset_index import AssetIndex
+
+def test_identical_files_share_one_blob(tmp_path):
+    base_dir = tmp_path / "uploads"
+    (base_dir / "a").mkdir(parents=True)
+    first_path = str(base_dir / "a" / "one.png")
+    second_path = str(base_dir / "a" / "two.png")
+    for path in (first_path, second_path):
+        with open(path, "wb") as f:
+            f.write(b"same bytes")
+
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=str(base_dir))
+    first_hash = store.ingest(first_path)
+    second_hash = store.ingest(second_path)
+
+    assert first_hash == second_hash
+    assert os.path.samefile(first_path, second_path)
+    assert store.ref_count(first_hash) == 2
+    stats = store.stats()
+    assert stats["blobs"] == 1
+    assert stats["deduplicated_bytes"] == len(b"same bytes")
+
+def test_blob_is_removed_with_its_last_reference(tmp_path):
+    base_dir = tmp_path / "uploads"
+    base_dir.mkdir()
+    paths = [str(base_dir / name) for name in ("x.png", "y.png")]
+    for path in paths:
+        with open(path, "wb") as f:
+            f.write(b"shared")
+
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=str(base_dir))
+    content_hash = [store.ingest(path) for path in paths][0]
+    blob_path = store.blob_path(content_hash, ".png")
+
+    assert store.release(paths[0])
+    assert os.path.exists(blob_path) and os.path.exists(paths[1])
+
+    assert store.release(paths[1])
+    assert not os.path.exists(blob_path)
+    assert store.resolve(paths[1]) is None
+
+def test_duplicate_of_old_blob_is_indexed_as_new(tmp_path):
+    base_dir = tmp_path / "uploads"
+    base_dir.mkdir()
+    old_path, new_path = str(base_dir / "old.png"), str(base_dir / "new.png")
+    for path in (old_path, new_path):
+        with open(path, "wb") as f:
+            f.write(b"same output")
+
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=str(base_dir))
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=str(base_dir))
+    month_ago = time.time() - 30 * 24 * 3600
+    store.ingest(old_path)
+    os.utime(old_path, (month_ago, month_ago))
+
+    before = time.time()
+    content_hash = store.ingest(new_path)
+    asset = index.add(new_path, kind="artifact", execution_id="exec2", content_hash=content_hash)
+
+    assert os.path.samefile(old_path, new_path)
+    assert os.path.getmtime(new_path) < before - 3600
+    assert asset["created_at"] >= before
+
+def test_same_bytes_under_another_extension_reuse_the_first_blob(tmp_path):
+    base_dir = tmp_path / "uploads"
+    base_dir.mkdir()
+    paths = [str(base_dir / name) for name in ("photo.jpg", "photo.jpeg")]
+    for path in paths:
+        with open(path, "wb") as f:
+            f.write(b"jpeg bytes")
+
+    store = ArtifactStore(str(tmp_path / "store.db"), base_dir=str(base_dir))
+    content_hash = [store.ingest(path) for path in paths][0]
+    blob_files = lambda: [name for _, _, names in os.walk(store.blob_dir) for name in names]
+
+    assert blob_files() == [f"{content_hash}.jpg"]
+    assert os.path.samefile(paths[0], paths[1])
+    for path in paths:
+        store.release(path)
+    assert blob_files() == []
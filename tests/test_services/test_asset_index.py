@@ -0,0 +1,135 @@
+import os
+from backend.services.asset_index import AssetIndex
+
+def _touch(path: str, size: int = 10):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+def test_rebuild_classifies_uploads_and_engine_artifacts(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    _touch(os.path.join(uploads, "products", "shoe.png"))
+    _touch(os.path.join(uploads, "products", "0b7c1a52-3a8e-4d2f-9a55-2f1b7e9d4c11_node1_styled_neon_1a2b3c4d.png"))
+    _touch(os.path.join(uploads, "products", "0b7c1a523a8e4d2f9a552f1b7e9d4c11_node2_resized_5e6f7a8b.png"))
+    _touch(os.path.join(uploads, "templates", "promo.json"))
+
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    assert index.rebuild() == 4
+
+    uploads_only, _ = index.query()
+    assert sorted(asset["filename"] for asset in uploads_only) == ["promo.json", "shoe.png"]
+
+    images, _ = index.query(asset_type="image", include_artifacts=True)
+    assert len(images) == 3
+
+    templates, _ = index.query(category="templates")
+    assert [asset["filename"] for asset in templates] == ["promo.json"]
+
+def test_cursor_pagination_walks_every_asset_once(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    for i in range(7):
+        path = os.path.join(uploads, "general", f"asset_{i}.png")
+        _touch(path)
+        index.add(path, category="general")
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = index.query(sort="filename", descending=False, limit=3, cursor=cursor)
+        seen.extend(asset["filename"] for asset in page)
+        if not cursor:
+            break
+
+    assert seen == [f"asset_{i}.png" for i in range(7)]
+
+    index.remove(os.path.join(uploads, "general", "asset_0.png"))
+    remaining, _ = index.query(limit=50)
+    assert len(remaining) == 6
+
+def test_query_filters_by_extension_size_and_execution(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+
+    for filename, size in [("small.png", 5), ("large.png", 500), ("photo.webp", 50)]:
+        path = os.path.join(uploads, "general", filename)
+        _touch(path, size)
+        index.add(path, category="general")
+    artifact_path = os.path.join(uploads, "general", "run1_node1_crop_resize_deadbeef.png")
+    _touch(artifact_path, 20)
+    index.add(artifact_path, kind="artifact", execution_id="run1")
+
+    pngs, _ = index.query(extensions=["png"])
+    assert sorted(asset["filename"] for asset in pngs) == ["large.png", "small.png"]
+
+    mid_sized, _ = index.query(min_size=10, max_size=100)
+    assert [asset["filename"] for asset in mid_sized] == ["photo.webp"]
+
+    run_assets, _ = index.query(execution_id="run1")
+    assert [asset["filename"] for asset in run_assets] == ["run1_node1_crop_resize_deadbeef.png"]
+
+    assert index.count_estimate() == (3, False)
+    assert index.count_estimate(cap=2) == (2, True)
+
+def test_add_many_and_remove_many_notify_once_per_asset(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    notified = []
+    index.add_listener(lambda asset: notified.append(asset["filename"]))
+
+    paths = [os.path.join(uploads, "bulk", f"item{i}.png") for i in range(5)]
+    for path in paths:
+        _touch(path)
+    assets = index.add_many([{"path": path, "category": "bulk", "content_hash": f"hash{i}"} for i, path in enumerate(paths)])
+
+    assert [asset["filename"] for asset in assets] == [f"item{i}.png" for i in range(5)]
+    assert assets[2]["content_hash"] == "hash2"
+    assert sorted(notified) == sorted(asset["filename"] for asset in assets)
+    assert len(index.get_many([assets[0]["id"], assets[4]["id"], "missing"])) == 2
+
+    assert index.remove_many(paths[:3] + [os.path.join(uploads, "bulk", "missing.png")]) == 3
+    remaining, _ = index.query(category="bulk")
+    assert sorted(asset["filename"] for asset in remaining) == ["item3.png", "item4.png"]
+
+def test_storage_key_marks_only_assets_written_to_remote_storage(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    upload_path = os.path.join(uploads, "general", "logo.png")
+    artifact_path = os.path.join(uploads, "workflow_outputs", "render.png")
+    _touch(upload_path)
+    _touch(artifact_path)
+
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    assert index.add(upload_path, storage_key="general/logo.png")["storage_key"] == "general/logo.png"
+    assert index.add(artifact_path, kind="artifact", execution_id="exec1")["storage_key"] is None
+
+    _touch(upload_path, size=20)
+    assert index.add(upload_path)["storage_key"] is None
+
+def test_reregistering_a_path_updates_its_classification(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    path = os.path.join(uploads, "products", "shoe.png")
+    _touch(path)
+
+    db_path = tmp_path / "index.db"
+    index = AssetIndex(str(db_path), base_upload_dir=uploads)
+    assert not db_path.exists()
+
+    first = index.add(path, category="products")
+    second = index.add(path, category="campaign", kind="artifact", execution_id="exec1")
+
+    assert second["id"] == first["id"]
+    assert (second["category"], second["kind"], second["execution_id"]) == ("campaign", "artifact", "exec1")
+    assert index.query(include_artifacts=False)[0] == []
+
+def test_ensure_built_indexes_files_written_outside_the_index(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    _touch(os.path.join(uploads, "products", "shoe.png"))
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    index.ensure_built()
+
+    _touch(os.path.join(uploads, "user_ab12cd34_banner.png"))
+    _touch(os.path.join(uploads, "direct_generations", "direct_gen_fal_1a2b3c4d.png"))
+    index.ensure_built()
+
+    assets, _ = index.query()
+    assert sorted(asset["filename"] for asset in assets) == ["direct_gen_fal_1a2b3c4d.png", "shoe.png", "user_ab12cd34_banner.png"]
+    assert index.reconcile() == []
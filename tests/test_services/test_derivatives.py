@@ -0,0 +1,66 @@
+import os
+import threading
+from PIL import Image
+from backend.services.asset_index import AssetIndex
+from backend.services.derivatives import DerivativeGenerator, derivative_path
+
+def test_generate_thumbnail_and_preview_derivatives(tmp_path):
+    uploads = str(tmp_path / "uploads")
+    original_path = os.path.join(uploads, "products", "banner.png")
+    os.makedirs(os.path.dirname(original_path))
+    Image.new("RGB", (2000, 1000), "navy").save(original_path)
+
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=uploads)
+    generator = DerivativeGenerator(index)
+    asset = index.add(original_path, category="products")
+
+    generator.schedule(asset).result()
+
+    thumb_path = derivative_path(original_path, "thumb", "webp")
+    assert os.path.exists(thumb_path)
+    assert Image.open(thumb_path).size == (256, 128)
+
+    described = generator.describe(index.get(asset["id"]), lambda path: f"/uploads/{os.path.relpath(path, uploads)}")
+    assert described["derivatives"]["preview"]["width"] == 1024
+    assert described["srcset"]["webp"].endswith("1024w")
+
+    generator.remove_derivatives(original_path)
+    assert not os.path.exists(thumb_path)
+
+def test_small_images_are_not_upscaled(tmp_path):
+    original_path = str(tmp_path / "icon.png")
+    Image.new("RGBA", (120, 80)).save(original_path)
+
+    generator = DerivativeGenerator(AssetIndex(str(tmp_path / "index.db"), base_upload_dir=str(tmp_path)))
+    derivatives = generator.generate(original_path)
+
+    assert list(derivatives) == ["thumb"]
+    assert (derivatives["thumb"]["width"], derivatives["thumb"]["height"]) == (120, 80)
+
+
+def test_deleting_an_asset_discards_derivatives_still_being_generated(tmp_path):
+    paths = [str(tmp_path / name) for name in ("running.png", "queued.png")]
+    for path in paths:
+        Image.new("RGB", (600, 400), "teal").save(path)
+
+    index = AssetIndex(str(tmp_path / "index.db"), base_upload_dir=str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+
+    class SlowGenerator(DerivativeGenerator):
+        def generate(self, original_path):
+            started.set()
+            release.wait(5)
+            return super().generate(original_path)
+
+    generator = SlowGenerator(index, max_workers=1)
+    running, queued = [generator.schedule(index.add(path)) for path in paths]
+    assert started.wait(5)
+
+    for path in paths:
+        generator.remove_derivatives(path)
+    release.set()
+    running.result()
+
+    assert queued.cancelled()
+    generator._executor.shutdown(wait=True)
+    assert not os.path.exists(tmp_path / ".derivatives") or os.listdir(tmp_path / ".derivatives") == []
@@ -0,0 +1,88 @@
+import types
+import pytest
+from PIL import Image
+
+from backend.api.models.nodes import NodeTypeEnum
+from backend.services.nodes.base import NodeType
+from backend.services.nodes.registry import NodeRegistry, create_node_registry
+from backend.services.workflow_engine import WorkflowEngine
+from backend.utils.image_processor import ImageProcessor
+
+def test_registry_covers_every_declared_node_type():
+    registry = create_node_registry()
+    assert set(registry.type_names()) == {member.value for member in NodeTypeEnum}
+
+    schema = registry.schema()
+    assert schema["text_to_image"]["cost_class"] == "provider"
+    assert schema["text_to_image"]["cacheable"] is False
+    assert schema["crop_resize"]["inputs"] == ["image"]
+    assert "filter" in schema["filter"]["properties"]
+
+def test_register_rejects_duplicates_and_bumps_revision():
+    class EchoNode(NodeType):
+        type_name = "echo"
+        cost_class = "trivial"
+
+        async def execute(self, engine, node, params, api_keys, execution_id, mode):
+            return {"text": params.get("text")}
+
+    registry = NodeRegistry()
+    registry.register(EchoNode)
+    assert registry.revision == 1
+    with pytest.raises(ValueError):
+        registry.register(EchoNode)
+    registry.register(EchoNode, replace=True)
+    assert registry.revision == 2
+    with pytest.raises(ValueError):
+        registry.get("missing")
+
+@pytest.mark.asyncio
+async def test_engine_dispatches_through_registry():
+    class ShoutNode(NodeType):
+        type_name = "shout"
+        inputs = ["text"]
+        outputs = ["text"]
+        cost_class = "trivial"
+
+        async def execute(self, engine, node, params, api_keys, execution_id, mode):
+            return {"text": params["text"].upper()}
+
+    engine = WorkflowEngine()
+    engine.node_registry = create_node_registry()
+    engine.node_registry.register(ShoutNode)
+
+    nodes = [
+        {"id": "input1", "type": "text_input", "position": {"x":0,"y":0}, "data": {"value": "hello"}},
+        {"id": "shout1", "type": "shout", "position": {"x":100,"y":0}, "data": {}},
+    ]
+    edges = [{"id": "e1", "source": "input1", "target": "shout1"}]
+    plan = engine._compile_workflow(nodes, edges, target_node_ids=["shout1"])
+    outputs = await engine._run_plan(plan, {}, "exec1")
+    assert outputs["shout1"] == {"text": "HELLO"}
+
+    with pytest.raises(ValueError):
+        await engine._execute_node({"id": "n", "type": "unknown", "data": {}}, {}, {}, "exec1")
+
+@pytest.mark.asyncio
+async def test_new_image_nodes_produce_images(tmp_path):
+    source = tmp_path / "source.png"
+    image = Image.new("RGB", (40, 30), "white")
+    image.paste((200, 30, 30), (10, 10, 30, 20))
+    image.save(source)
+
+    engine = WorkflowEngine()
+    engine.image_processor = ImageProcessor(types.SimpleNamespace(base_upload_dir=str(tmp_path), workflow_upload_subdir=""))
+
+    upscaled = await engine._execute_node({"id": "up", "type": "upscale", "data": {"scale": 2}}, {"image": str(source)}, {}, "exec1")
+    with Image.open(upscaled["image"]) as result:
+        assert result.size == (80, 60)
+
+    cutout = await engine._execute_node({"id": "bg", "type": "background_remove", "data": {"feather": 0}}, {"image": str(source)}, {}, "exec1")
+    with Image.open(cutout["image"]) as result:
+        assert result.getpixel((0, 0))[3] == 0
+        assert result.getpixel((20, 15))[3] == 255
+
+    filtered = await engine._execute_node({"id": "f", "type": "filter", "data": {"filter": "grayscale", "amount": 1}}, {"image": str(source)}, {}, "exec1")
+    with Image.open(filtered["image"]) as result:
+        red, green, blue = result.convert("RGB").getpixel((20, 15))
+        assert red == green == blue
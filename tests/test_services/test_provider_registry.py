@@ -0,0 +1,72 @@
+import pytest
+
+from backend.services.ai_providers.base import BaseAIProvider, GenerationResponse, TEXT_TO_IMAGE, IMAGE_TO_IMAGE
+from backend.services.ai_providers.registry import ProviderRegistry, create_provider_registry
+from backend.services.nodes.registry import create_node_registry
+
+def test_catalog_is_built_without_instantiating_providers(monkeypatch):
+    def fail_init(self, api_key):
+        raise AssertionError("provider instantiated while building the catalog")
+
+    monkeypatch.setattr(BaseAIProvider, "__init__", fail_init)
+    catalog = create_provider_registry().catalog()
+
+    assert catalog["openai"]["models"] == ["dall-e-3", "dall-e-2"]
+    assert catalog["fal"]["capabilities"] == [TEXT_TO_IMAGE, IMAGE_TO_IMAGE]
+    assert set(catalog) == {"openai", "fal", "stability", "groq"}
+
+def test_names_filter_by_capability_and_feed_node_schema():
+    registry = create_provider_registry()
+    assert registry.names(IMAGE_TO_IMAGE) == ["fal", "stability"]
+
+    schema = create_node_registry().schema()
+    assert schema["text_to_image"]["properties"]["provider"]["options"] == registry.names(TEXT_TO_IMAGE)
+    assert schema["image_to_image"]["properties"]["provider"]["options"] == registry.names(IMAGE_TO_IMAGE)
+
+@pytest.mark.asyncio
+async def test_registered_provider_is_created_by_name():
+    class EchoProvider(BaseAIProvider):
+        provider_name = "echo"
+        capabilities = [TEXT_TO_IMAGE]
+        models = ["echo-1"]
+
+        async def text_to_image(self, request):
+            return GenerationResponse(success=True, image_url=request.prompt)
+
+        async def image_to_image(self, request):
+            return GenerationResponse(success=False, error="unsupported")
+
+    registry = ProviderRegistry()
+    registry.register(EchoProvider)
+    assert registry.revision == 1
+    with pytest.raises(ValueError):
+        registry.register(EchoProvider)
+
+    async with registry.create("ECHO", "key") as provider:
+        assert isinstance(provider, EchoProvider)
+        assert provider.get_available_models() == ["echo-1"]
+    with pytest.raises(ValueError):
+        registry.create("missing", "key")
+
+def test_providers_registered_later_appear_in_node_schema():
+    provider_registry = create_provider_registry()
+    node_registry = create_node_registry(provider_registry)
+    revision = node_registry.schema_revision
+
+    class LateProvider(BaseAIProvider):
+        provider_name = "late"
+        capabilities = [IMAGE_TO_IMAGE]
+        models = ["late-1"]
+
+        async def text_to_image(self, request):
+            return GenerationResponse(success=False, error="unsupported")
+
+        async def image_to_image(self, request):
+            return GenerationResponse(success=True, image_url=request.image_url)
+
+    provider_registry.register(LateProvider)
+
+    assert node_registry.schema_revision != revision
+    schema = node_registry.schema()
+    assert "late" in schema["image_to_image"]["properties"]["provider"]["options"]
+    assert "late" not in schema["text_to_image"]["properties"]["provider"]["options"]
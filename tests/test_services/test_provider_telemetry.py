@@ -0,0 +1,112 @@
+import httpx
+import pytest
+
+from backend.services.ai_providers.base import BaseAIProvider, GenerationRequest, GenerationResponse, TEXT_TO_IMAGE
+from backend.services.ai_providers.registry import ProviderRegistry
+from backend.services.provider_telemetry import ProviderTelemetry, ProviderCall, percentile, telemetry_event_hooks
+from backend.services.workflow_engine import WorkflowEngine
+
+RESPONSE_BODY = b'{"url": "https://example.com/image.png"}'
+
+class MockProvider(BaseAIProvider):
+    provider_name = "mock"
+    capabilities = [TEXT_TO_IMAGE]
+    models = ["mock-fast", "mock-hq"]
+    default_model = "mock-fast"
+    model_costs = {"mock-fast": 0.01, "mock-hq": 0.05}
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=RESPONSE_BODY))
+        self.client = httpx.AsyncClient(transport=transport, event_hooks=telemetry_event_hooks())
+
+    async def text_to_image(self, request):
+        response = await self.client.post("https://mock.test/generate", json={"prompt": request.prompt})
+        model = request.model or self.default_model
+        return GenerationResponse(success=True, image_url=response.json()["url"], metadata={"model": model})
+
+    async def image_to_image(self, request):
+        return GenerationResponse(success=False, error="unsupported")
+
+def make_engine(tmp_path) -> WorkflowEngine:
+    engine = WorkflowEngine()
+    engine.provider_registry = ProviderRegistry()
+    engine.provider_registry.register(MockProvider)
+    engine.provider_telemetry = ProviderTelemetry(str(tmp_path / "telemetry.db"))
+    return engine
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) is None
+
+@pytest.mark.asyncio
+async def test_provider_calls_are_recorded_with_http_details(tmp_path):
+    engine = make_engine(tmp_path)
+    request = GenerationRequest(prompt="a cat", model="mock-hq")
+
+    result = await engine._call_provider("mock", "text_to_image", request, {"mock": "key"}, execution_id="exec1")
+    assert result.success
+
+    [call] = engine.provider_telemetry.recent()
+    assert call["provider"] == "mock"
+    assert call["model"] == "mock-hq"
+    assert call["execution_id"] == "exec1"
+    assert call["success"] is True
+    assert call["http_status"] == 200
+    assert call["http_requests"] == 1
+    assert call["bytes_received"] == len(RESPONSE_BODY)
+    assert call["bytes_sent"] > 0
+    assert call["cost_usd"] == pytest.approx(0.05)
+    assert call["total_ms"] >= call["queue_ms"] >= 0
+
+@pytest.mark.asyncio
+async def test_failed_calls_count_as_errors_in_rollups(tmp_path):
+    telemetry = ProviderTelemetry(str(tmp_path / "telemetry.db"))
+    for success in (True, True, False):
+        async with telemetry.track("mock", "text_to_image", "mock-fast") as call:
+            call.mark_dispatched()
+            call.finish(success, error=None if success else "boom", cost_usd=0.01)
+    with pytest.raises(RuntimeError):
+        async with telemetry.track("mock", "text_to_image", "mock-fast"):
+            raise RuntimeError("network down")
+
+    [rollup] = telemetry.rollups()
+    assert rollup["calls"] == 4
+    assert rollup["errors"] == 2
+    assert rollup["total_cost_usd"] == pytest.approx(0.02)
+    assert rollup["total_ms_p50"] is not None
+    assert rollup["ttfb_ms_p99"] is None
+
+def test_estimate_uses_declared_costs_then_observed_telemetry(tmp_path):
+    engine = make_engine(tmp_path)
+    nodes = [
+        {"id": "gen1", "type": "text_to_image", "position": {"x":0,"y":0}, "data": {"provider": "mock", "prompt": "a"}},
+        {"id": "gen2", "type": "text_to_image", "position": {"x":0,"y":100}, "data": {"provider": "mock", "prompt": "b", "model": "mock-hq"}},
+        {"id": "output1", "type": "output", "position": {"x":200,"y":0}, "data": {}},
+    ]
+    edges = [{"id": "e1", "source": "gen1", "target": "output1"}]
+
+    estimate = engine.estimate_workflow(nodes, edges, target_node_ids=["output1", "gen2"])
+    assert estimate["provider_calls"] == 2
+    assert estimate["total_cost_usd"] == pytest.approx(0.06)
+    assert estimate["nodes"]["gen1"]["source"] == "declared"
+
+    for total_ms in (100.0, 200.0, 300.0):
+        call = ProviderCall("mock", "text_to_image", "mock-fast")
+        call.finish(True, cost_usd=0.02)
+        call._finished = call._created + total_ms / 1000
+        engine.provider_telemetry.record(call)
+
+    estimate = engine.estimate_workflow(nodes, edges, target_node_ids=["output1"])
+    assert estimate["nodes"]["gen1"]["source"] == "observed"
+    assert estimate["nodes"]["gen1"]["latency_ms"] == pytest.approx(200.0)
+    assert estimate["critical_path_ms"] == pytest.approx(200.0)
+    assert estimate["total_cost_usd"] == pytest.approx(0.02)
+
+    estimate = engine.estimate_workflow(nodes, edges, target_node_ids=["gen2"])
+    assert estimate["nodes"]["gen2"]["source"] == "provider_aggregate"
+    assert estimate["nodes"]["gen2"]["latency_ms"] == pytest.approx(200.0)
+    assert estimate["total_cost_usd"] == pytest.approx(0.05)
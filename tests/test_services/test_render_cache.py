@@ -0,0 +1,35 @@
+import os
+from PIL import Image
+from backend.services.render_cache import RenderCache
+from backend.utils.image_processor import ImageProcessor
+
+def test_render_variant_downscales_jpeg_and_keeps_aspect(tmp_path):
+    source_path = str(tmp_path / "photo.jpg")
+    Image.new("RGB", (4000, 3000), "orange").save(source_path, quality=90)
+
+    processor = ImageProcessor(file_handler=None)
+    output_path = str(tmp_path / "out" / "photo_400.webp")
+    size = processor.render_variant(source_path, output_path, 400, None, "webp", 80)
+
+    assert size == (400, 300)
+    assert Image.open(output_path).format == "WEBP"
+
+    cropped_path = str(tmp_path / "out" / "photo_square.jpg")
+    assert processor.render_variant(source_path, cropped_path, 200, 200, "jpg", 70) == (200, 200)
+
+def test_render_cache_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), max_bytes=250)
+
+    for key in ("a", "b", "c"):
+        path = cache.path_for(key, "webp")
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        cache.put(key, path)
+        if key == "b":
+            assert cache.get("a") is not None
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.total_bytes == 200
+    assert not os.path.exists(cache.path_for("b", "webp"))
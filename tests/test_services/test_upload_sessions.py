@@ -0,0 +1,27 @@
+import hashlib
+import pytest
+from backend.services.upload_sessions import UploadSessionManager, UploadOffsetMismatchError
+
+async def _once(data: bytes):
+    yield data
+
+@pytest.mark.asyncio
+async def test_resumable_upload_survives_a_new_manager(tmp_path):
+    data = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+    manager = UploadSessionManager(str(tmp_path), max_size=1024 * 1024)
+    session = manager.create("hero.png", "campaign", len(data))
+
+    session = await manager.append(session["id"], 0, _once(data[:1000]))
+    assert session["offset"] == 1000
+    with pytest.raises(UploadOffsetMismatchError):
+        await manager.append(session["id"], 0, _once(data[:10]))
+
+    resumed_manager = UploadSessionManager(str(tmp_path), max_size=1024 * 1024)
+    await resumed_manager.append(session["id"], 1000, _once(data[1000:]))
+    path, size, content_hash, completed = await resumed_manager.complete(session["id"])
+
+    assert size == len(data)
+    assert content_hash == hashlib.sha256(data).hexdigest()
+    assert completed["category"] == "campaign"
+    with open(path, "rb") as f:
+        assert f.read() == data
@@ -0,0 +1,29 @@
+from backend.services.workflow_cache import ParsedWorkflowCache
+
+def test_lru_eviction_and_hit_rate():
+    cache = ParsedWorkflowCache(max_entries=2)
+    cache.put("a", 1, "wf-a1")
+    cache.put("b", 1, "wf-b1")
+    assert cache.get("a", 1) == "wf-a1"
+    cache.put("c", 1, "wf-c1")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 2) is None
+    assert cache.get("c", 1) == "wf-c1"
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
+
+def test_invalidate_drops_every_version_of_a_workflow():
+    cache = ParsedWorkflowCache()
+    cache.put("a", 1, "wf-a1")
+    cache.put("a", 2, "wf-a2")
+    cache.put("b", 1, "wf-b1")
+
+    assert cache.invalidate("a") == 2
+    assert cache.get("a", 2) is None
+    assert cache.get("b", 1) == "wf-b1"
+    assert cache.stats()["invalidations"] == 2
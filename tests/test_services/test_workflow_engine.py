@@ -1,5 +1,6 @@
 import pytest
 from backend.services.workflow_engine import WorkflowEngine
+from backend.services.nodes.registry import get_node_registry
 from backend.api.models.nodes import Node, NodeData, NodePosition, Edge
 
 @pytest.mark.asyncio
@@ -32,3 +33,118 @@ async def test_simple_workflow_execution():
         sample_image_path = "uploads/user_uploads/sample_input.png"
         if os.path.exists(sample_image_path):
             os.remove(sample_image_path)
+
+def test_compile_workflow_prunes_nodes_not_feeding_outputs():
+    engine = WorkflowEngine()
+
+    nodes = [
+        {"id": "input1", "type": "image_input", "position": {"x":0,"y":0}, "data": {"file": "a.png"}},
+        {"id": "crop1", "type": "crop_resize", "position": {"x":100,"y":0}, "data": {"width": 512, "height": 512}},
+        {"id": "output1", "type": "output", "position": {"x":200,"y":0}, "data": {"format": "png"}},
+        {"id": "stray_t2i", "type": "text_to_image", "position": {"x":0,"y":200}, "data": {"prompt": "unused"}},
+    ]
+    edges = [
+        {"id": "e1", "source": "input1", "target": "crop1"},
+        {"id": "e2", "source": "crop1", "target": "output1"},
+    ]
+
+    plan = engine._compile_workflow(nodes, edges)
+    assert plan["order"] == ["input1", "crop1", "output1"]
+
+    partial_plan = engine._compile_workflow(nodes, edges, target_node_ids=["crop1"])
+    assert partial_plan["order"] == ["input1", "crop1"]
+
+    with pytest.raises(ValueError):
+        engine._compile_workflow(nodes, edges, target_node_ids=["missing"])
+
+@pytest.mark.asyncio
+async def test_cached_node_outputs_are_reused_when_requested():
+    engine = WorkflowEngine()
+    executed = []
+
+    async def fake_execute_node(node, node_inputs, api_keys, execution_id, mode="final"):
+        executed.append(node["id"])
+        return {"value": f"{node['id']}-{execution_id}"}
+
+    engine._execute_node = fake_execute_node
+
+    nodes = [
+        {"id": "input1", "type": "text_input", "position": {"x":0,"y":0}, "data": {"value": "hello", "label": "A"}},
+        {"id": "output1", "type": "output", "position": {"x":200,"y":0}, "data": {"format": "png"}},
+    ]
+    edges = [{"id": "e1", "source": "input1", "target": "output1", "targetHandle": "image"}]
+
+    await engine.execute_workflow(nodes, edges, {})
+    assert executed == ["input1", "output1"]
+
+    nodes[0]["data"]["label"] = "Renamed"
+    await engine.execute_workflow(nodes, edges, {}, use_cache=True)
+    assert executed == ["input1", "output1"]
+
+def test_draft_settings_use_cheaper_generation_and_smaller_sizes():
+    node_registry = get_node_registry()
+
+    fal_params = node_registry.get("text_to_image").draft_params({"provider": "fal", "width": 1024, "height": 768, "steps": 30})
+    assert fal_params["model"] == "flux-schnell"
+    assert fal_params["steps"] <= 12
+    assert (fal_params["width"], fal_params["height"]) == (512, 384)
+
+    stability_params = node_registry.get("text_to_image").draft_params({"provider": "stability", "width": 1024, "height": 1024})
+    assert (stability_params["width"], stability_params["height"]) == (1024, 1024)
+
+    crop_params = node_registry.get("crop_resize").draft_params({"width": 800, "height": 800})
+    assert (crop_params["width"], crop_params["height"]) == (400, 400)
+
+def test_compile_workflow_merges_identical_branches():
+    engine = WorkflowEngine()
+
+    nodes = [
+        {"id": "input1", "type": "image_input", "position": {"x":0,"y":0}, "data": {"file": "a.png", "label": "Left"}},
+        {"id": "input2", "type": "image_input", "position": {"x":0,"y":100}, "data": {"file": "a.png", "label": "Right"}},
+        {"id": "crop1", "type": "crop_resize", "position": {"x":100,"y":0}, "data": {"width": 512}},
+        {"id": "crop2", "type": "crop_resize", "position": {"x":100,"y":100}, "data": {"width": 512}},
+        {"id": "output1", "type": "output", "position": {"x":200,"y":0}, "data": {"format": "png"}},
+        {"id": "output2", "type": "output", "position": {"x":200,"y":100}, "data": {"format": "webp"}},
+    ]
+    edges = [
+        {"id": "e1", "source": "input1", "target": "crop1"},
+        {"id": "e2", "source": "input2", "target": "crop2"},
+        {"id": "e3", "source": "crop1", "target": "output1"},
+        {"id": "e4", "source": "crop2", "target": "output2"},
+    ]
+
+    plan = engine._compile_workflow(nodes, edges)
+    assert plan["aliases"] == {"input2": "input1", "crop2": "crop1"}
+    assert plan["order"] == ["input1", "crop1", "output1", "output2"]
+    assert plan["incoming"]["output2"] == [("crop1", None, None)]
+
+    batch_plan = engine._compile_workflow(nodes, edges, volatile_node_ids={"input2"})
+    assert batch_plan["aliases"] == {}
+
+@pytest.mark.asyncio
+async def test_changed_node_ids_recompute_only_affected_nodes():
+    engine = WorkflowEngine()
+    executed = []
+
+    async def fake_execute_node(node, node_inputs, api_keys, execution_id, mode="final"):
+        executed.append(node["id"])
+        return {"value": f"{node['id']}-{node['data'].get('width')}-{execution_id}"}
+
+    engine._execute_node = fake_execute_node
+
+    nodes = [
+        {"id": "input1", "type": "text_input", "position": {"x":0,"y":0}, "data": {"value": "hello"}},
+        {"id": "crop1", "type": "crop_resize", "position": {"x":100,"y":0}, "data": {"width": 256}},
+        {"id": "output1", "type": "output", "position": {"x":200,"y":0}, "data": {"format": "png"}},
+    ]
+    edges = [
+        {"id": "e1", "source": "input1", "target": "crop1", "targetHandle": "image"},
+        {"id": "e2", "source": "crop1", "target": "output1", "targetHandle": "image"},
+    ]
+
+    await engine.execute_workflow(nodes, edges, {})
+    executed.clear()
+
+    nodes[1]["data"]["width"] = 512
+    await engine.execute_workflow(nodes, edges, {}, changed_node_ids=["crop1"])
+    assert executed == ["crop1", "output1"]
@@ -0,0 +1,83 @@
+import json
+import os
+from backend.db.database import create_db_engine, run_migrations
+from backend.services.workflow_repository import WorkflowRepository
+
+def _repository(tmp_path) -> WorkflowRepository:
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'workflows.db'}")
+    run_migrations(engine)
+    return WorkflowRepository(engine)
+
+def _definition(name: str, nodes: int = 1):
+    return {
+        "name": name,
+        "nodes": [{"id": f"n{i}", "type": "image_input", "data": {}} for i in range(nodes)],
+        "edges": [],
+    }
+
+def test_save_get_and_overwrite(tmp_path):
+    repository = _repository(tmp_path)
+    summary = repository.save("promo", _definition("promo", nodes=2), owner="alice")
+    assert summary["node_count"] == 2
+    assert summary["owner"] == "alice"
+
+    repository.save("promo", _definition("promo", nodes=3))
+    assert len(repository.get("promo")["nodes"]) == 3
+    assert repository.get_summary("promo")["owner"] == "alice"
+    assert repository.count() == 1
+    assert repository.get("missing") is None
+
+def test_list_paginates_and_filters(tmp_path):
+    repository = _repository(tmp_path)
+    for i in range(7):
+        repository.save(f"wf{i}", _definition(f"campaign-{i}"), owner="alice" if i % 2 else "bob")
+    repository.save("other", _definition("other"), owner="alice")
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = repository.list(limit=3, cursor=cursor)
+        seen.extend(item["id"] for item in page)
+        if cursor is None:
+            break
+    assert len(seen) == 8 and len(set(seen)) == 8
+    assert seen[0] == "other"
+
+    alice, _ = repository.list(owner="alice", name_prefix="campaign")
+    assert sorted(item["id"] for item in alice) == ["wf1", "wf3", "wf5"]
+
+def test_delete_and_legacy_import(tmp_path):
+    legacy_dir = tmp_path / "saved_workflows"
+    legacy_dir.mkdir()
+    with open(legacy_dir / "legacy.json", "w") as f:
+        json.dump(_definition("legacy"), f)
+
+    repository = _repository(tmp_path)
+    assert repository.import_legacy_directory(str(legacy_dir)) == 1
+    assert repository.import_legacy_directory(str(legacy_dir)) == 0
+    assert [definition["name"] for definition in repository.iter_definitions()] == ["legacy"]
+
+    assert repository.delete("legacy")
+    assert not repository.delete("legacy")
+    assert os.path.exists(legacy_dir / "legacy.json")
+
+def test_versions_store_deltas_and_check_out_any_version(tmp_path):
+    repository = _repository(tmp_path)
+    definition = _definition("promo", nodes=2)
+    for width in range(1, 26):
+        definition["nodes"][1]["data"] = {"width": width}
+        repository.save("promo", definition)
+    repository.save("promo", definition)
+
+    versions = repository.versions("promo")
+    assert len(versions) == 25
+    assert [v["version"] for v in versions if v["snapshot"]] == [21, 1]
+    assert versions[0]["changed_node_ids"] == ["n1"]
+    assert versions[0]["stored_bytes"] < versions[-1]["stored_bytes"]
+
+    for version in (1, 7, 20, 21, 24, 25):
+        assert repository.checkout("promo", version)["nodes"][1]["data"] == {"width": version}
+    assert repository.checkout("promo", 26) is None
+
+    changes = repository.diff("promo", 3, 5)
+    assert changes["changed_node_ids"] == ["n1"]
+    assert changes["delta"]["nodes"]["modified"] == [{"id": "n1", "set": {"data.width": 5}}]
@@ -0,0 +1,28 @@
+import pytest
+
+from backend.services.workflow_engine import WorkflowEngine
+from backend.utils.tracing import get_tracer, new_trace_id
+
+@pytest.mark.asyncio
+async def test_workflow_execution_is_traced_under_its_execution_id():
+    engine = WorkflowEngine()
+    nodes = [
+        {"id": "text1", "type": "text_input", "position": {"x": 0, "y": 0}, "data": {"value": "hello"}},
+        {"id": "number1", "type": "number_input", "position": {"x": 0, "y": 100}, "data": {"value": 3}},
+    ]
+    execution_id = new_trace_id()
+    await engine.execute_workflow(nodes, [], {}, target_node_ids=["text1", "number1"], execution_id=execution_id)
+
+    spans = get_tracer().get_trace(execution_id)
+    names = [span["name"] for span in spans]
+    assert names[0] == "workflow.run"
+    assert {"node.text_input", "node.number_input"} <= set(names)
+    root_span_id = spans[0]["span_id"]
+    assert all(span["parent_span_id"] == root_span_id for span in spans[1:])
+    assert spans[0]["attributes"]["execution.id"] == execution_id
+
+    cached_execution_id = new_trace_id()
+    await engine.execute_workflow(nodes, [], {}, target_node_ids=["text1", "number1"], execution_id=cached_execution_id, use_cache=True)
+    node_spans = [span for span in get_tracer().get_trace(cached_execution_id) if span["name"].startswith("node.")]
+    assert len(node_spans) == 2
+    assert all(span["attributes"]["cache.hit"] for span in node_spans)
@@ -0,0 +1,22 @@
+import pytest
+from backend.utils.batch_table import parse_parameter_table, normalize_row_overrides
+
+def test_parse_csv_parameter_table():
+    content = b"row_id,text_to_image_1.prompt,text_overlay_1.text\nspring,,Spring Sale\nsummer,beach at noon,Summer Sale\n"
+    rows = parse_parameter_table(content, filename="campaign.csv")
+
+    assert rows == [
+        {"row_id": "spring", "overrides": {"text_overlay_1": {"text": "Spring Sale"}}},
+        {"row_id": "summer", "overrides": {"text_to_image_1": {"prompt": "beach at noon"}, "text_overlay_1": {"text": "Summer Sale"}}},
+    ]
+
+def test_parse_jsonl_parameter_table_accepts_nested_overrides():
+    content = b'{"text_overlay_1": {"text": "A", "font_size": 48}}\n\n{"text_overlay_1.text": "B"}\n'
+    rows = parse_parameter_table(content, filename="rows.jsonl")
+
+    assert rows[0] == {"row_id": "0", "overrides": {"text_overlay_1": {"text": "A", "font_size": 48}}}
+    assert rows[1] == {"row_id": "1", "overrides": {"text_overlay_1": {"text": "B"}}}
+
+def test_unqualified_column_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_row_overrides({"prompt": "no node id"})
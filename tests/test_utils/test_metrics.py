@@ -0,0 +1,45 @@
+import pytest
+
+from backend.utils.metrics import MetricsRegistry
+
+def test_histogram_buckets_are_cumulative_and_rendered():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("job_seconds", "Job time.", ("kind",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels("resize").observe(value)
+
+    text = registry.render()
+    assert "# TYPE job_seconds histogram" in text
+    assert 'job_seconds_bucket{kind="resize",le="0.1"} 2' in text
+    assert 'job_seconds_bucket{kind="resize",le="1"} 3' in text
+    assert 'job_seconds_bucket{kind="resize",le="+Inf"} 4' in text
+    assert 'job_seconds_count{kind="resize"} 4' in text
+    assert 'job_seconds_sum{kind="resize"} 3.65' in text
+
+def test_counters_gauges_and_collectors():
+    registry = MetricsRegistry()
+    counter = registry.counter("lookups", "Lookups.", ("result",))
+    counter.labels("hit").inc()
+    counter.labels("hit").inc(2)
+    assert registry.counter("lookups", "Lookups.", ("result",)) is counter
+
+    depth = registry.gauge("queue_depth", "Depth.")
+    depth.inc(3)
+    depth.dec()
+    ratio = registry.gauge("ratio", "Ratio.")
+    registry.add_collector(lambda: ratio.set(0.25))
+
+    text = registry.render()
+    assert 'lookups_total{result="hit"} 3' in text
+    assert "queue_depth 2" in text
+    assert "ratio 0.25" in text
+
+def test_label_values_are_escaped_and_conflicts_rejected():
+    registry = MetricsRegistry()
+    registry.counter("events", "Events.", ("name",)).labels('say "hi"\n').inc()
+    assert 'events_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+    with pytest.raises(ValueError):
+        registry.gauge("events", "Events.", ("name",))
+    with pytest.raises(ValueError):
+        registry.counter("events", "Events.").labels("extra")
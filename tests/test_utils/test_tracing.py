@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from backend.utils.tracing import Tracer, FileSpanExporter, new_trace_id, trace_id_for, STATUS_ERROR
+
+def test_spans_nest_and_export_as_otlp_json(tmp_path):
+    exporter = FileSpanExporter(str(tmp_path / "traces.jsonl"))
+    tracer = Tracer(exporter)
+    trace_id = new_trace_id()
+
+    with tracer.span("workflow.run", {"workflow.mode": "final"}, trace_id=trace_id) as root:
+        with tracer.span("node.filter", {"node.id": "n1"}) as child:
+            with pytest.raises(ValueError):
+                with tracer.span("image.encode"):
+                    raise ValueError("disk full")
+    tracer.flush()
+
+    assert root.trace_id == child.trace_id == trace_id
+    assert child.parent_span_id == root.span_id
+
+    [line] = (tmp_path / "traces.jsonl").read_text().splitlines()
+    [resource_spans] = json.loads(line)["resourceSpans"]
+    spans = {span["name"]: span for span in resource_spans["scopeSpans"][0]["spans"]}
+    assert set(spans) == {"workflow.run", "node.filter", "image.encode"}
+    assert "parentSpanId" not in spans["workflow.run"]
+    assert spans["image.encode"]["parentSpanId"] == child.span_id
+    assert spans["image.encode"]["status"] == {"code": STATUS_ERROR, "message": "disk full"}
+    assert {"key": "node.id", "value": {"stringValue": "n1"}} in spans["node.filter"]["attributes"]
+    assert int(spans["workflow.run"]["endTimeUnixNano"]) >= int(spans["node.filter"]["endTimeUnixNano"])
+
+def test_trace_ids_are_derived_from_execution_ids():
+    trace_id = new_trace_id()
+    assert trace_id_for(trace_id) == trace_id
+    assert trace_id_for("3f2b8c1e-0d4a-4e5f-9a6b-7c8d9e0f1a2b") == "3f2b8c1e0d4a4e5f9a6b7c8d9e0f1a2b"
+    assert len(trace_id_for("direct_gen")) == 32
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("workflow.run", trace_id=new_trace_id()) as span:
+        span.set_attribute("ignored", True)
+    assert span.trace_id is None
@@ -0,0 +1,80 @@
+import hashlib
+import io
+import os
+import pytest
+from PIL import Image
+from backend.utils.upload_stream import (
+    UploadTooLargeError, UnsupportedUploadError, MalformedUploadError, receive_multipart_upload, sniff_format, stream_upload_to_path
+)
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), "blue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+async def _chunked(data: bytes, size: int = 100):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def _multipart(filename: str, data: bytes, category: str = "logos") -> bytes:
+    return (
+        b"--b0undary\r\n"
+        + f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode()
+        + b"Content-Type: image/png\r\n\r\n" + data + b"\r\n"
+        + b"--b0undary\r\n"
+        + b'Content-Disposition: form-data; name="category"\r\n\r\n' + category.encode() + b"\r\n"
+        + b"--b0undary--\r\n"
+    )
+
+def test_sniff_format_detects_common_types():
+    assert sniff_format(_png_bytes()) == "png"
+    assert sniff_format(b"\xff\xd8\xff\xe0" + b"\x00" * 16) == "jpeg"
+    assert sniff_format(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff_format(b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"/>') == "svg"
+    assert sniff_format(b'{"nodes": []}') == "text"
+    assert sniff_format(b"MZ\x90\x00\x03\x00\x00\x00") is None
+
+@pytest.mark.asyncio
+async def test_stream_upload_hashes_and_validates(tmp_path):
+    data = _png_bytes()
+    dest = str(tmp_path / "general" / "logo.png")
+    path, size, content_hash = await stream_upload_to_path(_chunked(data), dest, "logo.png")
+
+    assert path == dest and size == len(data)
+    assert content_hash == hashlib.sha256(data).hexdigest()
+
+    with pytest.raises(UnsupportedUploadError):
+        await stream_upload_to_path(_chunked(data), str(tmp_path / "general" / "fake.jpg"), "fake.jpg")
+    with pytest.raises(UploadTooLargeError):
+        await stream_upload_to_path(_chunked(data), str(tmp_path / "general" / "big.png"), "big.png", max_size=len(data) - 1)
+    assert sorted(os.listdir(tmp_path / "general")) == ["logo.png"]
+
+@pytest.mark.asyncio
+async def test_multipart_upload_is_streamed_to_disk(tmp_path):
+    data = _png_bytes()
+    content_type = "multipart/form-data; boundary=b0undary"
+
+    def destination(filename, fields):
+        return str(tmp_path / fields.get("category", "general") / filename)
+
+    upload = await receive_multipart_upload(_chunked(_multipart("logo.png", data)), content_type, destination)
+    assert upload.path == str(tmp_path / "logos" / "logo.png")
+    assert upload.size == len(data) and upload.content_type == "image/png"
+    assert upload.content_hash == hashlib.sha256(data).hexdigest()
+
+    consumed = []
+    async def tracked(chunks):
+        async for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    body = _multipart("fake.png", b"MZ\x90\x00" * 1024)
+    with pytest.raises(UnsupportedUploadError):
+        await receive_multipart_upload(tracked(_chunked(body)), content_type, destination)
+    assert sum(len(chunk) for chunk in consumed) < len(body)
+
+    with pytest.raises(UploadTooLargeError):
+        await receive_multipart_upload(_chunked(_multipart("big.png", data)), content_type, destination, max_size=len(data) - 1)
+    with pytest.raises(MalformedUploadError):
+        await receive_multipart_upload(_chunked(b"{}"), "application/json", destination)
+    assert [name for _, _, names in os.walk(tmp_path) for name in names] == ["logo.png"]
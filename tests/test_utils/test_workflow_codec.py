@@ -0,0 +1,39 @@
+import json
+import pytest
+from backend.api.models.workflows import WorkflowRequest
+from backend.utils.workflow_codec import (
+    COMPACT_MEDIA_TYPE, encode_compact, decode_compact, encode_document, decode_document, accepts_compact, is_compact_media_type
+)
+
+def _workflow(node_count: int = 40):
+    nodes = [
+        {"id": f"n{i}", "type": "crop_resize" if i % 2 else "text_overlay", "position": {"x": i * 10.5, "y": 3}, "data": {"width": 512, "text": "Sale"}}
+        for i in range(node_count)
+    ]
+    edges = [
+        {"id": f"e{i}", "source": f"n{i - 1}", "target": f"n{i}", "sourceHandle": "image", "targetHandle": "image"}
+        for i in range(1, node_count)
+    ]
+    return WorkflowRequest(nodes=nodes, edges=edges, name="promo").model_dump()
+
+def test_compact_round_trip_is_lossless_and_smaller_than_json():
+    workflow = _workflow()
+    payload = encode_compact(workflow)
+    assert decode_compact(payload) == workflow
+    assert len(payload) * 5 < len(json.dumps(workflow, indent=2))
+    assert WorkflowRequest.model_validate(decode_document(payload)).name == "promo"
+
+def test_irregular_documents_survive_both_storage_formats():
+    document = {"nodes": [{"id": 7, "type": "x", "position": [1, 2]}, {"id": "a", "extra": True}], "edges": {"added": []}}
+    for storage_format in ("compact", "json"):
+        assert decode_document(encode_document(document, storage_format)) == document
+    assert decode_document('{"nodes": []}') == {"nodes": []}
+    with pytest.raises(ValueError):
+        encode_document(document, "yaml")
+
+def test_media_type_negotiation():
+    assert is_compact_media_type(f"{COMPACT_MEDIA_TYPE}; charset=binary")
+    assert not is_compact_media_type("application/json")
+    assert accepts_compact(f"application/json;q=0.5, {COMPACT_MEDIA_TYPE}")
+    assert not accepts_compact(f"{COMPACT_MEDIA_TYPE};q=0")
+    assert not accepts_compact(None)
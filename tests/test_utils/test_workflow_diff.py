@@ -0,0 +1,38 @@
+from backend.utils.workflow_diff import diff_workflows, apply_workflow_delta, changed_node_ids
+
+def _node(node_id, node_type="crop_resize", x=0, **data):
+    return {"id": node_id, "type": node_type, "position": {"x": x, "y": 0}, "data": data}
+
+def _edge(edge_id, source, target):
+    return {"id": edge_id, "source": source, "target": target}
+
+def _workflow(nodes, edges, name="promo"):
+    return {"name": name, "nodes": nodes, "edges": edges}
+
+def test_delta_round_trips_node_and_edge_changes():
+    old = _workflow(
+        [_node("in", "image_input", file="a.png"), _node("crop", width=256, label="Crop"), _node("out", "output")],
+        [_edge("e1", "in", "crop"), _edge("e2", "crop", "out")]
+    )
+    new = _workflow(
+        [_node("in", "image_input", file="a.png"), _node("crop", width=512), _node("blur", "filter"), _node("out", "output", x=40)],
+        [_edge("e1", "in", "crop"), _edge("e3", "crop", "blur"), _edge("e4", "blur", "out")],
+        name="promo v2"
+    )
+
+    delta = diff_workflows(old, new)
+    assert delta["nodes"]["modified"][0] == {"id": "crop", "set": {"data.width": 512}, "unset": ["data.label"]}
+    assert [node["id"] for node in delta["nodes"]["added"]] == ["blur"]
+    assert delta["edges"]["removed"] == ["e2"]
+    assert delta["fields"] == {"set": {"name": "promo v2"}}
+    assert apply_workflow_delta(old, delta) == new
+    assert old["nodes"][1]["data"] == {"width": 256, "label": "Crop"}
+
+def test_changed_node_ids_ignore_presentation_edits():
+    old = _workflow([_node("in", "image_input"), _node("out", "output", label="Final")], [_edge("e1", "in", "out")])
+    moved = _workflow([_node("in", "image_input", x=90), _node("out", "output", label="Renamed")], [_edge("e1", "in", "out")])
+    assert changed_node_ids(old, moved) == []
+
+    rewired = _workflow([_node("in", "image_input"), _node("out", "output", label="Final")], [])
+    assert changed_node_ids(old, rewired) == ["out"]
+    assert diff_workflows(old, old) == {}